@@ -35,9 +35,9 @@ from .core.test import Test
 from .core.test import abstract_test_class
 from .core.exclusions import exclude
 from .core.fixtures import parametrize, parameters
-from .core.fixtures.utils import fixture, nofixtures, generator_fixture, yield_fixture, use
+from .core.fixtures.utils import fixture, nofixtures, generator_fixture, yield_fixture, pooled_fixture, use, lazy
 from .core.requirements import requires
-from .utils import skip_test, skipped, add_error, add_failure, set_test_detail, repeat, register_skip_exception
+from .utils import skip_test, skipped, add_error, add_failure, set_test_detail, repeat, combinatorial, register_skip_exception
 from .utils.interactive import start_interactive_shell
 from .runner import run_tests
 import logbook
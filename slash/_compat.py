@@ -30,6 +30,11 @@ try:
 except ImportError:
     import simplejson as json
 
+if PY2:
+    import Queue as queue
+else:
+    import queue
+
 if PY2:
     from cStringIO import StringIO
     iteritems = lambda d: d.iteritems() # not dict.iteritems!!! we support ordered dicts as well
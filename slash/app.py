@@ -9,6 +9,7 @@ from . import site
 from . import plugins
 from ._compat import ExitStack
 from .conf import config
+from .core.fixtures.value_cache import clear_fixture_value_cache
 from .core.session import Session
 from .reporting.console_reporter import ConsoleReporter
 from .exceptions import TerminatedException, SlashException
@@ -113,6 +114,9 @@ class Application(object):
                 cli_utils.get_modified_configuration_from_args_context(self.arg_parser, self._parsed_args)
                 )
 
+            if config.root.run.clear_fixture_cache:
+                clear_fixture_value_cache()
+
             self.session = Session(reporter=self.get_reporter(), console_stream=self._report_stream)
 
             trigger_hook.configure() # pylint: disable=no-member
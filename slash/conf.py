@@ -53,6 +53,7 @@ config = Config({
         "last_session_dir_symlink": None // Doc("If set, specifies a symlink path to the last session log directory"),
         "last_test_symlink": None // Doc("If set, specifies a symlink path to the last test log file in each run"),
         "last_failed_symlink": None // Doc("If set, specifies a symlink path to the last failed test log file"),
+        "traceback_frames_max_age": None // Doc("Tracebacks of errors are only distilled (capturing variables and source lines) when first needed, keeping their frames alive until then. If set, the number of seconds after which tracebacks not needed yet are distilled anyway, releasing their frames (0 distills tracebacks right away)"),
         "show_manual_errors_tb": True // Doc("Show tracebacks for errors added via slash.add_error"),
         "silence_loggers": [] // Doc("Logger names to silence"),
         "format": None // Doc("Format of the log line, as passed on to logbook. None will use the default format"),
@@ -65,10 +66,32 @@ config = Config({
         "dump_variation": False // Doc("Output the full variation structure before each test is run (mainly used for internal debugging)"),
         "default_sources": [] // Doc("Default tests to run assuming no other sources are given to the runner"),
         "suite_files": [] // Doc("File(s) to be read for lists of tests to be run") // Cmdline(append="-f", metavar="FILENAME"),
+        "stream_collection": False // Doc("Start running tests while they are still being collected, rather than collecting all tests first") // Cmdline(on="--stream"),
         "stop_on_error": False // Doc("Stop execution when a test doesn't succeed") // Cmdline(on="-x"),
         "filter_strings": [] // Doc("A string filter, selecting specific tests by string matching against their name") // Cmdline(append='-k', metavar='FILTER'),
+        "concurrent_fixture_setup": 0 // Doc("Number of threads used to set up independent fixtures needed by a test concurrently (0 or 1 sets them up one after the other)") // Cmdline(arg='--concurrent-fixtures', metavar="NUM_THREADS"),
+        "group_by_fixture_parameters": False // Doc("Reorder the tests of each module so that tests sharing the parameter values of their module and session fixtures run one after the other, setting up each such fixture value once") // Cmdline(on="--group-by-fixture-params"),
+        "deferred_cleanup_threads": 4 // Doc("Maximum number of background threads running deferred cleanups"),
         "repeat_each": 1 // Doc("Repeat each test a specified amount of times") // Cmdline(arg='--repeat-each', metavar="NUM_TIMES"),
+        "combinatorial_strength": 0 // Doc("When nonzero, run parametrized tests with a covering array of their parameter values, in which every combination of values of any STRENGTH parameters appears at least once, rather than with all combinations") // Cmdline(arg='--combinatorial', metavar="STRENGTH"),
         "repeat_all": 1 // Doc("Repeat all suite a specified amount of times") // Cmdline(arg='--repeat-all', metavar="NUM_TIMES"),
+        "parallel": 0 // Doc("Number of worker processes to run tests in (0 runs the tests serially)") // Cmdline(arg='-j', metavar="NUM_WORKERS"),
+        "parallel_durations_path": "~/.slash/test_durations" // Doc("Where to record test durations, used to balance work between parallel workers"),
+        "use_collection_cache": False // Doc("Cache the metadata of collected tests, and avoid importing unchanged files when they are not needed") // Cmdline(on="--collection-cache"),
+        "dump_collection_stats": False // Doc("Report the time spent importing each test file once collection ends") // Cmdline(on="--dump-collection-stats"),
+        "spill_results": False // Doc("Move the results of finished tests to an append-only store on disk, keeping only compact summaries in memory (useful for very long sessions)") // Cmdline(on="--spill-results"),
+        "results_store_dir": None // Doc("Directory in which results are stored when ``spill_results`` is set (defaults to the system's temporary directory)"),
+        "show_slowest_fixtures": 0 // Doc("Number of fixtures taking the most time to set up and tear down to list when the session ends") // Cmdline(arg='--slowest-fixtures', metavar="NUM"),
+        "fixture_timings_path": None // Doc("A file to which the time spent setting up and tearing down each fixture is written as JSON when the session ends") // Cmdline(arg='--fixture-timings-file', metavar="PATH"),
+        "fixture_timing_details": False // Doc("Append each setup and teardown of a fixture, along with its duration, to the ``fixture_timings`` detail of the result of the test running at the time") // Cmdline(on="--fixture-timing-details"),
+        "collection_cache_path": "~/.slash/collection_cache" // Doc("Where to keep the collection cache"),
+        "fixture_cache_path": "~/.slash/fixture_cache" // Doc("Where to keep the values of fixtures declared with ``cache`` (an empty value disables caching)"),
+        "fixture_cache_max_entries": 20 // Doc("Maximum number of values kept in the fixture cache. The least recently used values are evicted first"),
+        "fixture_cache_max_age_days": 30 // Doc("Number of days after which unused values are evicted from the fixture cache"),
+        "clear_fixture_cache": False // Doc("Remove all values from the fixture cache before the session starts") // Cmdline(on="--clear-fixture-cache"),
+        "rewritten_code_cache_path": "~/.slash/rewritten_code" // Doc("Where to cache the assertion-rewritten code of test files and slashconf files (an empty value disables caching)"),
+        "rewritten_code_cache_max_entries": 10000 // Doc("Maximum number of files whose rewritten code is cached. The least recently used entries are evicted first"),
+        "rewritten_code_cache_max_age_days": 30 // Doc("Number of days after which unused entries are evicted from the rewritten code cache"),
         "session_state_path": "~/.slash/last_session" // Doc("Where to keep last session serialized data"),
         "project_customization_file_path": "./.slashrc",
         "user_customization_file_path": "~/.slash/slashrc",
@@ -1,3 +1,4 @@
+import functools
 from contextlib import contextmanager
 import logbook
 
@@ -6,9 +7,11 @@ from sentinels import Sentinel
 _logger = logbook.Logger(__name__)
 
 from .. import hooks
+from ..conf import config
 from ..ctx import context
 from ..exception_handling import handling_exceptions
 from ..exceptions import IncorrectScope, CannotAddCleanup
+from .deferred_cleanups import DeferredCleanupExecutor
 
 
 _LAST_SCOPE = Sentinel('LAST_SCOPE')
@@ -24,6 +27,7 @@ class CleanupManager(object):
         self._scopes_by_name = {}
         self._pending = []
         self._allow_implicit_scopes = True
+        self._deferred_executor = None
 
     @contextmanager
     def forbid_implicit_scoping_context(self):
@@ -43,6 +47,9 @@ class CleanupManager(object):
         :param critical: If True, this cleanup will take place even when tests are interrupted by the user (Using Ctrl+C for instance)
         :param success_only: If True, execute this cleanup only if no errors are encountered
         :param scope: Scope at the end of which this cleanup will be executed
+        :param deferred: If True, the cleanup runs in a background thread (see ``run.deferred_cleanup_threads``), so
+           that the next test does not have to wait for it to end. Deferred cleanups must not depend on the order of
+           other cleanups. Errors they raise are still added to the result of the test which added them
         :param args: positional arguments to pass to the cleanup function
         :param kwargs: keyword arguments to pass to the cleanup function
         """
@@ -51,6 +58,7 @@ class CleanupManager(object):
 
         critical = kwargs.pop('critical', False)
         success_only = kwargs.pop('success_only', False)
+        deferred = kwargs.pop('deferred', False)
 
         new_kwargs = kwargs.pop('kwargs', {}).copy()
         new_args = list(kwargs.pop('args', ()))
@@ -60,7 +68,7 @@ class CleanupManager(object):
             new_args.extend(args)
             new_kwargs.update(kwargs)
 
-        added = _Cleanup(_func, new_args, new_kwargs, critical=critical, success_only=success_only)
+        added = _Cleanup(_func, new_args, new_kwargs, critical=critical, success_only=success_only, deferred=deferred)
 
 
         if scope_name is None:
@@ -137,15 +145,32 @@ class CleanupManager(object):
                 continue
             if (in_failure or in_interruption) and cleanup.success_only:
                 continue
+            if cleanup.deferred:
+                _logger.trace("Deferring cleanup: {0}", cleanup)
+                self.defer(functools.partial(cleanup.func, *cleanup.args, **cleanup.kwargs), result=cleanup.result,
+                           test=cleanup.test)
+                continue
             with handling_exceptions(swallow=True):
                 _logger.trace("Calling cleanup: {0}", cleanup)
                 cleanup()
 
+    def defer(self, func, result=None, test=None):
+        """Runs *func* in the background, adding errors it raises to *result*, and reporting them as errors of *test*
+        """
+        if self._deferred_executor is None:
+            self._deferred_executor = DeferredCleanupExecutor(config.root.run.deferred_cleanup_threads)
+        self._deferred_executor.submit(func, result, test=test)
+
+    def wait_for_deferred_cleanups(self):
+        if self._deferred_executor is not None:
+            _logger.trace('Waiting for deferred cleanups')
+            self._deferred_executor.wait()
+
 
 
 class _Cleanup(object):
 
-    def __init__(self, func, args, kwargs, critical=False, success_only=False):
+    def __init__(self, func, args, kwargs, critical=False, success_only=False, deferred=False):
         assert not (success_only and critical)
         super(_Cleanup, self).__init__()
         self.func = func
@@ -153,7 +178,9 @@ class _Cleanup(object):
         self.kwargs = kwargs
         self.critical = critical
         self.success_only = success_only
+        self.deferred = deferred
         self.result = context.result
+        self.test = context.test
 
     def __call__(self):
         try:
@@ -0,0 +1,155 @@
+import hashlib
+import os
+import sys
+
+import logbook
+from sentinels import NOTHING
+
+from .._compat import iteritems, json
+from ..__version__ import __version__
+from ..conf import config
+from ..utils.path import ensure_directory
+from .metadata import _sort_key_generator
+from .tagging import NO_TAGS, Tags
+
+_logger = logbook.Logger(__name__)
+
+_FORMAT_VERSION = 1
+
+
+class CollectionCache(object):
+    """Persistently stores the metadata of tests collected from each test file, keyed by the contents of the file
+    and of the ``slashconf.py`` files it depends on. This allows consumers interested only in test metadata
+    (listing and filtering tests) to avoid importing files which did not change
+    """
+
+    def __init__(self, path):
+        super(CollectionCache, self).__init__()
+        self._path = os.path.expanduser(path)
+
+    def get_key(self, file_path, slashconf_paths):
+        hasher = hashlib.sha1()
+        hasher.update('{0}|{1}|{2}|{3}|{4}'.format(
+            _FORMAT_VERSION, __version__, sys.version_info[:2], config.root.run.repeat_each,
+            config.root.run.combinatorial_strength).encode('utf-8'))
+        for path in [file_path] + list(slashconf_paths):
+            hasher.update(path.encode('utf-8'))
+            with open(path, 'rb') as f:
+                hasher.update(hashlib.sha1(f.read()).digest())
+        return hasher.hexdigest()
+
+    def get(self, file_path, key):
+        """Returns a list of :class:`CachedTest` objects for the tests previously collected from *file_path*,
+        or None if the cache holds no valid entry for it
+        """
+        try:
+            with open(self._get_entry_path(file_path)) as f:
+                entry = json.load(f)
+        except (IOError, OSError, ValueError):
+            return None
+        if entry.get('key') != key:
+            return None
+        return get_cached_tests(entry['tests'])
+
+    def store(self, file_path, key, tests):
+        self.store_descriptors(file_path, key, [_metadata_to_dict(test.__slash__) for test in tests])
+
+    def store_descriptors(self, file_path, key, descriptors):
+        entry = {'key': key, 'tests': descriptors}
+        entry_path = self._get_entry_path(file_path)
+        tmp_path = '{0}.{1}.tmp'.format(entry_path, os.getpid())
+        try:
+            ensure_directory(self._path)
+            with open(tmp_path, 'w') as f:
+                json.dump(entry, f)
+            os.rename(tmp_path, entry_path)
+        except (IOError, OSError):
+            _logger.debug('Could not store collection cache entry for {0}', file_path, exc_info=True)
+
+    def _get_entry_path(self, file_path):
+        return os.path.join(self._path, hashlib.sha1(os.path.abspath(file_path).encode('utf-8')).hexdigest() + '.json')
+
+
+def get_cached_tests(descriptors):
+    """Returns :class:`CachedTest` objects for the given test descriptors
+    """
+    return [CachedTest(CachedMetadata.from_dict(d)) for d in descriptors]
+
+
+class CachedTest(object):
+    """Stands in for a test loaded from the collection cache. Cached tests only carry metadata, and cannot be run
+    """
+
+    def __init__(self, metadata):
+        super(CachedTest, self).__init__()
+        self.__slash__ = metadata
+
+    def get_tags(self):
+        return self.__slash__.tags
+
+    def __repr__(self):
+        return '<Cached test {0!r}>'.format(self.__slash__)
+
+
+class CachedMetadata(object):
+
+    test_index0 = id = None
+
+    def __init__(self, file_path, module_name, factory_name, class_name, address_in_file, address, tags,
+                 variation_id, variation_safe_repr):
+        super(CachedMetadata, self).__init__()
+        self.file_path = file_path
+        self.module_name = module_name
+        self.factory_name = factory_name
+        self.class_name = class_name
+        self.address_in_file = address_in_file
+        self.address = address
+        self.tags = tags
+        self.variation_id = variation_id
+        self.variation_safe_repr = variation_safe_repr
+        self._sort_key = next(_sort_key_generator)
+
+    @classmethod
+    def from_dict(cls, d):
+        tags = NO_TAGS
+        if d['tags']:
+            tags = Tags(dict((name, NOTHING if value is None else value) for name, value in d['tags']))
+        return cls(file_path=d['file_path'], module_name=d['module_name'], factory_name=d['factory_name'],
+                   class_name=d['class_name'], address_in_file=d['address_in_file'], address=d['address'],
+                   tags=tags, variation_id=d['variation_id'], variation_safe_repr=d['variation_safe_repr'])
+
+    def set_sort_key(self, key):
+        self._sort_key = key
+
+    def get_sort_key(self):
+        return self._sort_key
+
+    @property
+    def function_name(self):
+        returned = self.address_in_file
+        if self.class_name:
+            returned = returned[len(self.class_name) + 1:]
+        return returned.split('(')[0]
+
+    def __repr__(self):
+        return '<{0}>'.format(self.address)
+
+
+def _metadata_to_dict(metadata):
+    variation = metadata.variation
+    return {
+        'file_path': metadata.file_path,
+        'module_name': metadata.module_name,
+        'factory_name': metadata.factory_name,
+        'class_name': metadata.class_name,
+        'address_in_file': metadata.address_in_file,
+        'address': metadata.address,
+        'tags': [(name, None if value is NOTHING else str(value)) for name, value in _iter_tags(metadata.tags)],
+        'variation_id': dict(iteritems(variation.id)) if variation else {},
+        'variation_safe_repr': variation.safe_repr if variation else None,
+    }
+
+
+def _iter_tags(tags):
+    for name in tags:
+        yield name, tags[name]
@@ -0,0 +1,27 @@
+import collections
+
+FileCollectionStats = collections.namedtuple('FileCollectionStats', ('file_path', 'import_duration', 'num_tests',
+                                                                     'in_worker'))
+
+
+class CollectionStats(object):
+    """Keeps track of the time spent importing each test file during collection
+    """
+
+    def __init__(self):
+        super(CollectionStats, self).__init__()
+        self._files = []
+
+    def add(self, file_path, import_duration, num_tests, in_worker=False):
+        self._files.append(FileCollectionStats(file_path, import_duration, num_tests, in_worker))
+
+    def get_files(self):
+        """Returns the recorded file statistics, slowest imports first
+        """
+        return sorted(self._files, key=lambda stats: stats.import_duration, reverse=True)
+
+    def get_total_import_duration(self):
+        return sum(stats.import_duration for stats in self._files)
+
+    def __len__(self):
+        return len(self._files)
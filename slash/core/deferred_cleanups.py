@@ -0,0 +1,89 @@
+import sys
+import threading
+from contextlib import contextmanager
+
+import logbook
+
+from .._compat import queue
+from ..ctx import context
+
+_logger = logbook.Logger(__name__)
+
+
+class DeferredCleanupExecutor(object):
+    """Runs cleanups in up to *num_threads* background threads, so that slow cleanups do not hold back the tests
+    following them.
+
+    Errors raised by deferred cleanups are added to the results they are attributed to from the thread running
+    the tests, each time cleanups are submitted and when waiting for them to end. Since this happens after the tests
+    which added the cleanups have ended, the errors are reported as added to those tests, after their end
+    """
+
+    def __init__(self, num_threads):
+        super(DeferredCleanupExecutor, self).__init__()
+        self._num_threads = max(1, num_threads)
+        self._work_queue = queue.Queue()
+        self._errors = queue.Queue()
+        self._threads = []
+
+    def submit(self, func, result, test=None):
+        """Schedules *func* to be called in the background. Errors raised by it are added to *result*, and reported
+        as errors of *test*
+        """
+        if len(self._threads) < self._num_threads:
+            thread = threading.Thread(target=self._run_cleanups)
+            thread.daemon = True
+            thread.start()
+            self._threads.append(thread)
+        self._work_queue.put((func, result, test))
+        self.report_errors()
+
+    def wait(self):
+        """Waits for all submitted cleanups to end, and stops the background threads
+        """
+        self._work_queue.join()
+        for _ in self._threads:
+            self._work_queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        del self._threads[:]
+        self.report_errors()
+
+    def report_errors(self):
+        while True:
+            try:
+                result, test, exc_info = self._errors.get_nowait()
+            except queue.Empty:
+                break
+            if result is not None:
+                with attributed_to(test, result):
+                    result.add_exception(exc_info)
+
+    def _run_cleanups(self):
+        while True:
+            item = self._work_queue.get()
+            try:
+                if item is None:
+                    break
+                func, result, test = item
+                try:
+                    func()
+                except Exception:  # pylint: disable=broad-except
+                    exc_info = sys.exc_info()
+                    _logger.debug('Deferred cleanup {0} failed', func, exc_info=exc_info)
+                    self._errors.put((result, test, exc_info))
+            finally:
+                self._work_queue.task_done()
+
+
+@contextmanager
+def attributed_to(test, result):
+    """Makes *test* and *result* the current ones, for reporting errors added to them after the test ended
+    """
+    # errors are reported through the current context, which by now belongs to another test (or to none)
+    prev_test, prev_result = context.test, context.result
+    context.test, context.result = test, result
+    try:
+        yield
+    finally:
+        context.test, context.result = prev_test, prev_result
@@ -1,21 +1,32 @@
+#: shared by all details until their first value is set. Never modified
+_NO_DETAILS = {}
+
+
 class Details(object):
 
+    __slots__ = ('_details', '_set_callback')
+
     def __init__(self, set_callback=None):
         super(Details, self).__init__()
-        self._details = {}
+        self._details = _NO_DETAILS
         self._set_callback = set_callback
 
+    def _get_writable_details(self):
+        if self._details is _NO_DETAILS:
+            self._details = {}
+        return self._details
+
     def set(self, key, value):
         """Sets a specific detail (by name) to a specific value
         """
         if self._set_callback is not None:
             self._set_callback(key, value)
-        self._details[key] = value
+        self._get_writable_details()[key] = value
 
     def append(self, key, value):
         """Appends a value to a list key, or creates it if needed
         """
-        lst = self._details.setdefault(key, [])
+        lst = self._get_writable_details().setdefault(key, [])
         if not isinstance(lst, list):
             raise TypeError('Cannot append value to a {0.__class__.__name__!r} value'.format(lst))
         lst.append(value)
@@ -25,6 +36,10 @@ class Details(object):
     def all(self):
         return self._details.copy()
 
+    def _restore(self, details):
+        # used when deserializing results -- doesn't trigger the set callback
+        self._details = dict(details)
+
     def __nonzero__(self):
         return bool(self._details)
 
@@ -1,20 +1,35 @@
-import arrow
+import collections
 import sys
+import time
 import traceback
+import weakref
+
+import arrow
 
 from .._compat import string_types, StringIO, iteritems
+from ..conf import config
 from ..exception_handling import is_exception_fatal
 from ..exceptions import FAILURE_EXCEPTION_TYPES
-from ..utils.traceback_utils import distill_traceback, distill_call_stack
+from ..utils.traceback_utils import (DistilledFrame, distill_frames, distill_running_frames, get_call_stack_frames,
+                                     get_current_test_code, get_traceback_frames)
 from ..utils.formatter import Formatter
+from ..utils.python import is_picklable
+
+#: (deadline, weak reference) pairs of the errors whose tracebacks were not distilled yet, oldest first
+_pending_distillations = collections.deque()
 
 
 class Error(object):
 
-    traceback = exception_type = exception = arg = _cached_detailed_traceback_str = None
+    # frames of the traceback which already returned are only distilled (capturing the representations of variables
+    # and reading the source code) once the traceback is first needed. Frames still running are distilled right away,
+    # since their variables keep changing
+    __slots__ = ('time', 'message', '_traceback', '_frames', '_test_code', 'exception_type', 'exception', 'arg',
+                 '_fatal', '_has_custom_message', '_is_failure', '_cached_detailed_traceback_str', '__weakref__')
 
     def __init__(self, msg=None, exc_info=None, frame_correction=0):
         super(Error, self).__init__()
+        self.exception_type = self.exception = self.arg = self._cached_detailed_traceback_str = None
         self.time = arrow.utcnow()
         self._fatal = False
         self._has_custom_message = (msg is not None)
@@ -26,10 +41,49 @@ class Error(object):
         self.message = msg
         if exc_info is not None:
             self.exception_type, self.exception, tb = exc_info  # pylint: disable=unpacking-non-sequence
-            self.traceback = distill_traceback(tb)
+            frames = get_traceback_frames(tb)
         else:
-            self.traceback = distill_call_stack(frame_correction=frame_correction+4)
+            frames = get_call_stack_frames(frame_correction=frame_correction+4)
+        self._traceback = None
+        self._test_code = get_current_test_code()
+        self._frames = distill_running_frames(frames, test_code=self._test_code)
         self._is_failure = False
+        if all(isinstance(frame, DistilledFrame) for frame in self._frames):
+            self.distill_traceback()
+        else:
+            _defer_distillation(self)
+
+    @property
+    def traceback(self):
+        """The :class:`slash.utils.traceback_utils.DistilledTraceback` of the error, distilled on first access
+        """
+        if self._frames is not None:
+            self.distill_traceback()
+        return self._traceback
+
+    @traceback.setter
+    def traceback(self, traceback):
+        # an explicitly set traceback replaces the one pending distillation
+        self._frames = None
+        self._traceback = traceback
+
+    def get_traceback_summary(self):
+        """Returns the location of each frame of the error's traceback, one per line. Unlike :attr:`traceback`,
+        this does not distill the traceback
+        """
+        if self._frames is not None:
+            return '\n'.join(_get_frame_location(frame) for frame in self._frames)
+        if self._traceback is None:
+            return ''
+        return '\n'.join(_get_frame_location(frame) for frame in self._traceback.frames)
+
+    def distill_traceback(self):
+        """Distills the traceback of the error, if it was not distilled yet, and releases the frames it refers to
+        """
+        frames, self._frames = self._frames, None
+        if frames is not None:
+            self._traceback = distill_frames(frames, test_code=self._test_code)
+            self._test_code = None
 
     def has_custom_message(self):
         return self._has_custom_message
@@ -85,6 +139,24 @@ class Error(object):
     def __repr__(self):
         return self.message
 
+    def __getstate__(self):
+        # errors are pickled when results are sent between processes. Exception objects are not always
+        # transferable (and refer back to this error), so we compute everything derived from them beforehand
+        self.distill_traceback()
+        returned = dict((attr, getattr(self, attr)) for attr in self.__slots__ if attr != '__weakref__')
+        returned['_fatal'] = self.is_fatal()
+        returned['_is_failure'] = self.is_failure()
+        returned['exception'] = None
+        for attr in ('exception_type', 'arg'):
+            if not is_picklable(returned.get(attr)):
+                returned[attr] = None
+        return returned
+
+    def __setstate__(self, state):
+        for attr in self.__slots__:
+            if attr != '__weakref__':
+                setattr(self, attr, state.get(attr))
+
     def get_detailed_traceback_str(self):
         if self._cached_detailed_traceback_str is None:
             stream = StringIO()
@@ -111,3 +183,31 @@ class Error(object):
         return '{0}*** {1}'.format(
             self.get_detailed_traceback_str(), self)
 
+
+def _get_frame_location(frame):
+    if isinstance(frame, DistilledFrame):
+        return '{0.filename}, line {0.lineno}, in {0.func_name}'.format(frame)
+    frame, lineno = frame
+    return '{0}, line {1}, in {2}'.format(frame.f_code.co_filename, lineno, frame.f_code.co_name)
+
+
+def _defer_distillation(error):
+    max_age = config.root.log.traceback_frames_max_age
+    if max_age is not None:
+        _pending_distillations.append((time.time() + max_age, weakref.ref(error)))
+        distill_expired_tracebacks()
+
+
+def distill_expired_tracebacks():
+    """Distills the tracebacks of errors created more than ``log.traceback_frames_max_age`` seconds ago, releasing the
+    frames they refer to
+    """
+    now = time.time()
+    while _pending_distillations and _pending_distillations[0][0] <= now:
+        try:
+            _, error_ref = _pending_distillations.popleft()
+        except IndexError:  # emptied by another thread
+            break
+        error = error_ref()
+        if error is not None:
+            error.distill_traceback()
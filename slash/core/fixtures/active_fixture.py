@@ -1,7 +1,15 @@
+from ...ctx import context
 from ...exception_handling import handling_exceptions
 
 class ActiveFixture(object):
 
+    #: (parameter id, value index) pairs of the parameter values the fixture was set up with
+    param_value_indices = ()
+
+    #: maps the paths of the parameters the fixture depends on to representations of their values, recorded along
+    #: with the fixture timings
+    timing_params = None
+
     def __init__(self, fixture):
         super(ActiveFixture, self).__init__()
         self.fixture = fixture
@@ -18,6 +26,11 @@ class ActiveFixture(object):
     def test_end(self, callback):
         self._test_end_callbacks.append(callback)
 
+    def has_callbacks(self):
+        """Returns whether any cleanups or test start/end callbacks were added to the fixture
+        """
+        return bool(self._cleanups or self._test_start_callbacks or self._test_end_callbacks)
+
     def call_test_start(self):
         if self._test_start_called:
             return
@@ -33,10 +46,16 @@ class ActiveFixture(object):
             for callback in self._test_end_callbacks:
                 callback()
 
-    def add_cleanup(self, cleanup):
-        self._cleanups.append(cleanup)
+    def add_cleanup(self, cleanup, deferred=False):
+        """Adds a cleanup to be called when the fixture is torn down. Deferred cleanups run in the background, like
+        cleanups added through :func:`slash.add_cleanup` with ``deferred=True``
+        """
+        self._cleanups.append((cleanup, deferred))
 
     def do_cleanups(self):
         while self._cleanups:
-            cleanup = self._cleanups.pop()
-            cleanup()
+            cleanup, deferred = self._cleanups.pop()
+            if deferred and context.session is not None:
+                context.session.cleanups.defer(cleanup, result=context.result, test=context.test)
+            else:
+                cleanup()
@@ -0,0 +1,107 @@
+import sys
+import threading
+
+import logbook
+
+from ..._compat import OrderedDict, iteritems, itervalues, queue, reraise
+
+_logger = logbook.Logger(__name__)
+
+_POLL_INTERVAL = 0.5
+
+
+def set_up_fixtures_concurrently(store, fixtures, num_threads):
+    """Computes the values of the given fixtures, along with the fixtures they depend on, in up to *num_threads*
+    threads. Each fixture is set up as soon as all fixtures it depends on are active, so independent branches of
+    the dependency graph are set up concurrently.
+
+    If a fixture fails, no new fixtures are started, and the error is raised once all fixtures already being set up
+    are done. Fixtures set up successfully remain active, and are torn down along with their scope
+    """
+    dependencies = _get_pending_dependencies(store, fixtures)
+    if len(dependencies) < 2:
+        return
+
+    dependents = dict((fixture_id, []) for fixture_id in dependencies)
+    for fixture_id, needed_ids in iteritems(dependencies):
+        for needed_id in needed_ids:
+            dependents[needed_id].append(fixture_id)
+    fixtures_by_id = dict((fixture_id, store.get_fixture_by_id(fixture_id)) for fixture_id in dependencies)
+    num_pending_dependencies = dict((fixture_id, len(needed_ids)) for fixture_id, needed_ids in iteritems(dependencies))
+
+    work_queue = queue.Queue()
+    done_queue = queue.Queue()
+    threads = [threading.Thread(target=_set_up_fixtures, args=(store, work_queue, done_queue))
+               for _ in range(min(num_threads, len(dependencies)))]
+    for thread in threads:
+        thread.daemon = True
+        thread.start()
+
+    error = None
+    in_flight = 0
+    try:
+        for fixture_id, num_pending in iteritems(num_pending_dependencies):
+            if num_pending == 0:
+                work_queue.put(fixtures_by_id[fixture_id])
+                in_flight += 1
+
+        while in_flight:
+            try:
+                fixture_id, exc_info = done_queue.get(timeout=_POLL_INTERVAL)
+            except queue.Empty:
+                continue
+            in_flight -= 1
+            if exc_info is not None:
+                if error is None:
+                    error = exc_info
+                continue
+            if error is not None:
+                continue
+            for dependent_id in dependents[fixture_id]:
+                num_pending_dependencies[dependent_id] -= 1
+                if num_pending_dependencies[dependent_id] == 0:
+                    work_queue.put(fixtures_by_id[dependent_id])
+                    in_flight += 1
+    finally:
+        for _ in threads:
+            work_queue.put(None)
+        for thread in threads:
+            thread.join()
+
+    if error is not None:
+        reraise(*error)
+    # whatever was not set up (e.g. due to dependency cycles) is computed by the caller, which reports such errors
+
+
+def _get_pending_dependencies(store, fixtures):
+    """Returns an ordered dictionary mapping the ids of all inactive fixtures needed by *fixtures* to the ids of the
+    inactive fixtures each of them depends on directly
+    """
+    returned = OrderedDict()
+    stack = list(fixtures)[::-1]
+    while stack:
+        fixture = stack.pop()
+        if fixture.is_parameter() or fixture.info.id in returned or store.get_active_fixture(fixture) is not None:
+            continue
+        if fixture.keyword_arguments is None:
+            # unresolved fixtures are reported when computed serially
+            return OrderedDict()
+        needed = [needed_fixture for needed_fixture in itervalues(fixture.keyword_arguments)
+                  if not needed_fixture.is_parameter() and store.get_active_fixture(needed_fixture) is None]
+        returned[fixture.info.id] = set(needed_fixture.info.id for needed_fixture in needed)
+        stack.extend(needed[::-1])
+    return returned
+
+
+def _set_up_fixtures(store, work_queue, done_queue):
+    while True:
+        fixture = work_queue.get()
+        if fixture is None:
+            break
+        exc_info = None
+        try:
+            store.get_fixture_value(fixture)
+        except:  # pylint: disable=bare-except
+            exc_info = sys.exc_info()
+            _logger.debug('Setting up fixture {0} failed', fixture.info.name, exc_info=exc_info)
+        done_queue.put((fixture.info.id, exc_info))
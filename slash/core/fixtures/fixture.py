@@ -9,11 +9,13 @@ from ...exceptions import UnknownFixtures, InvalidFixtureScope, CyclicFixtureDep
 from .namespace import Namespace
 from .parameters import iter_parametrization_fixtures
 from .fixture_base import FixtureBase
-from .utils import get_real_fixture_name_from_argument
+from .utils import get_real_fixture_name_from_argument, get_scope_by_name
 
 
 _fixture_id = itertools.count()
 
+_SESSION_SCOPE = get_scope_by_name('session')
+
 
 
 class Fixture(FixtureBase):
@@ -80,6 +82,11 @@ class Fixture(FixtureBase):
                     raise InvalidFixtureScope('Fixture {0} is dependent on {1}, which has a smaller scope ({2} > {3})'.format(
                         self.info.name, param_name, self.scope, needed_fixture.scope)) # pylint: disable=no-member
 
+                if self.info.pool_size is not None and needed_fixture.scope < _SESSION_SCOPE: # pylint: disable=no-member
+                    # pooled instances outlive the tests checking them out
+                    raise InvalidFixtureScope('Pooled fixture {0} can only depend on session fixtures ({1} is not)'.format(
+                        self.info.name, param_name))
+
                 if needed_fixture is self:
                     raise CyclicFixtureDependency('Cyclic fixture dependency detected in {0}: {1} depends on itself'.format(
                         self.info.func.__code__.co_filename,
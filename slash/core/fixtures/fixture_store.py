@@ -1,28 +1,44 @@
 import collections
+import functools
+import os
 import sys
+import threading
+import time
 from contextlib import contextmanager
 
 import logbook
 from orderedset import OrderedSet
+from sentinels import NOTHING
 
 from ..._compat import OrderedDict, iteritems, itervalues, reraise
+from ...conf import config
 from ...ctx import context as slash_context
 from ...exception_handling import handling_exceptions
 from ...exceptions import CyclicFixtureDependency, UnresolvedFixtureStore, UnknownFixtures, InvalidFixtureName
-from ...utils.python import get_arguments
+from ...utils.python import get_arguments, get_underlying_func
 from ..variation_factory import VariationFactory
 from ..test import is_valid_test_name
 from .active_fixture import ActiveFixture
+from .concurrent_setup import set_up_fixtures_concurrently
+from .resolution_plan import compile_resolution_plan
+from .timing import FixtureTimings
 from .fixture import Fixture
+from .lazy_value import LazyFixtureValue
 from .namespace import Namespace
-from .parameters import Parametrization, iter_parametrization_fixtures
-from .utils import (get_real_fixture_name_from_argument, get_scope_by_name,
-                    nofixtures)
+from .pool import FixturePool
+from .parameters import Parametrization, get_current_variation, iter_parametrization_fixtures
+from .utils import (get_real_fixture_name_from_argument, get_scope_by_name, get_scope_name_by_scope,
+                    is_lazy_argument, nofixtures)
+from .value_cache import get_cached_fixture_value
 
 _logger = logbook.Logger(__name__)
 
 class FixtureStore(object):
 
+    _test_scope = get_scope_by_name('test')
+    _directory_scope = get_scope_by_name('directory')
+    _session_scope = get_scope_by_name('session')
+
     def __init__(self):
         super(FixtureStore, self).__init__()
         self._namespaces = [Namespace(self)]
@@ -33,6 +49,13 @@ class FixtureStore(object):
         self._computing = set()
         self._all_needed_parametrization_ids_by_fixture_id = {}
         self._known_fixture_ids = collections.defaultdict(dict) # maps fixture ids to known combinations
+        self._resolution_plans = {}
+        self._directory_scopes = []
+        self._pools = {}
+        self._shared_namespaces = {}
+        self.timings = FixtureTimings()
+        # guards the bookkeeping of active fixtures, which may be set up concurrently (see run.concurrent_fixture_setup)
+        self._lock = threading.RLock()
 
     def get_active_fixture(self, fixture):
         return self._active_fixtures_by_scope[fixture.info.scope].get(fixture.info.id)
@@ -42,8 +65,9 @@ class FixtureStore(object):
             return variation.param_value_indices[p.info.id]
         combination = frozenset((f.info.id, self._compute_id(variation, f))
                                 for f in self.iter_all_needed_fixture_objects(p))
-        known = self._known_fixture_ids[p.info.id]
-        return known.setdefault(combination, len(known))
+        with self._lock:
+            known = self._known_fixture_ids[p.info.id]
+            return known.setdefault(combination, len(known))
 
     def iter_all_needed_fixture_objects(self, fixtureobj):
         for fid in self.get_all_needed_fixture_ids(fixtureobj):
@@ -56,9 +80,12 @@ class FixtureStore(object):
 
     def call_with_fixtures(self, test_func, namespace, trigger_test_start=False, trigger_test_end=False):
 
-        if not nofixtures.is_marked(test_func):
-            fixture_names = self.get_required_fixture_names(test_func)
-            kwargs = self.get_fixture_dict(fixture_names, namespace)
+        plan = self._get_resolution_plan(test_func, namespace)
+        if plan is not None:
+            num_threads = config.root.run.concurrent_fixture_setup
+            if num_threads > 1:
+                set_up_fixtures_concurrently(self, plan.get_root_fixtures(), num_threads)
+            kwargs = self._execute_resolution_plan(plan)
         else:
             kwargs = {}
 
@@ -74,6 +101,41 @@ class FixtureStore(object):
 
         return returned
 
+    def _get_resolution_plan(self, test_func, namespace):
+        # bound methods of different test instances share their plans
+        key = (getattr(test_func, '__func__', test_func), namespace)
+        returned = self._resolution_plans.get(key, NOTHING)
+        if returned is NOTHING:
+            if nofixtures.is_marked(test_func):
+                returned = None
+            else:
+                returned = compile_resolution_plan(self, self.get_required_fixture_names(test_func), namespace,
+                                                   lazy_names=self.get_lazy_fixture_names(test_func))
+            self._resolution_plans[key] = returned
+        return returned
+
+    def _execute_resolution_plan(self, plan):
+        computed = []
+        for fixture, relative_name, bindings in plan.steps:
+            if self.get_active_fixture(fixture) is None:
+                kwargs = dict((required_name, self.get_active_fixture(needed_fixture).value)
+                              for required_name, needed_fixture in bindings)
+                try:
+                    computed.append((relative_name, self._activate_fixture(fixture, kwargs)))
+                except:
+                    exc_info = sys.exc_info()
+                    self._deactivate_fixture(fixture)
+                    reraise(*exc_info)
+        if computed:
+            # a single record is much cheaper than one per fixture, and is only formatted when actually emitted
+            _logger.trace('Computed fixtures:\n{}', _LazyFixtureValues(computed))
+        returned = dict((required_name, self.get_active_fixture(fixture).value)
+                        for required_name, fixture in plan.arguments)
+        for required_name, fixture in plan.lazy_arguments:
+            returned[required_name] = LazyFixtureValue(
+                functools.partial(self.get_fixture_value, fixture, name=required_name))
+        return returned
+
     def get_required_fixture_names(self, test_func):
         """Returns a list of fixture names needed by test_func.
 
@@ -91,6 +153,11 @@ class FixtureStore(object):
                 returned.append((argument.name, real_name))
         return returned
 
+    def get_lazy_fixture_names(self, test_func):
+        """Returns the set of argument names of test_func which are annotated with :class:`slash.lazy`
+        """
+        return frozenset(argument.name for argument in get_arguments(test_func) if is_lazy_argument(argument))
+
     def get_required_fixture_objects(self, test_func, namespace):
         names = self.get_required_fixture_names(test_func)
         assert isinstance(names, list)
@@ -116,17 +183,34 @@ class FixtureStore(object):
     def __iter__(self):
         return itervalues(self._fixtures_by_id)
 
-    def push_namespace(self):
-        self._namespaces.append(Namespace(self, parent=self._namespaces[-1]))
+    def push_namespace(self, key=None):
+        """Pushes a new namespace on top of the current one.
+
+        Namespaces pushed with the same *key* on top of the same namespace are shared, so that fixtures added to
+        them (along with everything computed from them) are reused rather than added again. Returns whether the
+        pushed namespace is new
+        """
+        parent = self._namespaces[-1]
+        if key is None:
+            namespace = None
+        else:
+            namespace = self._shared_namespaces.get((parent, key))
+        is_new = namespace is None
+        if is_new:
+            namespace = Namespace(self, parent=parent)
+            if key is not None:
+                self._shared_namespaces[parent, key] = namespace
+        self._namespaces.append(namespace)
+        return is_new
 
     def pop_namespace(self):
         return self._namespaces.pop(-1)
 
     @contextmanager
-    def new_namespace_context(self):
-        self.push_namespace()
+    def new_namespace_context(self, key=None):
+        is_new = self.push_namespace(key=key)
         try:
-            yield
+            yield is_new
         finally:
             self.pop_namespace()
 
@@ -156,26 +240,42 @@ class FixtureStore(object):
             _ = self.get_fixture_value(fixture)
 
     def _compute_all_needed_parametrization_ids(self, fixtureobj):
-        stack = [(fixtureobj.info.id, [fixtureobj.info.id], set([fixtureobj.info.id]))]
-        returned = OrderedSet()
+        # iterative post-order traversal. The ids needed by every fixture along the way are memoized as well, so
+        # fixtures shared by many others (e.g. those of slashconf.py files) are only traversed once
+        computed = self._all_needed_parametrization_ids_by_fixture_id
+        path = [fixtureobj.info.id]
+        stack = [(fixtureobj, self._iter_needed_fixtures_reversed(fixtureobj))]
         while stack:
-            fixture_id, path, visited = stack.pop()
-            if fixture_id in self._all_needed_parametrization_ids_by_fixture_id:
-                returned.update(self._all_needed_parametrization_ids_by_fixture_id[fixture_id])
-                continue
-            fixture = self._fixtures_by_id[fixture_id]
-            if fixture.parametrization_ids:
-                assert isinstance(fixture.parametrization_ids, OrderedSet)
-                returned.update(fixture.parametrization_ids)
-            if fixture.keyword_arguments:
-                for needed in itervalues(fixture.keyword_arguments):
-                    if needed.is_parameter():
-                        continue
-                    needed_id = needed.info.id
-                    if needed_id in visited:
-                        self._raise_cyclic_dependency_error(fixtureobj, path, needed_id)
-                    stack.append((needed_id, path + [needed_id], visited | set([needed_id])))
-        return returned
+            fixture, needed_iterator = stack[-1]
+            for needed in needed_iterator:
+                needed_id = needed.info.id
+                if needed_id in computed:
+                    continue
+                if needed_id in path:
+                    self._raise_cyclic_dependency_error(fixtureobj, path, needed_id)
+                path.append(needed_id)
+                stack.append((needed, self._iter_needed_fixtures_reversed(needed)))
+                break
+            else:
+                stack.pop()
+                path.pop()
+                returned = OrderedSet()
+                if fixture.parametrization_ids:
+                    assert isinstance(fixture.parametrization_ids, OrderedSet)
+                    returned.update(fixture.parametrization_ids)
+                for needed in self._iter_needed_fixtures_reversed(fixture):
+                    returned.update(computed[needed.info.id])
+                computed[fixture.info.id] = returned
+        return computed[fixtureobj.info.id]
+
+    def _iter_needed_fixtures_reversed(self, fixture):
+        # dependencies are visited in reverse order, keeping the order in which parametrizations were always
+        # yielded
+        fixture = self._fixtures_by_id[fixture.info.id]
+        if fixture.keyword_arguments:
+            for needed in reversed(list(itervalues(fixture.keyword_arguments))):
+                if not needed.is_parameter():
+                    yield needed
 
     def _raise_cyclic_dependency_error(self, fixtureobj, path, new_id):
         raise CyclicFixtureDependency(
@@ -184,19 +284,62 @@ class FixtureStore(object):
                 ' -> '.join(self._fixtures_by_id[f_id].info.name
                             for f_id in path + [new_id])))
 
-    def push_scope(self, scope):
+    def push_scope(self, scope, directory=None):
+        """Notifies the store of a scope being entered. Directory scopes are nested, one for each directory the
+        current test resides under, and are identified by their *directory*
+        """
         scope = get_scope_by_name(scope)
+        if scope == self._directory_scope:
+            self._directory_scopes.append((directory, set()))
 
-    def pop_scope(self, scope): # pylint: disable=unused-argument
+    def pop_scope(self, scope):
+        scope = get_scope_by_name(scope)
+        popped_directory_fixture_ids = None
+        if scope == self._directory_scope and self._directory_scopes:
+            _, popped_directory_fixture_ids = self._directory_scopes.pop()
         if slash_context.result is not None and slash_context.result.is_interrupted():
             return
-        scope = get_scope_by_name(scope)
         for s, active_fixtures in iteritems(self._active_fixtures_by_scope):
-            if s <= scope:
-                for active_fixture in reversed(list(active_fixtures.values())):
+            if s > scope:
+                continue
+            for active_fixture in reversed(list(active_fixtures.values())):
+                if s == scope and popped_directory_fixture_ids is not None and \
+                   active_fixture.id not in popped_directory_fixture_ids:
+                    # bound to an enclosing directory
+                    continue
+                with handling_exceptions(swallow=True):
+                    self._deactivate_fixture(active_fixture.fixture)
+            assert not active_fixtures or s == self._directory_scope
+        if scope == self._session_scope:
+            for pool in itervalues(self._pools):
+                pool.close()
+            self._pools.clear()
+
+    def _get_directory_scope_fixture_ids(self, fixture):
+        # directory fixtures live as long as the directory they are defined in, or the innermost directory if
+        # they are defined elsewhere
+        directory = os.path.dirname(os.path.abspath(get_underlying_func(fixture.info.func).__code__.co_filename))
+        for scope_directory, fixture_ids in reversed(self._directory_scopes):
+            if scope_directory == directory:
+                return fixture_ids
+        return self._directory_scopes[-1][1]
+
+    def deactivate_fixtures_of_other_variations(self, variation):
+        """Tears down active fixtures wider than test scope which were set up with parameter values different from
+        the ones of *variation*, so that they are set up again with the right values. Only done when
+        ``run.group_by_fixture_parameters`` is set
+        """
+        if not variation or not config.root.run.group_by_fixture_parameters:
+            return
+        for scope, active_fixtures in iteritems(self._active_fixtures_by_scope):
+            if scope == self._test_scope:
+                continue
+            for active_fixture in reversed(list(active_fixtures.values())):
+                if any(variation.param_value_indices.get(param_id, value_index) != value_index
+                       for param_id, value_index in active_fixture.param_value_indices):
+                    _logger.trace('Parameters of {0} have changed. Tearing it down', active_fixture.name)
                     with handling_exceptions(swallow=True):
                         self._deactivate_fixture(active_fixture.fixture)
-                assert not active_fixtures
 
     def ensure_known_parametrization(self, parametrization):
         if parametrization.info.id not in self._fixtures_by_id:
@@ -226,6 +369,7 @@ class FixtureStore(object):
     def register_fixture_id(self, f):
         if f.info.id in self._fixtures_by_id:
             return
+        self._resolution_plans.clear()
         self._fixtures_by_id[f.info.id] = f
         self._unresolved_fixture_ids.add(f.info.id)
 
@@ -278,12 +422,17 @@ class FixtureStore(object):
             value = parameter_or_fixture.transform(value)
         return value
 
-    def iter_parametrization_variations(self, fixture_ids=(), funcs=(), methods=()):
+    def iter_parametrization_variations(self, fixture_ids=(), funcs=(), methods=(), combinatorial_strength=0):
+        """Yields the variations needed by the given fixtures, functions and methods.
+
+        :param combinatorial_strength: if nonzero, only a covering array of the parameter values is yielded, in
+           which every combination of values of any *combinatorial_strength* parameters appears at least once
+        """
 
         if self._unresolved_fixture_ids:
             raise UnresolvedFixtureStore()
 
-        variation_factory = VariationFactory(self)
+        variation_factory = VariationFactory(self, combinatorial_strength=combinatorial_strength)
         for fixture_id in fixture_ids:
             variation_factory.add_needed_fixture_id(fixture_id)
 
@@ -324,8 +473,6 @@ class FixtureStore(object):
 
     def _call_fixture(self, fixture, relative_name):
         assert relative_name
-        active_fixture = ActiveFixture(fixture)
-
         kwargs = {}
 
         if fixture.keyword_arguments is None:
@@ -339,24 +486,122 @@ class FixtureStore(object):
                 relative_name='{} -> {}'.format(relative_name, required_name))
 
 
-        assert fixture.info.id not in self._active_fixtures_by_scope[fixture.info.scope]
-        self._active_fixtures_by_scope[fixture.info.scope][fixture.info.id] = active_fixture
+        returned = self._activate_fixture(fixture, kwargs)
+        _logger.trace(' -- {} = {!r}', relative_name, returned)
+        return returned
+
+    def _activate_fixture(self, fixture, kwargs):
+        active_fixture = ActiveFixture(fixture)
+        if fixture.info.scope != self._test_scope:
+            active_fixture.param_value_indices = self._get_param_value_indices(fixture)
+        with self._lock:
+            assert fixture.info.id not in self._active_fixtures_by_scope[fixture.info.scope]
+            self._active_fixtures_by_scope[fixture.info.scope][fixture.info.id] = active_fixture
+            if fixture.info.scope == self._directory_scope and self._directory_scopes:
+                self._get_directory_scope_fixture_ids(fixture).add(fixture.info.id)
         prev_context_fixture = slash_context.fixture
         slash_context.fixture = active_fixture
+        start_time = time.time()
         try:
-            returned = active_fixture.value = fixture.get_value(kwargs, active_fixture)
+            if fixture.info.pool_size is not None:
+                returned = self._check_out_pooled_instance(fixture, kwargs, active_fixture)
+            elif fixture.info.cache is None:
+                returned = fixture.get_value(kwargs, active_fixture)
+            else:
+                returned = get_cached_fixture_value(self, fixture, kwargs, active_fixture)
+            active_fixture.value = returned
         finally:
             slash_context.fixture = prev_context_fixture
-        _logger.trace(' -- {} = {!r}', relative_name, returned)
+            self._record_timing(active_fixture, 'setup', time.time() - start_time)
+        return returned
+
+    def _record_timing(self, active_fixture, phase, duration):
+        if active_fixture.timing_params is None:
+            active_fixture.timing_params = self._get_param_values_description(active_fixture.fixture)
+        scope_name = get_scope_name_by_scope(active_fixture.fixture.info.scope)
+        self.timings.add(active_fixture.name, scope_name, active_fixture.timing_params, phase, duration)
+        if config.root.run.fixture_timing_details and slash_context.result is not None:
+            with self._lock:
+                slash_context.result.details.append('fixture_timings', {
+                    'fixture': active_fixture.name, 'scope': scope_name, 'params': active_fixture.timing_params,
+                    'phase': phase, 'duration': duration})
+
+    def _get_param_values_description(self, fixture):
+        variation = get_current_variation()
+        if not variation:
+            return {}
+        returned = {}
+        for param_id in self.get_all_needed_fixture_ids(fixture):
+            value_index = variation.param_value_indices.get(param_id)
+            if value_index is not None:
+                param = self.get_fixture_by_id(param_id)
+                values = param.values[value_index]
+                # parameters are keyed by their paths, without the modules they are defined in
+                returned[param.path.rpartition(':')[2]] = repr(values[0] if len(values) == 1 else tuple(values))
         return returned
 
+    def _check_out_pooled_instance(self, fixture, kwargs, active_fixture):
+        key = (fixture.info.id, self._get_param_value_indices(fixture))
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = self._pools[key] = FixturePool(fixture.info.pool_size, prefill=fixture.info.pool_prefill)
+        instance, wait_time = pool.check_out(functools.partial(self._create_pooled_instance, fixture, kwargs))
+        active_fixture.add_cleanup(functools.partial(pool.check_in, instance))
+        if slash_context.result is not None:
+            with self._lock:
+                lease_waits = slash_context.result.details.all().get('fixture_lease_wait', {})
+                lease_waits[fixture.info.name] = wait_time
+                slash_context.result.details.set('fixture_lease_wait', lease_waits)
+        return instance.value
+
+    def _create_pooled_instance(self, fixture, kwargs):
+        # instances keep their own cleanups, called when the pool is closed
+        instance = ActiveFixture(fixture)
+        prev_context_fixture = slash_context.fixture
+        slash_context.fixture = instance
+        try:
+            instance.value = fixture.get_value(dict(kwargs), instance)
+        except:
+            exc_info = sys.exc_info()
+            with handling_exceptions(swallow=True):
+                instance.do_cleanups()
+            reraise(*exc_info)
+        finally:
+            slash_context.fixture = prev_context_fixture
+        return instance
+
+    def _get_param_value_indices(self, fixture):
+        variation = get_current_variation()
+        if not variation:
+            return ()
+        return tuple((param_id, variation.param_value_indices[param_id])
+                     for param_id in self.get_all_needed_fixture_ids(fixture)
+                     if param_id in variation.param_value_indices)
+
     def _deactivate_fixture(self, fixture):
         # in most cases it will be the last active fixture in its scope
-        active = self._active_fixtures_by_scope[fixture.info.scope].pop(fixture.info.id, None)
+        with self._lock:
+            active = self._active_fixtures_by_scope[fixture.info.scope].pop(fixture.info.id, None)
         if active is not None:
-            active.do_cleanups()
+            start_time = time.time()
+            try:
+                active.do_cleanups()
+            finally:
+                self._record_timing(active, 'teardown', time.time() - start_time)
 
     def resolve(self):
+        self._resolution_plans.clear()
         while self._unresolved_fixture_ids:
             fixture = self._fixtures_by_id[self._unresolved_fixture_ids.pop()]
             fixture.resolve(self)
+
+
+class _LazyFixtureValues(object):
+
+    def __init__(self, values):
+        super(_LazyFixtureValues, self).__init__()
+        self._values = values
+
+    def __str__(self):
+        return '\n'.join(' -- {} = {!r}'.format(relative_name, value) for relative_name, value in self._values)
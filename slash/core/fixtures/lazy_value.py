@@ -0,0 +1,121 @@
+import operator
+
+from sentinels import NOTHING
+
+
+class LazyFixtureValue(object):
+    """Stands in for the value of a fixture requested through :class:`slash.lazy`. The value is computed by calling
+    *compute* the first time the proxy is used, after which attribute access, item access, calls, iteration,
+    comparisons and arithmetic are forwarded to it
+    """
+
+    __slots__ = ('_compute', '_value')
+
+    def __init__(self, compute):
+        super(LazyFixtureValue, self).__init__()
+        object.__setattr__(self, '_compute', compute)
+        object.__setattr__(self, '_value', NOTHING)
+
+    @property
+    def __class__(self):
+        return type(_materialize(self))
+
+    def __getattr__(self, attr):
+        return getattr(_materialize(self), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(_materialize(self), attr, value)
+
+    def __delattr__(self, attr):
+        delattr(_materialize(self), attr)
+
+    def __dir__(self):
+        return dir(_materialize(self))
+
+    def __repr__(self):
+        if not is_computed(self):
+            return '<Lazy fixture value (not computed yet)>'
+        return repr(_materialize(self))
+
+    def __str__(self):
+        return str(_materialize(self))
+
+    def __bool__(self):
+        return bool(_materialize(self))
+
+    __nonzero__ = __bool__
+
+    def __hash__(self):
+        return hash(_materialize(self))
+
+    def __len__(self):
+        return len(_materialize(self))
+
+    def __iter__(self):
+        return iter(_materialize(self))
+
+    def __contains__(self, item):
+        return item in _materialize(self)
+
+    def __getitem__(self, key):
+        return _materialize(self)[key]
+
+    def __setitem__(self, key, value):
+        _materialize(self)[key] = value
+
+    def __delitem__(self, key):
+        del _materialize(self)[key]
+
+    def __call__(self, *args, **kwargs):
+        return _materialize(self)(*args, **kwargs)
+
+    def __enter__(self):
+        return _materialize(self).__enter__()
+
+    def __exit__(self, *args):
+        return _materialize(self).__exit__(*args)
+
+    def __int__(self):
+        return int(_materialize(self))
+
+    def __float__(self):
+        return float(_materialize(self))
+
+    def __index__(self):
+        return operator.index(_materialize(self))
+
+
+def is_computed(lazy_value):
+    return object.__getattribute__(lazy_value, '_value') is not NOTHING
+
+
+def _materialize(lazy_value):
+    returned = object.__getattribute__(lazy_value, '_value')
+    if returned is NOTHING:
+        returned = object.__getattribute__(lazy_value, '_compute')()
+        object.__setattr__(lazy_value, '_value', returned)
+        object.__setattr__(lazy_value, '_compute', None)
+    return returned
+
+
+def _forward_operator(name, func):
+    def forwarded(self, *args):
+        return func(_materialize(self), *args)
+    forwarded.__name__ = name
+    setattr(LazyFixtureValue, name, forwarded)
+
+
+def _forward_reflected_operator(name, func):
+    def forwarded(self, other):
+        return func(other, _materialize(self))
+    forwarded.__name__ = name
+    setattr(LazyFixtureValue, name, forwarded)
+
+
+for _name in ('lt', 'le', 'eq', 'ne', 'gt', 'ge', 'neg', 'pos', 'abs', 'invert'):
+    _forward_operator('__{0}__'.format(_name), getattr(operator, _name))
+
+for _name in ('add', 'sub', 'mul', 'truediv', 'floordiv', 'mod', 'pow', 'and', 'or', 'xor', 'lshift', 'rshift'):
+    _func = getattr(operator, '{0}_'.format(_name) if _name in ('and', 'or') else _name)
+    _forward_operator('__{0}__'.format(_name), _func)
+    _forward_reflected_operator('__r{0}__'.format(_name), _func)
@@ -66,12 +66,17 @@ def bound_parametrizations_context(variation, fixture_store, fixture_namespace):
     assert _current_variation is None
     _current_variation = variation
     try:
+        fixture_store.deactivate_fixtures_of_other_variations(variation)
         fixture_store.activate_autouse_fixtures_in_namespace(fixture_namespace)
         yield
     finally:
         _current_variation = None
 
 
+def get_current_variation():
+    return _current_variation
+
+
 def iter_parametrization_fixtures(func):
     if isinstance(func, FixtureBase):
         func = func.fixture_func
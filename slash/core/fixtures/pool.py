@@ -0,0 +1,78 @@
+import threading
+import time
+
+from ...exception_handling import handling_exceptions
+
+
+class FixturePool(object):
+    """Holds the instances of a pooled fixture. Up to *size* instances are created, either lazily or all at once
+    when the first one is needed (if *prefill* is True). Instances are checked out for the exclusive use of a single
+    test at a time, and are torn down (through their ``do_cleanups`` method) when the pool is closed.
+
+    Pools are kept per process, so *size* does not limit the instances created by different parallel workers
+    """
+
+    def __init__(self, size, prefill=False):
+        super(FixturePool, self).__init__()
+        self._size = size
+        self._prefill = prefill
+        self._condition = threading.Condition()
+        self._idle = []
+        self._instances = []
+        self._num_pending = 0
+
+    def check_out(self, create_instance):
+        """Returns a tuple of (instance, seconds waited for it). Blocks until an instance is available, and calls
+        *create_instance* to create new instances when the pool is not full
+        """
+        start_time = time.time()
+        with self._condition:
+            while not self._idle and len(self._instances) + self._num_pending >= self._size:
+                self._condition.wait()
+            if self._idle:
+                return self._idle.pop(), time.time() - start_time
+            num_to_create = 1
+            if self._prefill:
+                num_to_create = self._size - len(self._instances) - self._num_pending
+            self._num_pending += num_to_create
+
+        returned = None
+        try:
+            for _ in range(num_to_create):
+                instance = create_instance()
+                with self._condition:
+                    self._num_pending -= 1
+                    num_to_create -= 1
+                    self._instances.append(instance)
+                    if returned is None:
+                        returned = instance
+                    else:
+                        self._idle.append(instance)
+                        self._condition.notify()
+        except:  # pylint: disable=bare-except
+            with self._condition:
+                self._num_pending -= num_to_create
+                if returned is not None:
+                    self._idle.append(returned)
+                self._condition.notify_all()
+            raise
+        return returned, time.time() - start_time
+
+    def check_in(self, instance):
+        with self._condition:
+            self._idle.append(instance)
+            self._condition.notify()
+
+    def close(self):
+        """Tears down all instances, in reverse order of their creation
+        """
+        with self._condition:
+            instances = self._instances[::-1]
+            del self._instances[:]
+            del self._idle[:]
+        for instance in instances:
+            with handling_exceptions(swallow=True):
+                instance.do_cleanups()
+
+    def __len__(self):
+        return len(self._instances)
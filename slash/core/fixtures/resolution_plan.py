@@ -0,0 +1,74 @@
+from ..._compat import iteritems
+from ...exceptions import CyclicFixtureDependency, UnresolvedFixtureStore
+
+
+class ResolutionPlan(object):
+    """A precompiled recipe for computing the fixtures needed by a test function in a given namespace.
+
+    ``steps`` lists the fixtures the function depends on, directly or indirectly, with dependencies ahead of the
+    fixtures needing them. Each step is a tuple of (fixture, relative name, keyword argument bindings), where the
+    bindings are (argument name, fixture) pairs. ``arguments`` holds the (argument name, fixture) pairs of the
+    function itself, and ``lazy_arguments`` the pairs of arguments annotated with :class:`slash.lazy`, which are
+    left out of the steps since they are only computed when accessed
+    """
+
+    def __init__(self, arguments, steps, lazy_arguments=()):
+        super(ResolutionPlan, self).__init__()
+        self.arguments = arguments
+        self.steps = steps
+        self.lazy_arguments = lazy_arguments
+
+    def get_root_fixtures(self):
+        return [fixture for _, fixture in self.arguments]
+
+
+def compile_resolution_plan(store, fixture_names, namespace, lazy_names=frozenset()):
+    arguments = []
+    lazy_arguments = []
+    steps = []
+    planned = set()
+    for element in fixture_names:
+        if isinstance(element, tuple):
+            required_name, real_name = element
+        else:
+            required_name = real_name = element
+        fixture = namespace.get_fixture_by_name(real_name)
+        if required_name in lazy_names:
+            lazy_arguments.append((required_name, fixture))
+            continue
+        arguments.append((required_name, fixture))
+        _add_steps(fixture, required_name, steps, planned)
+    return ResolutionPlan(arguments, steps, lazy_arguments)
+
+
+def _add_steps(root, root_name, steps, planned):
+    # iterative post-order traversal, visiting dependencies in the order they are computed by the fixture store
+    if root.info.id in planned:
+        return
+    visiting = set([root.info.id])
+    stack = [(root, root_name, _iter_needed_fixtures(root))]
+    while stack:
+        fixture, relative_name, needed_iterator = stack[-1]
+        for required_name, needed_fixture in needed_iterator:
+            if needed_fixture.info.id in planned:
+                continue
+            if needed_fixture.info.id in visiting:
+                raise CyclicFixtureDependency(
+                    'Fixture {0!r} is a part of a dependency cycle!'.format(required_name))
+            visiting.add(needed_fixture.info.id)
+            stack.append((needed_fixture, '{} -> {}'.format(relative_name, required_name),
+                          _iter_needed_fixtures(needed_fixture)))
+            break
+        else:
+            stack.pop()
+            visiting.discard(fixture.info.id)
+            planned.add(fixture.info.id)
+            steps.append((fixture, relative_name, tuple(_iter_needed_fixtures(fixture))))
+
+
+def _iter_needed_fixtures(fixture):
+    if fixture.keyword_arguments is None:
+        raise UnresolvedFixtureStore('Fixture {0} is unresolved!'.format(fixture.info.name))
+    for required_name, needed_fixture in iteritems(fixture.keyword_arguments):
+        if not needed_fixture.is_parameter():
+            yield required_name, needed_fixture
@@ -0,0 +1,106 @@
+import json
+import threading
+
+from ..._compat import OrderedDict, itervalues
+
+
+class FixtureTimingSummary(object):
+    """Aggregates the setup and teardown durations of a fixture, for a specific scope and set of parameter values
+    """
+
+    def __init__(self, name, scope, params):
+        super(FixtureTimingSummary, self).__init__()
+        self.name = name
+        self.scope = scope
+        self.params = params
+        self.num_setups = 0
+        self.setup_duration = 0
+        self.num_teardowns = 0
+        self.teardown_duration = 0
+
+    def get_total_duration(self):
+        return self.setup_duration + self.teardown_duration
+
+    def get_description(self):
+        if not self.params:
+            return self.name
+        return '{0}({1})'.format(self.name, ', '.join('{0}={1}'.format(path, value)
+                                                      for path, value in sorted(self.params.items())))
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'scope': self.scope,
+            'params': dict(self.params),
+            'num_setups': self.num_setups,
+            'setup_duration': self.setup_duration,
+            'num_teardowns': self.num_teardowns,
+            'teardown_duration': self.teardown_duration,
+        }
+
+
+class FixtureTimings(object):
+    """Keeps track of the time spent setting up and tearing down fixtures throughout the session, aggregated by
+    fixture, scope and parameter values
+    """
+
+    def __init__(self):
+        super(FixtureTimings, self).__init__()
+        self._summaries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, name, scope, params, phase, duration):
+        """Records a single setup or teardown of a fixture. *params* is a dictionary mapping parameter paths to the
+        representations of their values, and *phase* is either ``'setup'`` or ``'teardown'``
+        """
+        key = (name, scope, tuple(sorted(params.items())))
+        with self._lock:  # fixtures may be set up concurrently
+            summary = self._summaries.get(key)
+            if summary is None:
+                summary = self._summaries[key] = FixtureTimingSummary(name, scope, params)
+            if phase == 'setup':
+                summary.num_setups += 1
+                summary.setup_duration += duration
+            else:
+                summary.num_teardowns += 1
+                summary.teardown_duration += duration
+
+    def merge(self, summaries):
+        """Adds summaries aggregated elsewhere (e.g. by parallel workers), given as dictionaries like the ones
+        returned by :meth:`to_dict`
+        """
+        with self._lock:
+            for summary_dict in summaries:
+                params = summary_dict['params']
+                key = (summary_dict['name'], summary_dict['scope'], tuple(sorted(params.items())))
+                summary = self._summaries.get(key)
+                if summary is None:
+                    summary = self._summaries[key] = FixtureTimingSummary(
+                        summary_dict['name'], summary_dict['scope'], params)
+                summary.num_setups += summary_dict['num_setups']
+                summary.setup_duration += summary_dict['setup_duration']
+                summary.num_teardowns += summary_dict['num_teardowns']
+                summary.teardown_duration += summary_dict['teardown_duration']
+
+    def get_summaries(self):
+        """Returns the recorded fixture summaries, most expensive first
+        """
+        return sorted(itervalues(self._summaries), key=lambda summary: summary.get_total_duration(), reverse=True)
+
+    def get_total_duration(self):
+        return sum(summary.get_total_duration() for summary in itervalues(self._summaries))
+
+    def to_dict(self):
+        return {
+            'total_duration': self.get_total_duration(),
+            'fixtures': [summary.to_dict() for summary in self.get_summaries()],
+        }
+
+    def dump(self, path):
+        """Writes the summaries, most expensive first, to *path* as JSON
+        """
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def __len__(self):
+        return len(self._summaries)
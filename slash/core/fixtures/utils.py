@@ -6,6 +6,7 @@ from sentinels import NOTHING
 
 from ...ctx import context
 from ..._compat import izip, iteritems
+from ...exceptions import InvalidFixtureScope, FixtureException
 from ...utils.python import get_arguments_dict, wraps
 from ...utils.function_marker import function_marker
 
@@ -17,13 +18,37 @@ def _ensure_fixture_info(func, **kwargs):
         func.__slash_fixture__ = FixtureInfo(func, **kwargs)
     return func
 
-def fixture(func=None, name=None, scope=None, autouse=False):
+def fixture(func=None, name=None, scope=None, autouse=False, cache=None):
     if func is None:
-        return functools.partial(fixture, name=name, scope=scope, autouse=autouse)
+        return functools.partial(fixture, name=name, scope=scope, autouse=autouse, cache=cache)
 
     if inspect.isgeneratorfunction(func):
-        return yield_fixture(func=func, name=name, scope=scope, autouse=autouse)
-    return _ensure_fixture_info(func=func, name=name, scope=scope, autouse=autouse)
+        return yield_fixture(func=func, name=name, scope=scope, autouse=autouse, cache=cache)
+    return _ensure_fixture_info(func=func, name=name, scope=scope, autouse=autouse, cache=cache)
+
+def pooled_fixture(func=None, size=1, prefill=False, name=None, autouse=False):
+    """Builds a pooled fixture. Up to *size* instances of the fixture are created throughout the session -- lazily,
+    or all at once when the first one is needed if *prefill* is True. Each test needing the fixture checks out an
+    instance for its exclusive use, returning it to the pool when the test ends. Instances are torn down at the
+    end of the session:
+
+    >>> @slash.pooled_fixture(size=2)
+    ... def vm(this):
+    ...     returned = VM()
+    ...     this.add_cleanup(returned.destroy)
+    ...     return returned
+
+    The time each test waited for an instance is recorded in its result details, under ``fixture_lease_wait``.
+    Pools are kept per process -- when tests run in parallel, each worker has a pool of its own, and *size* is not
+    enforced across workers
+    """
+    if func is None:
+        return functools.partial(pooled_fixture, size=size, prefill=prefill, name=name, autouse=autouse)
+
+    kwargs = dict(name=name, autouse=autouse, pool_size=size, pool_prefill=prefill)
+    if inspect.isgeneratorfunction(func):
+        return yield_fixture(func=func, **kwargs)
+    return _ensure_fixture_info(func=func, **kwargs)
 
 nofixtures = function_marker('__slash_nofixtures__')
 nofixtures.__doc__ = 'Marks the decorated function as opting out of automatic fixture deduction. ' + \
@@ -32,7 +57,8 @@ nofixtures.__doc__ = 'Marks the decorated function as opting out of automatic fi
 
 class FixtureInfo(object):
 
-    def __init__(self, func=None, name=None, scope=None, autouse=False, path=None):
+    def __init__(self, func=None, name=None, scope=None, autouse=False, path=None, cache=None, pool_size=None,
+                 pool_prefill=False):
         super(FixtureInfo, self).__init__()
         self.path = path
         self.id = next(_id_gen)
@@ -47,6 +73,25 @@ class FixtureInfo(object):
         self.func = func
         self.autouse = autouse
         self.scope = _SCOPES[scope]
+        if cache is False:
+            cache = None
+        if cache is not None:
+            if scope != 'session':
+                raise InvalidFixtureScope('Only session fixtures can be cached (fixture {0} has scope {1!r})'.format(
+                    name, scope))
+            if func is not None and inspect.isgeneratorfunction(func):
+                raise FixtureException('Fixture {0} cannot be cached, since it has a teardown'.format(name))
+        #: True or an invalidation key (a string or a callable returning one) when the fixture value is cached on disk
+        self.cache = cache
+        if pool_size is not None:
+            if scope != 'test':
+                raise InvalidFixtureScope('Pooled fixtures cannot have a scope (fixture {0} has scope {1!r})'.format(
+                    name, scope))
+            if pool_size < 1:
+                raise FixtureException('Invalid pool size for fixture {0}: {1!r}'.format(name, pool_size))
+        #: the maximal number of instances of a pooled fixture, or None if the fixture is not pooled
+        self.pool_size = pool_size
+        self.pool_prefill = pool_prefill
         if self.func is not None:
 
             self.required_args = get_arguments_dict(self.func)
@@ -65,7 +110,7 @@ def get_scope_name_by_scope(scope_id):
     return _SCOPES_BY_ID[scope_id]
 
 _SCOPES = dict(
-    izip(('test', 'module', 'session'), itertools.count()))
+    izip(('test', 'class', 'module', 'directory', 'session'), itertools.count()))
 
 _SCOPES_BY_ID = dict((id, name) for (name, id) in iteritems(_SCOPES))
 
@@ -100,25 +145,29 @@ def yield_fixture(func=None, **kw):
     ...     m.turn_on(wait=True)
     ...     yield m
     ...     m.turn_off()
+
+    Passing ``deferred_teardown=True`` runs the post-yield part in the background, like cleanups added with
+    ``deferred=True``
     """
 
     if func is None:
         return functools.partial(yield_fixture, **kw)
 
+    deferred_teardown = kw.pop('deferred_teardown', False)
     func = _ensure_fixture_info(func=func, **kw)
 
     @wraps(func)
     def new_func(**kwargs):
         f = func(**kwargs)
         value = next(f)
-        @context.fixture.add_cleanup
-        def cleanup(): # pylint: disable=unused-variable
+        def cleanup():
             try:
                 next(f)
             except StopIteration:
                 pass
             else:
                 raise RuntimeError('Yielded fixture did not stop at cleanup')
+        context.fixture.add_cleanup(cleanup, deferred=deferred_teardown)
         return value
     return new_func
 
@@ -134,10 +183,31 @@ class use(object):
         self.real_fixture_name = real_fixture_name
 
 
+class lazy(object):
+    """Defers computing a fixture needed by a test until the test first accesses it. The test receives a proxy
+    standing in for the fixture value, which computes the fixture (and the fixtures it depends on) when used
+
+    def test_something(microwave: lazy()):
+        ...
+
+    def test_something_else(m: lazy('microwave')):
+        ...
+    """
+
+    def __init__(self, real_fixture_name=None):
+        super(lazy, self).__init__()
+        self.real_fixture_name = real_fixture_name
+
+
 def get_real_fixture_name_from_argument(argument):
-    if argument.annotation is not NOTHING and isinstance(argument.annotation, use):
-        return argument.annotation.real_fixture_name
+    if argument.annotation is not NOTHING and isinstance(argument.annotation, (use, lazy)):
+        if argument.annotation.real_fixture_name is not None:
+            return argument.annotation.real_fixture_name
     return argument.name
 
 
-__all__ = ['fixture', 'nofixtures', 'generator_fixture', 'yield_fixture', 'use']
+def is_lazy_argument(argument):
+    return isinstance(argument.annotation, lazy)
+
+
+__all__ = ['fixture', 'nofixtures', 'generator_fixture', 'yield_fixture', 'pooled_fixture', 'use', 'lazy']
@@ -0,0 +1,206 @@
+import hashlib
+import inspect
+import os
+import pickle
+import time
+
+import logbook
+from sentinels import NOTHING
+
+from ..._compat import itervalues
+from ...conf import config
+from ...exceptions import FixtureException
+from ...utils.path import ensure_directory
+from ...utils.python import get_underlying_func
+from .parameters import get_current_variation
+
+_logger = logbook.Logger(__name__)
+
+_FORMAT_VERSION = 2
+_ENTRY_SUFFIX = '.pickle'
+_SECONDS_IN_DAY = 24 * 60 * 60
+
+
+def get_fixture_value_cache():
+    """Returns the :class:`FixtureValueCache` configured by ``run.fixture_cache_path``, or None if it is disabled
+    """
+    path = config.root.run.fixture_cache_path
+    if not path:
+        return None
+    return FixtureValueCache(path, max_entries=config.root.run.fixture_cache_max_entries,
+                             max_age_days=config.root.run.fixture_cache_max_age_days)
+
+
+def clear_fixture_value_cache():
+    cache = get_fixture_value_cache()
+    if cache is not None:
+        _logger.debug('Clearing the fixture cache')
+        cache.clear()
+
+
+def get_cached_fixture_value(store, fixture, kwargs, active_fixture):
+    """Returns the value of a fixture declared with ``cache``, restoring it from the fixture value cache when
+    possible, and computing (and storing) it otherwise
+    """
+    cache = get_fixture_value_cache()
+    if cache is None:
+        return _compute_value(fixture, kwargs, active_fixture)
+    key = cache.get_key(store, fixture, get_current_variation())
+    returned = cache.get(key)
+    if returned is NOTHING:
+        returned = _compute_value(fixture, kwargs, active_fixture)
+        cache.store(key, returned)
+    else:
+        _logger.debug('Restored value of fixture {0} from the fixture cache', fixture.info.name)
+    return returned
+
+
+def _compute_value(fixture, kwargs, active_fixture):
+    returned = fixture.get_value(kwargs, active_fixture)
+    if active_fixture.has_callbacks():
+        # restored values skip the fixture function, so its cleanups and callbacks would be silently dropped
+        raise FixtureException('Fixture {0} cannot be cached, since it adds cleanups or test callbacks'.format(
+            fixture.info.name))
+    return returned
+
+
+class FixtureValueCache(object):
+    """Persistently stores the values of cached fixtures, keyed by their invalidation keys, their source code, the
+source code of the fixtures they depend on and the parameter values they depend on.
+
+    Entries not used for more than *max_age_days* days are evicted, as are the least recently used entries
+    once there are more than *max_entries* of them
+    """
+
+    def __init__(self, path, max_entries=None, max_age_days=None):
+        super(FixtureValueCache, self).__init__()
+        self._path = os.path.expanduser(path)
+        self._max_entries = max_entries
+        self._max_age_days = max_age_days
+
+    def get_key(self, store, fixture, variation):
+        func = get_underlying_func(fixture.info.func)
+        hasher = hashlib.sha1()
+        hasher.update('{0}|{1}|{2}|{3}'.format(
+            _FORMAT_VERSION, os.path.abspath(func.__code__.co_filename), fixture.info.name,
+            _get_invalidation_key(fixture.info.cache)).encode('utf-8'))
+        hasher.update(_get_source(func))
+        for name, source in sorted(_iter_dependency_sources(store, fixture)):
+            hasher.update('|{0}:'.format(name).encode('utf-8'))
+            hasher.update(source)
+        for param_path, value_digest in sorted(_iter_param_value_digests(store, fixture, variation)):
+            hasher.update('|{0}={1}'.format(param_path, value_digest).encode('utf-8'))
+        return hasher.hexdigest()
+
+    def get(self, key):
+        """Returns the value stored under *key*, or NOTHING if there is none
+        """
+        entry_path = self._get_entry_path(key)
+        try:
+            with open(entry_path, 'rb') as f:
+                returned = pickle.load(f)
+            # the modification time of entries marks when they were last used
+            os.utime(entry_path, None)
+        except (IOError, OSError, EOFError):
+            return NOTHING
+        except Exception:  # pylint: disable=broad-except
+            _logger.debug('Could not load fixture cache entry {0}', entry_path, exc_info=True)
+            return NOTHING
+        return returned
+
+    def store(self, key, value):
+        entry_path = self._get_entry_path(key)
+        tmp_path = '{0}.{1}.tmp'.format(entry_path, os.getpid())
+        try:
+            ensure_directory(self._path)
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(value, f, pickle.HIGHEST_PROTOCOL)
+            os.rename(tmp_path, entry_path)
+        except Exception:  # pylint: disable=broad-except
+            _logger.warning('Could not store fixture value in the fixture cache', exc_info=True)
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            return
+        self.evict()
+
+    def evict(self):
+        entries = sorted(self._iter_entries(), reverse=True)
+        if self._max_age_days is not None:
+            threshold = time.time() - self._max_age_days * _SECONDS_IN_DAY
+            while entries and entries[-1][0] < threshold:
+                self._remove(entries.pop()[1])
+        if self._max_entries is not None:
+            while len(entries) > self._max_entries:
+                self._remove(entries.pop()[1])
+
+    def clear(self):
+        for _, entry_path in self._iter_entries():
+            self._remove(entry_path)
+
+    def __len__(self):
+        return sum(1 for _ in self._iter_entries())
+
+    def _iter_entries(self):
+        if not os.path.isdir(self._path):
+            return
+        for filename in os.listdir(self._path):
+            if not filename.endswith(_ENTRY_SUFFIX):
+                continue
+            entry_path = os.path.join(self._path, filename)
+            try:
+                yield os.path.getmtime(entry_path), entry_path
+            except OSError:
+                continue
+
+    def _remove(self, entry_path):
+        try:
+            os.unlink(entry_path)
+        except OSError:
+            _logger.debug('Could not remove fixture cache entry {0}', entry_path, exc_info=True)
+
+    def _get_entry_path(self, key):
+        return os.path.join(self._path, key + _ENTRY_SUFFIX)
+
+
+def _get_invalidation_key(cache):
+    if cache is True:
+        return ''
+    if callable(cache):
+        cache = cache()
+    return str(cache)
+
+
+def _get_source(func):
+    try:
+        return inspect.getsource(func).encode('utf-8')
+    except (IOError, OSError, TypeError):
+        return func.__code__.co_code
+
+
+def _iter_dependency_sources(store, fixture):
+    # fixtures needed directly or indirectly, whose code may affect the value just like the fixture's own code
+    visited = set([fixture.info.id])
+    pending = [fixture]
+    while pending:
+        keyword_arguments = store.get_fixture_by_id(pending.pop().info.id).keyword_arguments or {}
+        for needed in itervalues(keyword_arguments):
+            if needed.is_parameter() or needed.info.id in visited:
+                continue
+            visited.add(needed.info.id)
+            pending.append(needed)
+            yield needed.info.name, _get_source(get_underlying_func(needed.info.func))
+
+
+def _iter_param_value_digests(store, fixture, variation):
+    for param_id in store.get_all_needed_fixture_ids(fixture):
+        param = store.get_fixture_by_id(param_id)
+        yield param.path, _get_value_digest(param.values[variation.param_value_indices[param_id]])
+
+
+def _get_value_digest(value):
+    # values are pickled, which (unlike their representations) usually stays the same between sessions
+    try:
+        data = pickle.dumps(value, 2)
+    except Exception:  # pylint: disable=broad-except
+        data = repr(value).encode('utf-8')
+    return hashlib.sha1(data).hexdigest()
@@ -46,8 +46,12 @@ class FunctionTestFactory(RunnableTestFactory):
         super(FunctionTestFactory, self).__init__(func)
         self.func = func
 
+    def get_test_tags(self):
+        return [get_tags(self.func)]
+
     def _generate_tests(self, fixture_store):
         namespace = fixture_store.get_current_namespace()
-        for variation in fixture_store.iter_parametrization_variations(funcs=[self.func]):
+        for variation in fixture_store.iter_parametrization_variations(
+                funcs=[self.func], combinatorial_strength=self._get_combinatorial_strength(self.func)):
             for _ in xrange(self._get_num_repetitions(self.func)):
                 yield FunctionTest(self.func, fixture_store, namespace, variation)
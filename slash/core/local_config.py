@@ -1,42 +1,61 @@
 import os
 
-import dessert
-from emport import import_file
+from ..utils.rewriting import import_file_rewriting_assertions
 
 class LocalConfig(object):
 
     def __init__(self):
         super(LocalConfig, self).__init__()
         self._slashconf_vars_cache = {}
+        self._configs_by_path = {}
         self._configs = []
 
     def push_path(self, path):
-        self._configs.append(self._build_config(path))
+        path = os.path.abspath(path)
+        config = self._configs_by_path.get(path)
+        if config is None:
+            config = self._configs_by_path[path] = self._build_config(path)
+        self._configs.append(config)
 
     def pop_path(self):
         self._configs.pop(-1)
 
     def get_dict(self):
-        return self._configs[-1]
+        return self._configs[-1][1]
+
+    def get_key(self):
+        """Returns a key identifying the slashconf files making up the current configuration. Paths sharing the
+        same slashconf files get the same key
+        """
+        return self._configs[-1][0]
+
+    def get_slashconf_paths(self, path):
+        """Returns the paths of the slashconf files affecting *path*, from the innermost outwards
+        """
+        return [slashconf_path for slashconf_path in (os.path.join(dir_path, 'slashconf.py')
+                                                      for dir_path in self._traverse_upwards(path))
+                if os.path.isfile(slashconf_path)]
 
     def _build_config(self, path):
         confstack = []
+        conf_dir_paths = []
         for dir_path in self._traverse_upwards(path):
             slashconf_vars = self._slashconf_vars_cache.get(dir_path)
             if slashconf_vars is None:
                 slashconf_path = os.path.join(dir_path, 'slashconf.py')
                 if os.path.isfile(slashconf_path):
-                    with dessert.rewrite_assertions_context():
-                        slashconf_vars = self._slashconf_vars_cache[dir_path] = vars(import_file(slashconf_path))
+                    slashconf_vars = self._slashconf_vars_cache[dir_path] = vars(
+                        import_file_rewriting_assertions(slashconf_path))
 
             if slashconf_vars is not None:
                 confstack.append(slashconf_vars)
+                conf_dir_paths.append(dir_path)
 
         returned = {}
         # start loading from the parent so that vars are properly overriden
         for slashconf_vars in reversed(confstack):
             returned.update(slashconf_vars)
-        return returned
+        return tuple(conf_dir_paths), returned
 
     def _traverse_upwards(self, path):
         path = os.path.abspath(path)
@@ -2,4 +2,5 @@ from ..utils.function_marker import function_marker, append_function_marker
 
 
 repeat_marker = function_marker('repeat')
+combinatorial_marker = function_marker('combinatorial')
 exclude_marker = append_function_marker('exclude')
@@ -9,13 +9,15 @@ class Metadata(object):
     as test.__slash__
     """
 
-    #: The index of the test in the current execution, 0-based
-    test_index0 = None
+    __slots__ = ('id', 'test_index0', 'tags', '_sort_key', 'module_name', 'file_path', 'factory_name', 'variation',
+                 'address_in_file', 'address_in_factory', 'address', '_class_name', '_interactive', '__weakref__')
 
     def __init__(self, factory, test):
         super(Metadata, self).__init__()
         #: The test's unique id
         self.id = None
+        #: The index of the test in the current execution, 0-based
+        self.test_index0 = None
         self.tags = test.get_tags()
         self._sort_key = next(_sort_key_generator)
         if factory is not None:
@@ -0,0 +1,56 @@
+import itertools
+
+from .._compat import OrderedDict, iteritems
+from .fixtures.utils import get_scope_by_name
+
+
+def group_by_fixture_parameters(tests):
+    """Reorders tests so that, within each module, tests sharing the parameter values of their module and session
+    fixtures run one after the other. This way each such fixture value is set up once per module, instead of
+    each time the parameter values change between consecutive tests.
+
+    Tests of the same module are kept together, and the relative order of tests sharing their parameter values is
+    preserved
+    """
+    returned = []
+    for _, module_tests in itertools.groupby(tests, key=lambda test: test.__slash__.module_name):
+        groups = OrderedDict()
+        for test in module_tests:
+            groups.setdefault(get_wide_parameter_indices(test), []).append(test)
+        for key in sorted(groups):
+            returned.extend(groups[key])
+    return returned
+
+
+def get_wide_parameter_indices(test, scope='module'):
+    """Returns the indices of the parameter values the test uses for its fixtures of the given scope or wider,
+    as a sorted tuple of (parameter id, value index) pairs
+    """
+    store = getattr(test, '_fixture_store', None)
+    variation = test.get_variation() if store is not None else None
+    if not variation:
+        return ()
+    param_ids = set()
+    for fixture in iter_needed_fixtures(test, scope):
+        param_ids.update(store.get_all_needed_fixture_ids(fixture))
+    return tuple(sorted((param_id, value_index)
+                        for param_id, value_index in iteritems(variation.param_value_indices)
+                        if param_id in param_ids))
+
+
+def iter_needed_fixtures(test, scope='test'):
+    """Yields the fixtures needed by a test, directly or indirectly, whose scope is *scope* or wider
+    """
+    min_scope = get_scope_by_name(scope)
+    store = test._fixture_store  # pylint: disable=protected-access
+    stack = list(test.get_required_fixture_objects())
+    stack.extend(store.iter_autouse_fixtures_in_namespace(test._fixture_namespace))  # pylint: disable=protected-access
+    seen = set()
+    while stack:
+        fixture = stack.pop()
+        if fixture.info.id in seen or fixture.is_parameter():
+            continue
+        seen.add(fixture.info.id)
+        if fixture.info.scope >= min_scope:
+            yield fixture
+        stack.extend((fixture.keyword_arguments or {}).values())
@@ -1,17 +1,23 @@
+import bisect
 import functools
 import itertools
 import os
+import pickle
 import sys
+import weakref
 from numbers import Number
 
 import gossip
 import logbook
 
-from .._compat import itervalues, OrderedDict
+from .._compat import iteritems, itervalues, OrderedDict, string_types, xrange
 from ..ctx import context
 from .. import hooks
+from ..conf import config
+from .collection_cache import CachedMetadata, _metadata_to_dict
 from .details import Details
 from .error import Error
+from .result_store import ResultStore
 from ..exceptions import FAILURE_EXCEPTION_TYPES
 from ..utils.deprecation import deprecated
 from ..utils.exception_mark import ExceptionMarker
@@ -21,27 +27,55 @@ _logger = logbook.Logger(__name__)
 
 _ADDED_TO_RESULT = ExceptionMarker('added_to_result')
 
+#: shared by all results until they get their first error, failure, skip or extra log path
+_NO_ITEMS = ()
+
 
 class Result(object):
     """Represents a single result for a test which was run
     """
 
+    # results of passing tests make up most of the results of large sessions, so containers are only allocated
+    # once something is written to them
+    __slots__ = ('test_metadata', '_data', '_errors', '_failures', '_skips', '_details', '_facts', '_started',
+                 '_finished', '_interrupted', '_log_path', '_extra_logs', '_index', '_index_position',
+                 '_counted_states', '__weakref__')
+
     def __init__(self, test_metadata=None):
         super(Result, self).__init__()
         self.test_metadata = test_metadata
-        #: dictionary to be use by tests and plugins to store result-related information for later analysis
-        self.data = {}
-        self._errors = []
-        self._failures = []
-        self._skips = []
-        #: a :class:`slash.core.details.Details` instance for storing additional test details
-        self.details = Details()
-        self.facts = Details(set_callback=self._fact_set_callback)
+        self._data = None
+        self._errors = self._failures = self._skips = self._extra_logs = _NO_ITEMS
+        self._details = self._facts = None
         self._started = False
         self._finished = False
         self._interrupted = False
         self._log_path = None
-        self._extra_logs = []
+        self._index = None
+        self._index_position = None
+        self._counted_states = None
+
+    @property
+    def data(self):
+        """dictionary to be use by tests and plugins to store result-related information for later analysis
+        """
+        if self._data is None:
+            self._data = {}
+        return self._data
+
+    @property
+    def details(self):
+        """a :class:`slash.core.details.Details` instance for storing additional test details
+        """
+        if self._details is None:
+            self._details = Details()
+        return self._details
+
+    @property
+    def facts(self):
+        if self._facts is None:
+            self._facts = Details(set_callback=self._fact_set_callback)
+        return self._facts
 
     def _fact_set_callback(self, fact_name, fact_value):
         gossip.trigger('slash.fact_set', name=fact_name, value=fact_value)
@@ -106,7 +140,7 @@ class Result(object):
     def add_extra_log_path(self, path):
         """Add additional log path. This path will be added to the list returns by get_log_paths
         """
-        self._extra_logs.append(path)
+        self._append('_extra_logs', path)
 
     def get_log_paths(self):
         """Returns a list of all log paths
@@ -124,6 +158,7 @@ class Result(object):
 
     def mark_started(self):
         self._started = True
+        self._update_index()
 
     def is_error(self):
         return bool(self._errors)
@@ -161,9 +196,25 @@ class Result(object):
 
     def mark_finished(self):
         self._finished = True
+        self._update_index()
 
     def mark_interrupted(self):
         self._interrupted = True
+        self._update_index()
+
+    def _get_counted_states(self):
+        states = tuple(predicate(self) for _, predicate in _COUNTED_STATES)
+        # only a handful of state combinations are possible, so results share the tuples describing them
+        return _STATES_BY_VALUE.setdefault(states, states)
+
+    def _update_index(self):
+        if self._index is None:
+            return
+        states = self._get_counted_states()
+        if states != self._counted_states:
+            self._index.update_states(self._index_position, self._counted_states, states)
+            self._counted_states = states
+        self._index.notify_changed(self._index_position, self)
 
     def is_interrupted(self):
         return self._interrupted
@@ -171,14 +222,14 @@ class Result(object):
     def add_error(self, e=None, frame_correction=0, exc_info=None):
         """Adds a failure to the result
         """
-        err = self._add_error(self._errors, e, frame_correction=frame_correction + 1, exc_info=exc_info)
+        err = self._add_error('_errors', e, frame_correction=frame_correction + 1, exc_info=exc_info)
         context.reporter.report_test_error_added(context.test, err)
         return err
 
     def add_failure(self, e=None, frame_correction=0, exc_info=None):
         """Adds a failure to the result
         """
-        err = self._add_error(self._failures, e, frame_correction=frame_correction + 1, exc_info=exc_info, is_failure=True)
+        err = self._add_error('_failures', e, frame_correction=frame_correction + 1, exc_info=exc_info, is_failure=True)
         context.reporter.report_test_failure_added(context.test, err)
         return err
 
@@ -187,7 +238,7 @@ class Result(object):
         """
         self.details.set(key, value)
 
-    def _add_error(self, error_list, error=None, frame_correction=0, exc_info=None, is_failure=False):
+    def _add_error(self, list_attr, error=None, frame_correction=0, exc_info=None, is_failure=False):
         try:
             if error is None:
                 error = Error.capture_exception(exc_info=exc_info)
@@ -198,8 +249,10 @@ class Result(object):
             if is_failure:
                 # force the error object to be marked as failure
                 error.mark_as_failure()
-            _logger.debug('Error added: {0}\n{0.traceback}', error, extra={'to_error_log': 1})
-            error_list.append(error)
+            # the traceback itself is distilled only when needed, which logging should not force
+            _logger.debug('Error added: {0}\n{1}', error, _LazyTracebackSummary(error), extra={'to_error_log': 1})
+            self._append(list_attr, error)
+            self._update_index()
             hooks.error_added(result=self, error=error)  # pylint: disable=no-member
             return error
         except Exception:
@@ -207,21 +260,45 @@ class Result(object):
             raise
 
     def add_skip(self, reason):
-        self._skips.append(reason)
+        self._append('_skips', reason)
+        self._update_index()
         context.reporter.report_test_skip_added(context.test, reason)
 
+    def _append(self, list_attr, item):
+        self._get_list(list_attr).append(item)
+
+    def _get_list(self, list_attr):
+        returned = getattr(self, list_attr)
+        if returned is _NO_ITEMS:
+            returned = []
+            setattr(self, list_attr, returned)
+        return returned
+
+    def _get_list_or_empty(self, list_attr):
+        # reading does not allocate a list for the result, which keeps sharing the empty container
+        returned = getattr(self, list_attr)
+        if returned is _NO_ITEMS:
+            return []
+        return returned
+
     def get_errors(self):
-        return self._errors
+        """Returns the errors added to the result
+        """
+        return self._get_list_or_empty('_errors')
 
     def get_failures(self):
-        return self._failures
+        """Returns the failures added to the result
+        """
+        return self._get_list_or_empty('_failures')
 
     @deprecated('Use result.details.all()', since='0.20.0')
     def get_additional_details(self):
         return self.details.all()
 
     def get_skips(self):
-        return self._skips
+        """Returns the skip reasons added to the result
+        """
+        return self._get_list_or_empty('_skips')
 
     def has_skips(self):
         return bool(self._skips)
@@ -230,6 +307,60 @@ class Result(object):
         return any(e.is_fatal() for e in
                    itertools.chain(self._errors, self._failures))
 
+    def serialize(self):
+        """Returns a representation of this result's state, which can later be applied to another result object
+        through :meth:`.deserialize` (e.g. when collecting results from parallel workers). Values of details, facts
+        and data are returned as they are -- use :meth:`.dumps` to get the state in a transferable form
+        """
+        return {
+            'started': self._started,
+            'finished': self._finished,
+            'interrupted': self._interrupted,
+            'errors': list(self._errors),
+            'failures': list(self._failures),
+            'skips': list(self._skips),
+            'details': dict(self._details.all()) if self._details is not None else {},
+            'facts': dict(self._facts.all()) if self._facts is not None else {},
+            'data': dict(self._data or {}),
+            'log_path': self._log_path,
+            'extra_logs': list(self._extra_logs),
+        }
+
+    def dumps(self, include_metadata=False):
+        """Returns the state returned by :meth:`.serialize`, pickled. Values of details, facts and data which cannot
+        be pickled are replaced by their representations. If *include_metadata* is True, a description of the test
+        metadata is added under ``test_metadata`` (see :class:`slash.core.collection_cache.CachedMetadata`)
+        """
+        serialized = self.serialize()
+        if include_metadata and self.test_metadata is not None:
+            serialized['test_metadata'] = _metadata_to_dict(self.test_metadata)
+        try:
+            return pickle.dumps(serialized, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:  # pylint: disable=broad-except
+            for key in ('details', 'facts', 'data'):
+                serialized[key] = _make_picklable_dict(serialized[key])
+            return pickle.dumps(serialized, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def deserialize(self, serialized):
+        """Restores the state previously returned by :meth:`.serialize`. No hooks are triggered in the process
+        """
+        # pylint: disable=protected-access
+        self._started = serialized['started']
+        self._finished = serialized['finished']
+        self._interrupted = serialized['interrupted']
+        for list_attr, key in [('_errors', 'errors'), ('_failures', 'failures'), ('_skips', 'skips'),
+                               ('_extra_logs', 'extra_logs')]:
+            for item in serialized[key]:
+                self._append(list_attr, item)
+        if serialized['details']:
+            self.details._restore(serialized['details'])
+        if serialized['facts']:
+            self.facts._restore(serialized['facts'])
+        if serialized['data']:
+            self.data.update(serialized['data'])
+        self._log_path = serialized['log_path']
+        self._update_index()
+
     def __repr__(self):
         return "< Result ({0})>".format(
             ", ".join(
@@ -240,6 +371,259 @@ class Result(object):
         )
 
 
+class _LazyTracebackSummary(object):
+
+    def __init__(self, error):
+        super(_LazyTracebackSummary, self).__init__()
+        self._error = error
+
+    def __str__(self):
+        return self._error.get_traceback_summary()
+
+
+def _make_picklable_dict(d):
+    return dict((key, value if _can_pickle(value) else repr(value)) for key, value in iteritems(d))
+
+
+def _can_pickle(value):
+    try:
+        pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:  # pylint: disable=broad-except
+        return False
+    return True
+
+
+def _is_unsuccessful(result, allow_skips=False):
+    # a result preventing the session from being successful
+    return (not result.is_finished() and not result.is_skip()) or not result.is_success(allow_skips=allow_skips)
+
+
+#: (name, predicate) pairs of the result states indexed by :class:`SessionResults` as results change
+_COUNTED_STATES = (
+    ('started', Result.is_started),
+    ('not_run', Result.is_not_run),
+    ('success_finished', Result.is_success_finished),
+    ('error', Result.is_error),
+    ('failure', Result.is_failure),
+    ('just_failure', Result.is_just_failure),
+    ('skip', Result.is_skip),
+    ('run_and_skip', Result.is_run_and_skip),
+    ('interrupted', Result.is_interrupted),
+    ('unsuccessful', _is_unsuccessful),
+    ('unsuccessful_allowing_skips', functools.partial(_is_unsuccessful, allow_skips=True)),
+)
+_COUNTED_STATE_PREDICATES = dict(_COUNTED_STATES)
+_STATES_BY_VALUE = {}
+_COUNTED_STATE_INDEXES = dict((name, index) for index, (name, _) in enumerate(_COUNTED_STATES))
+
+#: statuses accepted by :meth:`SessionResults.query`, mapped to the indexed states they stand for
+_QUERY_STATUSES = {
+    'started': 'started',
+    'not_run': 'not_run',
+    'success': 'success_finished',
+    'error': 'error',
+    'failure': 'failure',
+    'skip': 'skip',
+    'interrupted': 'interrupted',
+    'unsuccessful': 'unsuccessful',
+}
+
+
+#: states most results end up in. The positions of results in these states are not kept, and are instead derived
+#: from the positions of the results in the (much rarer) states ruling them out
+_COMMON_STATE_EXCLUSIONS = {
+    'started': ('not_run',),
+    'success_finished': ('not_run', 'skip', 'unsuccessful_allowing_skips'),
+}
+
+
+class _ResultIndex(object):
+    """Keeps the test results of a session in the order they were added, along with the number of results in each of
+    the indexed states, the positions of the results in each of the rarer states, and the positions of the results
+    of each file path, factory name and tag. Results update the state index whenever their state changes, keeping
+    counts and lookups independent of the number of results
+    """
+
+    def __init__(self, on_spilled_result_changed=None):
+        super(_ResultIndex, self).__init__()
+        self._results = []
+        self._on_spilled_result_changed = on_spilled_result_changed
+        self._counts = [0] * len(_COUNTED_STATES)
+        self._by_state = [None if name in _COMMON_STATE_EXCLUSIONS else set() for name, _ in _COUNTED_STATES]
+        # results are only ever appended, so these keep sorted lists of positions
+        self._by_file_path = {}
+        self._by_factory_name = {}
+        self._by_tag = {}
+
+    def add(self, result):
+        position = len(self._results)
+        self._results.append(result)
+        metadata = result.test_metadata
+        if metadata is not None:
+            self._by_file_path.setdefault(_normalize_path(metadata.file_path), []).append(position)
+            self._by_factory_name.setdefault(metadata.factory_name, []).append(position)
+            for tag_name in metadata.tags:
+                self._by_tag.setdefault(tag_name, []).append(position)
+        return position
+
+    def update_states(self, position, prev_states, states):
+        for index, state in enumerate(states):
+            if state == (prev_states[index] if prev_states is not None else False):
+                continue
+            self._counts[index] += 1 if state else -1
+            positions = self._by_state[index]
+            if positions is None:
+                continue
+            if state:
+                positions.add(position)
+            else:
+                positions.discard(position)
+
+    def __len__(self):
+        return len(self._results)
+
+    def get_count(self, state_name):
+        return self._counts[_COUNTED_STATE_INDEXES[state_name]]
+
+    def get_by_position(self, position):
+        return self._results[position]
+
+    def replace(self, position, entry):
+        self._results[position] = entry
+
+    def notify_changed(self, position, result):
+        entry = self._results[position]
+        if entry is not result and self._on_spilled_result_changed is not None:
+            # spilled results may still change after their tests end, e.g. by deferred or module cleanups
+            self._on_spilled_result_changed(entry, result)
+
+    def get_by_state(self, state_name):
+        excluded_state_names = _COMMON_STATE_EXCLUSIONS.get(state_name)
+        if excluded_state_names is None:
+            return self._by_state[_COUNTED_STATE_INDEXES[state_name]]
+        return _PositionsExcluding(len(self._results), self.get_count(state_name),
+                                   [self.get_by_state(excluded_state_name) for excluded_state_name in excluded_state_names])
+
+    def get_by_file_path(self, file_path):
+        return self._by_file_path.get(_normalize_path(file_path), ())
+
+    def get_by_factory_name(self, factory_name):
+        return self._by_factory_name.get(factory_name, ())
+
+    def get_by_tag(self, tag_name):
+        return self._by_tag.get(tag_name, ())
+
+    def get_results(self, candidates):
+        """Returns the results whose positions appear in all of *candidates* (sets, sorted lists or views of
+        positions), in the order they were added. Only the smallest candidate is iterated
+        """
+        candidates = sorted(candidates, key=len)
+        positions = sorted(position for position in candidates[0]
+                           if all(_contains_position(other, position) for other in candidates[1:]))
+        return [self._results[position] for position in positions]
+
+
+def _contains_position(positions, position):
+    if not isinstance(positions, list):
+        return position in positions
+    index = bisect.bisect_left(positions, position)
+    return index < len(positions) and positions[index] == position
+
+
+class _PositionsExcluding(object):
+    """The positions of the results in one of the common states, i.e. of all results except the ones in the states
+    ruling it out. Nothing is computed up front, so lookups do not depend on the number of results
+    """
+
+    __slots__ = ('_num_results', '_length', '_excluded')
+
+    def __init__(self, num_results, length, excluded):
+        super(_PositionsExcluding, self).__init__()
+        self._num_results = num_results
+        self._length = length
+        self._excluded = excluded
+
+    def __len__(self):
+        return self._length
+
+    def __contains__(self, position):
+        return 0 <= position < self._num_results and not any(position in excluded for excluded in self._excluded)
+
+    def __iter__(self):
+        for position in xrange(self._num_results):
+            if not any(position in excluded for excluded in self._excluded):
+                yield position
+
+
+class _PositionsUnion(object):
+    """The positions of the results in any of several states
+    """
+
+    __slots__ = ('_parts',)
+
+    def __init__(self, parts):
+        super(_PositionsUnion, self).__init__()
+        self._parts = parts
+
+    def __len__(self):
+        # an upper bound, which is all that is needed to choose the smallest candidates to iterate
+        return sum(len(part) for part in self._parts)
+
+    def __contains__(self, position):
+        return any(position in part for part in self._parts)
+
+    def __iter__(self):
+        return iter(sorted(set(itertools.chain.from_iterable(self._parts))))
+
+
+class _SpilledResult(object):
+    """Stands in for a finished test result moved to the session's :class:`.ResultStore`. Only the test address and
+    status, the result's position and the offset of its serialized state are kept in memory, while its state is
+    tracked by the result index. The test metadata is only referenced weakly -- it is usually kept alive by the test
+    itself, and is otherwise restored from its description in the store.
+
+    Results changing after they are spilled are held in *pending* until their new state is stored
+    """
+
+    __slots__ = ('address', 'status', 'position', 'offset', 'pending', '_test_metadata_ref')
+
+    def __init__(self, result, position, offset):
+        super(_SpilledResult, self).__init__()
+        self.address = result.test_metadata.address
+        self.status = _get_status(result)
+        self.position = position
+        self.offset = offset
+        self.pending = None
+        self._test_metadata_ref = weakref.ref(result.test_metadata)
+
+    def get_test_metadata(self, serialized):
+        returned = self._test_metadata_ref()
+        if returned is None:
+            returned = CachedMetadata.from_dict(serialized['test_metadata'])
+        return returned
+
+    def __repr__(self):
+        return '<Spilled result of {0}: {1}>'.format(self.address, self.status)
+
+
+def _get_status(result):
+    if result.is_not_run():
+        return 'not_run'
+    if result.is_interrupted():
+        return 'interrupted'
+    if result.is_error():
+        return 'error'
+    if result.is_failure():
+        return 'failure'
+    if result.is_skip():
+        return 'skip'
+    return 'success'
+
+
+def _normalize_path(path):
+    return os.path.normcase(os.path.abspath(path))
+
+
 class GlobalResult(Result):
 
     def is_global_result(self):
@@ -254,7 +638,9 @@ class SessionResults(object):
         self.session = session
         self.global_result = GlobalResult()
         self._results_dict = OrderedDict()
-        self._iterator = functools.partial(itervalues, self._results_dict)
+        self._store = None
+        self._pending_spilled = []
+        self._index = _ResultIndex(on_spilled_result_changed=self._update_spilled)
 
     def __len__(self):
         return len(self._results_dict)
@@ -268,16 +654,16 @@ class SessionResults(object):
 
     def iter_all_additional_details(self):
         for result in self.iter_all_results():
-            if result.details:
+            if result._details:  # pylint: disable=protected-access
                 yield result, result.get_additional_details()
 
     def iter_all_failures(self):
-        for result in self.iter_all_results():
+        for result in itertools.chain(self.query(status='failure'), [self.global_result]):
             if result.get_failures():
                 yield result, result.get_failures()
 
     def iter_all_errors(self):
-        for result in self.iter_all_results():
+        for result in itertools.chain(self.query(status='error'), [self.global_result]):
             if result.get_errors():
                 yield result, result.get_errors()
 
@@ -286,55 +672,46 @@ class SessionResults(object):
         test_id = context.test_id
         if test_id is None:
             return self.global_result
-        return self._results_dict[test_id]
+        return self._load(self._results_dict[test_id])
 
     def __iter__(self):
-        return self._iterator()
+        for entry in itervalues(self._results_dict):
+            yield self._load(entry)
 
     def is_success(self, allow_skips=False):
         if not self.global_result.is_success():
             return False
-        for result in self._iterator():
-            if not result.is_finished() and not result.is_skip():
-                return False
-            if not result.is_success(allow_skips=allow_skips):
-                return False
-        return True
+        return self._index.get_count('unsuccessful_allowing_skips' if allow_skips else 'unsuccessful') == 0
 
     def is_interrupted(self):
-        return any(result.is_interrupted() for result in self._iterator())
+        return self._index.get_count('interrupted') > 0
 
     def get_num_results(self):
         return len(self._results_dict)
 
     def get_num_started(self):
-        return self._count(Result.is_started, include_global=False)
+        return self._index.get_count('started')
 
     def get_num_successful(self):
-        return self._count(Result.is_success_finished, include_global=False)
+        return self._index.get_count('success_finished')
 
     def get_num_errors(self):
-        return self._count(Result.is_error)
+        return self._count('error')
 
     def get_num_failures(self):
-        return self._count(Result.is_just_failure)
+        return self._count('just_failure')
 
     def get_num_skipped(self, include_not_run=True):
         if include_not_run:
-            return self._count(Result.is_skip)
-        return self._count(Result.is_run_and_skip)
+            return self._count('skip')
+        return self._count('run_and_skip')
 
     def get_num_not_run(self):
-        return self._count(Result.is_not_run, include_global=False)
-
-    def _count(self, pred, include_global=True):
-        returned = 0
-        iterator = self.iter_all_results(
-        ) if include_global else self.iter_test_results()
-        for result in iterator:
-            if pred(result):
-                returned += 1
-        return returned
+        return self._index.get_count('not_run')
+
+    def _count(self, state_name):
+        # test results are counted as they change, while the global result is checked directly
+        return self._index.get_count(state_name) + int(bool(_COUNTED_STATE_PREDICATES[state_name](self.global_result)))
 
     def iter_test_results(self):
         return iter(self)
@@ -345,18 +722,114 @@ class SessionResults(object):
     def create_result(self, test):
         assert test.__slash__.id not in self._results_dict
         returned = Result(test.__slash__)
-        self._results_dict[test.__slash__.id] = returned
+        self._register_result(test.__slash__.id, returned)
         return returned
 
+    def _register_result(self, test_id, result):
+        # pylint: disable=protected-access
+        self._results_dict[test_id] = result
+        result._index = self._index
+        result._index_position = self._index.add(result)
+        result._update_index()
+
     def get_result(self, test):
         if test.__slash__ is None:
             raise LookupError("Could not find result for {0}".format(test))
-        return self._results_dict[test.__slash__.id]
+        return self._load(self._results_dict[test.__slash__.id])
 
     def __getitem__(self, test):
         if isinstance(test, Number):
-            try:
-                return next(itertools.islice(itervalues(self._results_dict), test, test + 1))
-            except StopIteration:
-                raise IndexError()
+            return self._load(self._index.get_by_position(test))
         return self.get_result(test)
+
+    def query(self, status=None, file_path=None, factory_name=None, tag=None):
+        """Returns a list of the test results matching all of the given criteria, in the order the results were
+        added. Each criterion is looked up in an index, so the cost depends on the number of matching results rather
+        than on the total number of results.
+
+        :param status: one of ``'started'``, ``'not_run'``, ``'success'``, ``'error'``, ``'failure'``, ``'skip'``,
+          ``'interrupted'`` or ``'unsuccessful'``, or a collection of these to match results in any of them
+        :param file_path: the path of the file in which the tests were defined
+        :param factory_name: the name of the test function or class from which the tests were generated
+        :param tag: the name of a tag the tests are tagged with
+        """
+        candidates = []
+        if status is not None:
+            candidates.append(self._get_positions_by_status(status))
+        if file_path is not None:
+            candidates.append(self._index.get_by_file_path(file_path))
+        if factory_name is not None:
+            candidates.append(self._index.get_by_factory_name(factory_name))
+        if tag is not None:
+            candidates.append(self._index.get_by_tag(tag))
+        if not candidates:
+            return list(self.iter_test_results())
+        return [self._load(entry) for entry in self._index.get_results(candidates)]
+
+    def _get_positions_by_status(self, status):
+        statuses = [status] if isinstance(status, string_types) else status
+        parts = []
+        for status_name in statuses:
+            state_name = _QUERY_STATUSES.get(status_name)
+            if state_name is None:
+                raise ValueError('Unknown result status: {0!r}'.format(status_name))
+            parts.append(self._index.get_by_state(state_name))
+        if len(parts) == 1:
+            return parts[0]
+        return _PositionsUnion(parts)
+
+    def get_position(self, result):
+        """Returns the position of a test result in the session, starting from zero
+        """
+        # pylint: disable=protected-access
+        position = result._index_position
+        if position is not None and 0 <= position < len(self._index):
+            entry = self._index.get_by_position(position)
+            if entry is result or (isinstance(entry, _SpilledResult) and entry.address == result.test_metadata.address):
+                return position
+        raise LookupError('{0!r} is not a result of this session'.format(result))
+
+    def spill(self, result):
+        """Moves a finished test result to the session's result store when ``run.spill_results`` is set, keeping
+        only a compact summary in memory. Results obtained from the session afterwards are loaded back from the store,
+        and are snapshots -- changing them does not affect the session's results. The original result object remains
+        tracked, so errors added to it later on (e.g. by deferred or module cleanups) are still recorded. Such changes
+        are stored once per spilled result, the next time a result is spilled or when the result is loaded
+        """
+        # pylint: disable=protected-access
+        if not config.root.run.spill_results or result.is_global_result() or result._index is not self._index:
+            return
+        position = result._index_position
+        if self._index.get_by_position(position) is not result:
+            return
+        if self._store is None:
+            self._store = ResultStore(config.root.run.results_store_dir)
+        self._store_pending_spilled()
+        summary = _SpilledResult(result, position, self._store.append(result.dumps(include_metadata=True)))
+        self._results_dict[result.test_id] = summary
+        self._index.replace(position, summary)
+
+    def _update_spilled(self, summary, result):
+        # the result object is still attached to the index, keeping the counts up to date. Its new state is stored
+        # later on, so that a burst of changes (e.g. errors added by several cleanups) is only stored once
+        if summary.pending is None:
+            summary.pending = result
+            self._pending_spilled.append(summary)
+
+    def _store_pending_spilled(self):
+        for summary in self._pending_spilled:
+            result, summary.pending = summary.pending, None
+            summary.offset = self._store.append(result.dumps(include_metadata=True))
+            summary.status = _get_status(result)
+        del self._pending_spilled[:]
+
+    def _load(self, entry):
+        if not isinstance(entry, _SpilledResult):
+            return entry
+        if entry.pending is not None:
+            self._store_pending_spilled()
+        serialized = self._store.load(entry.offset)
+        returned = Result(entry.get_test_metadata(serialized))
+        returned.deserialize(serialized)
+        returned._index_position = entry.position  # pylint: disable=protected-access
+        return returned
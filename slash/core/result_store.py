@@ -0,0 +1,47 @@
+import os
+import pickle
+import tempfile
+import threading
+
+
+class ResultStore(object):
+    """An append-only store of pickled test results (as returned by :meth:`slash.core.result.Result.dumps`).
+
+    Results are kept in an anonymous temporary file, created in *directory* (or the default temporary directory),
+    which is removed as soon as the store is closed or garbage collected
+    """
+
+    def __init__(self, directory=None):
+        super(ResultStore, self).__init__()
+        if directory is not None:
+            directory = os.path.expanduser(directory)
+        self._directory = directory
+        self._file = None
+        self._num_results = 0
+        self._lock = threading.Lock()
+
+    def append(self, data):
+        """Stores a pickled result, returning the offset from which its unpickled state can later be loaded
+        """
+        with self._lock:
+            if self._file is None:
+                self._file = tempfile.TemporaryFile(prefix='slash-results-', dir=self._directory)
+            self._file.seek(0, os.SEEK_END)
+            returned = self._file.tell()
+            self._file.write(data)
+            self._num_results += 1
+        return returned
+
+    def load(self, offset):
+        with self._lock:
+            self._file.seek(offset)
+            return pickle.load(self._file)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __len__(self):
+        return self._num_results
@@ -1,6 +1,6 @@
 import sys
 
-from .markers import repeat_marker
+from .markers import combinatorial_marker, repeat_marker
 from .metadata import Metadata
 from ..conf import config
 
@@ -47,6 +47,12 @@ class RunnableTestFactory(object):
         assert returned
         return returned
 
+    def get_test_tags(self):
+        """Returns a list of the tags of each test function or method this factory generates tests from, or None
+        if they cannot be known before generating the tests
+        """
+        return None
+
     def generate_tests(self, fixture_store):
         """
         Generates :class:`.RunnableTest` instances to run
@@ -63,3 +69,10 @@ class RunnableTestFactory(object):
 
     def _get_num_repetitions(self, func):
         return repeat_marker.get_value(func, 1) * config.root.run.repeat_each
+
+    def _get_combinatorial_strength(self, *marked):
+        for thing in marked:
+            returned = combinatorial_marker.get_value(thing, None)
+            if returned is not None:
+                return returned
+        return config.root.run.combinatorial_strength
@@ -1,4 +1,5 @@
 import functools
+import os
 
 import logbook
 
@@ -7,12 +8,20 @@ from ..utils.python import call_all_raise_first
 _logger = logbook.Logger(__name__)
 
 class ScopeManager(object):
+    """Tracks the scopes entered and left as tests are run -- the session, the directories the current test file
+    resides under, its module, its class and the test itself.
+
+    Directory scopes are nested: one is entered for the directory of each test file, and one for each of its
+    parent directories containing a ``slashconf.py`` file
+    """
 
     def __init__(self, session):
         super(ScopeManager, self).__init__()
         self._session = session
         self._scopes = []
-        self._last_module = self._last_test = None
+        self._directories = []
+        self._directory_chains = {}
+        self._last_module = self._last_class = self._last_test = None
 
     def begin_test(self, test):
         test_module = test.__slash__.module_name
@@ -21,14 +30,22 @@ class ScopeManager(object):
         if self._last_module is None:
             self._push_scope('session')
 
-
         if self._last_module != test_module:
             if self._last_module is not None:
                 _logger.trace('Module scope has changed. Popping previous module scope')
+                self._pop_scope('class')
                 self._pop_scope('module')
-            assert self._scopes[-1] != 'module'
+            assert self._scopes[-1] not in ('class', 'module')
+            self._enter_directories(self._get_directory_chain(test.__slash__.file_path))
             self._push_scope('module')
+            self._last_class = None
+        test_class = self._get_class_key(test)
+        if self._last_class != test_class:
+            if self._last_class is not None:
+                self._pop_scope('class')
+            self._push_scope('class')
         self._last_module = test_module
+        self._last_class = test_class
         self._push_scope('test')
         self._last_test = test
 
@@ -39,16 +56,60 @@ class ScopeManager(object):
     def get_current_stack(self):
         return self._scopes[:]
 
-    def _push_scope(self, scope):
+    def get_current_directories(self):
+        """Returns the directories whose scopes are currently entered, outermost first
+        """
+        return self._directories[:]
+
+    def _enter_directories(self, directories):
+        num_common = 0
+        for entered, directory in zip(self._directories, directories):
+            if entered != directory:
+                break
+            num_common += 1
+        while len(self._directories) > num_common:
+            self._pop_scope('directory')
+        for directory in directories[num_common:]:
+            self._push_scope('directory', directory=directory)
+
+    def _get_directory_chain(self, file_path):
+        if not file_path:
+            return []
+        directory = os.path.dirname(os.path.abspath(file_path))
+        returned = self._directory_chains.get(directory)
+        if returned is None:
+            returned = [directory]
+            child, parent = directory, os.path.dirname(directory)
+            while parent != child:
+                if os.path.isfile(os.path.join(parent, 'slashconf.py')):
+                    returned.append(parent)
+                child, parent = parent, os.path.dirname(parent)
+            returned.reverse()
+            self._directory_chains[directory] = returned
+        return returned
+
+    def _get_class_key(self, test):
+        if test.__slash__.class_name is None:
+            # tests which are not methods have a class scope of their own
+            return test
+        return test.__slash__.class_name
+
+    def _push_scope(self, scope, directory=None):
         self._scopes.append(scope)
         _logger.trace('Pushed scope {0}', scope)
-        self._session.fixture_store.push_scope(scope)
+        if scope == 'directory':
+            self._directories.append(directory)
+            self._session.fixture_store.push_scope(scope, directory=directory)
+        else:
+            self._session.fixture_store.push_scope(scope)
         self._session.cleanups.push_scope(scope)
 
     def _pop_scope(self, scope):
         popped = self._scopes.pop()
         _logger.trace('Popping scope {0} (expected {1})', popped, scope)
         assert popped == scope
+        if scope == 'directory':
+            self._directories.pop()
         call_all_raise_first([self._session.cleanups.pop_scope, self._session.fixture_store.pop_scope],
                              scope)
         _logger.trace('Popped scope {0}', popped)
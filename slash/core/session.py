@@ -1,10 +1,12 @@
 import itertools
+import os
 import sys
 import time
 import uuid
 from contextlib import contextmanager
 
 from .. import ctx, hooks, log, exceptions
+from ..conf import config
 from .cleanup_manager import CleanupManager
 from ..exception_handling import handling_exceptions
 from ..exceptions import INTERRUPTION_EXCEPTIONS
@@ -23,6 +25,8 @@ class Session(Activatable):
     """
 
     duration = start_time = end_time = None
+    #: the index of the current worker process when running in parallel, or None otherwise
+    parallel_worker_id = None
 
     def __init__(self, reporter=None, console_stream=None):
         super(Session, self).__init__()
@@ -112,11 +116,23 @@ class Session(Activatable):
             with handling_exceptions():
                 self.cleanups.pop_scope('session-global')
 
+            with handling_exceptions():
+                self.cleanups.wait_for_deferred_cleanups()
+
             if session_start_called:
                 with handling_exceptions():
                     hooks.session_end()  # pylint: disable=no-member
+            self._report_fixture_timings()
             self.reporter.report_session_end(self)
 
+    def _report_fixture_timings(self):
+        timings = self.fixture_store.timings
+        if config.root.run.fixture_timings_path:
+            with handling_exceptions(swallow=True):
+                timings.dump(os.path.expanduser(config.root.run.fixture_timings_path))
+        if config.root.run.show_slowest_fixtures > 0:
+            self.reporter.report_fixture_timings(timings)
+
     def mark_complete(self):
         self._complete = True
 
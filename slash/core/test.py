@@ -21,6 +21,13 @@ class TestTestFactory(RunnableTestFactory):
     def get_class_name(self):
         return self.testclass.__name__
 
+    def get_test_tags(self):
+        if is_abstract_base_class(self.testclass):
+            return []
+        class_tags = get_tags(self.testclass)
+        return [class_tags + get_tags(getattr(self.testclass, test_method_name))
+                for test_method_name in dir(self.testclass) if test_method_name.startswith("test")]
+
     def _generate_tests(self, fixture_store):
         if is_abstract_base_class(self.testclass):
             return
@@ -42,11 +49,12 @@ class TestTestFactory(RunnableTestFactory):
                     yield case  # pylint: disable=protected-access
 
     def _iter_parametrization_variations(self, test_method_name, fixture_store):
+        test_method = getattr(self.testclass, test_method_name)
         return fixture_store.iter_parametrization_variations(methods=itertools.chain(
             izip(itertools.repeat('before'), self._get_all_before_methods()),
             izip(itertools.repeat('after'), self._get_all_after_methods()),
-            [getattr(self.testclass, test_method_name)],
-        ))
+            [test_method],
+        ), combinatorial_strength=self._get_combinatorial_strength(test_method, self.testclass))
 
     def _get_all_before_methods(self):
         return self._iter_inherited_methods('before')
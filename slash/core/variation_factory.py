@@ -6,6 +6,7 @@ from orderedset import OrderedSet
 from .variation import Variation
 from .._compat import OrderedDict, izip, xrange
 from ..exceptions import FixtureException
+from ..utils.combinatorics import iter_covering_array
 from ..utils.python import get_arguments
 from .fixtures.parameters import iter_parametrization_fixtures
 from .fixtures.fixture import Fixture
@@ -18,9 +19,10 @@ class VariationFactory(object):
     """Helper class to produce variations, while properly naming the needed fixtures to help identifying tests
     """
 
-    def __init__(self, fixture_store):
+    def __init__(self, fixture_store, combinatorial_strength=0):
         super(VariationFactory, self).__init__()
         self._store = fixture_store
+        self._combinatorial_strength = combinatorial_strength
         self._autouse_fixtures = list(fixture_store.iter_autouse_fixtures_in_namespace())
         self._needed_fixtures = list(self._autouse_fixtures)
 
@@ -79,6 +81,8 @@ class VariationFactory(object):
             self._populate_param_name_bindings(fixture.info.name, fixture, prefix='::')
 
     def _populate_param_name_bindings(self, arg_name, fixture_or_param, prefix=''):
+        if isinstance(fixture_or_param, Fixture) and not self._store.get_all_needed_fixture_ids(fixture_or_param):
+            return
         visited = {fixture_or_param.info.id}
         stack = [(prefix + arg_name, fixture_or_param)]
         while stack:
@@ -87,6 +91,9 @@ class VariationFactory(object):
                 for sub_name, obj in fixture.keyword_arguments.items():
                     if obj.info.id in visited:
                         continue
+                    if isinstance(obj, Fixture) and not self._store.get_all_needed_fixture_ids(obj):
+                        # nothing beneath it is parametrized
+                        continue
                     visited.add(obj.info.id)
                     stack.append(('{}.{}'.format(name, sub_name), obj))
             elif isinstance(fixture, Parametrization):
@@ -104,7 +111,12 @@ class VariationFactory(object):
         if not needed_ids:
             yield Variation(self._store, {}, {})
             return
-        for value_indices in itertools.product(*(xrange(len(p.values)) for p in parametrizations)):
+        num_values = [len(p.values) for p in parametrizations]
+        if self._combinatorial_strength:
+            all_value_indices = iter_covering_array(num_values, self._combinatorial_strength)
+        else:
+            all_value_indices = itertools.product(*(xrange(n) for n in num_values))
+        for value_indices in all_value_indices:
             yield self._build_variation(parametrizations, value_indices)
 
     def _build_variation(self, parametrizations, value_indices):
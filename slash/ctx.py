@@ -1,3 +1,5 @@
+import threading
+
 from .reporting.null_reporter import NullReporter
 
 __all__ = ["context", "session", "test", "test_id", "g", "internal_globals"]
@@ -8,12 +10,24 @@ class GlobalStorage(object):
 
 
 class Context(object):
-    session = test = test_id = result = fixture = None
+    session = test = test_id = result = None
 
     def __init__(self):
         super(Context, self).__init__()
         self.g = GlobalStorage()
         self.internal_globals = GlobalStorage()
+        self._thread_local = threading.local()
+
+    @property
+    def fixture(self):
+        """The active fixture currently being computed. Since fixtures may be set up concurrently, this is tracked
+        separately for each thread
+        """
+        return getattr(self._thread_local, 'fixture', None)
+
+    @fixture.setter
+    def fixture(self, value):
+        self._thread_local.fixture = value
 
     @property
     def test_filename(self):
@@ -35,6 +35,8 @@ def _get_parser():
     parser.add_argument('--no-output', dest='show_output', action='store_false', default=True)
     parser.add_argument('--force-color', dest='force_color', action='store_true', default=False)
     parser.add_argument('--no-color', dest='enable_color', action='store_false', default=True)
+    parser.add_argument('--collection-cache', dest='use_collection_cache', action='store_true', default=False)
+    parser.add_argument('--parallel-collection', dest='collection_workers', type=int, default=0, metavar='NUM_WORKERS')
 
     parser.add_argument('paths', nargs='*', default=[], metavar='PATH')
     return parser
@@ -48,19 +50,25 @@ def slash_list(args, report_stream=sys.stdout, error_stream=sys.stderr):
 
     if not parsed_args.paths and not parsed_args.suite_files:
         parser.error('Neither test paths nor suite files were specified')
+    if parsed_args.collection_workers and parsed_args.only != 'tests':
+        # fixtures can only be listed after importing every file in this process
+        parser.error('--parallel-collection can only be used with --only-tests')
 
     _print = Printer(report_stream, enable_output=parsed_args.show_output, force_color=parsed_args.force_color,
                      enable_color=parsed_args.enable_color)
     try:
         with slash.Session() as session:
             slash.site.load()
-            loader = slash.loader.Loader()
+            # fixtures can only be reported after importing the files defining them
+            loader = slash.loader.Loader(prefer_cached=(parsed_args.only == 'tests'),
+                                         use_collection_cache=parsed_args.use_collection_cache or None,
+                                         collection_workers=parsed_args.collection_workers)
             runnables = loader.get_runnables(itertools.chain(parsed_args.paths, iter_suite_file_paths(parsed_args.suite_files)))
-            used_fixtures = set()
-            for test in runnables:
-                used_fixtures.update(test.get_required_fixture_objects())
 
             if parsed_args.only in (None, 'fixtures'):
+                used_fixtures = set()
+                for test in runnables:
+                    used_fixtures.update(test.get_required_fixture_objects())
                 _report_fixtures(parsed_args, session, _print, used_fixtures)
 
             if parsed_args.only in (None, 'tests'):
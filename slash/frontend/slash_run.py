@@ -37,13 +37,21 @@ def slash_run(args, report_stream=None, resume=False, app_callback=None, working
                         if not session_ids:
                             session_ids = [get_last_resumeable_session_id()]
                         to_resume = [x for session_id in session_ids for x in get_tests_to_resume(session_id)]
-                        collected = app.test_loader.get_runnables(to_resume)
+                        collected = to_run = app.test_loader.get_runnables(to_resume)
+                    elif config.root.run.stream_collection:
+                        if config.root.run.parallel:
+                            # workers are assigned tests once all of them are collected, so nothing would be streamed
+                            raise CannotLoadTests("Streaming collection cannot be used when running in parallel")
+                        collected = []
+                        to_run = _stream_tests(app, collected)
                     else:
-                        collected = _collect_tests(app, args)
+                        collected = to_run = _collect_tests(app, args)
                     if app.parsed_args.interactive:
-                        collected = itertools.chain([generate_interactive_test()], collected)
+                        if config.root.run.parallel:
+                            raise CannotLoadTests("Interactive sessions cannot be run in parallel")
+                        to_run = itertools.chain([generate_interactive_test()], to_run)
                 with app.session.get_started_context():
-                    run_tests(collected)
+                    run_tests(to_run)
 
             finally:
                 save_resume_state(app.session.results, collected)
@@ -59,6 +67,27 @@ def slash_run(args, report_stream=None, resume=False, app_callback=None, working
 slash_resume = functools.partial(slash_run, resume=True)
 
 def _collect_tests(app, args):  # pylint: disable=unused-argument
+    paths = _get_paths(app)
+
+    collected = app.test_loader.get_runnables(paths)
+    if len(collected) == 0 and not app.parsed_args.interactive:
+        raise CannotLoadTests("No tests could be collected")
+
+    return collected
+
+def _stream_tests(app, collected):
+    paths = _get_paths(app)
+
+    def _iter_tests():
+        for test in app.test_loader.iter_runnables(paths):
+            collected.append(test)
+            yield test
+        if not collected and not app.parsed_args.interactive:
+            raise CannotLoadTests("No tests could be collected")
+
+    return _iter_tests()
+
+def _get_paths(app):
     paths = app.positional_args
 
     paths = _extend_paths_from_suite_files(paths)
@@ -70,11 +99,7 @@ def _collect_tests(app, args):  # pylint: disable=unused-argument
     if not paths and not app.parsed_args.interactive:
         raise CannotLoadTests("No tests specified")
 
-    collected = app.test_loader.get_runnables(paths)
-    if len(collected) == 0 and not app.parsed_args.interactive:
-        raise CannotLoadTests("No tests could be collected")
-
-    return collected
+    return paths
 
 def _extend_paths_from_suite_files(paths):
     suite_files = config.root.run.suite_files
@@ -1,20 +1,23 @@
+import ast
 import itertools
 import traceback
 import os
 import sys
+import time
 from types import FunctionType, GeneratorType
 from contextlib import contextmanager
 
-import dessert
-from emport import import_file
 from logbook import Logger
 from sentinels import NOTHING
 
 
 from .conf import config
-from ._compat import string_types
+from ._compat import OrderedDict, iteritems, string_types
 from .ctx import context
+from .core.collection_cache import CachedTest, CollectionCache, get_cached_tests
+from .core.collection_stats import CollectionStats
 from .core.local_config import LocalConfig
+from .core.ordering import group_by_fixture_parameters
 from . import hooks
 from .core.runnable_test import RunnableTest
 from .core.test import Test, TestTestFactory, is_valid_test_name
@@ -22,7 +25,9 @@ from .core.function_test import FunctionTestFactory
 from .exception_handling import handling_exceptions
 from .exceptions import CannotLoadTests
 from .core.runnable_test_factory import RunnableTestFactory
+from .parallel.collection import collect_in_parallel
 from .utils.pattern_matching import Matcher
+from .utils.rewriting import get_rewritten_code_cache, import_file_rewriting_assertions
 from .resuming import ResumedTestData
 
 _logger = Logger(__name__)
@@ -34,11 +39,37 @@ class Loader(object):
     Provides iteration interfaces to load runnable tests from various places
     """
 
-    def __init__(self):
+    def __init__(self, prefer_cached=False, use_collection_cache=None, collection_workers=0):
+        """
+        :param prefer_cached: if True and the collection cache is enabled, tests from files which did not change
+           since they were cached are returned as :class:`slash.core.collection_cache.CachedTest` objects instead
+           of being imported. Cached tests only carry metadata, and cannot be run
+        :param use_collection_cache: overrides ``run.use_collection_cache`` when not None
+        :param collection_workers: if not zero and *prefer_cached* is True, test files which are not cached are
+           imported in a pool of this many worker processes, and their tests are returned as
+           :class:`slash.core.collection_cache.CachedTest` objects as well
+        """
         super(Loader, self).__init__()
         self._local_config = LocalConfig()
+        self._prefer_cached = prefer_cached
+        self._use_collection_cache = use_collection_cache
+        self._collection_workers = collection_workers
+        #: per-file import statistics of the tests loaded so far
+        self.collection_stats = CollectionStats()
 
     _cached_matchers = NOTHING
+    _collection_cache = NOTHING
+
+    def _get_collection_cache(self):
+        if self._collection_cache is NOTHING:
+            use_collection_cache = self._use_collection_cache
+            if use_collection_cache is None:
+                use_collection_cache = config.root.run.use_collection_cache
+            if use_collection_cache:
+                self._collection_cache = CollectionCache(config.root.run.collection_cache_path)
+            else:
+                self._collection_cache = None
+        return self._collection_cache
 
     def _get_matchers(self):
         if self._cached_matchers is NOTHING:
@@ -52,13 +83,71 @@ class Loader(object):
     def get_runnables(self, paths):
         assert context.session is not None
 
-        sources = (t for repetition in range(config.root.run.repeat_all)
-                   for t in self._generate_test_sources(paths))
-        returned = self._collect(sources)
-        hooks.tests_loaded(tests=returned) # pylint: disable=no-member
+        returned = self._collect(self._iter_sources(paths))
+        hooks.tests_loaded(tests=[test for test in returned if not isinstance(test, CachedTest)]) # pylint: disable=no-member
         returned.sort(key=lambda test: test.__slash__.get_sort_key())
+        if config.root.run.group_by_fixture_parameters:
+            returned = group_by_fixture_parameters(returned)
+        self._report_collection_stats()
         return returned
 
+    def iter_runnables(self, paths):
+        """Like :meth:`get_runnables`, but yields tests as soon as each file is loaded, without waiting for
+        the entire collection to end. ``tests_loaded`` is triggered for each loaded batch of tests, and sorting
+        only takes place within batches
+        """
+        assert context.session is not None
+
+        collected = []
+        exhausted = []
+        collection_ended = False
+
+        def _iter_sources_marking_end():
+            for test in self._iter_sources(paths):
+                yield test
+            exhausted.append(True)
+
+        context.reporter.report_collection_start()
+        try:
+            for _, batch in itertools.groupby(_iter_sources_marking_end(), key=lambda test: test.__slash__.file_path):
+                batch = list(batch)
+                hooks.tests_loaded(tests=batch) # pylint: disable=no-member
+                batch.sort(key=lambda test: test.__slash__.get_sort_key())
+                if config.root.run.group_by_fixture_parameters:
+                    batch = group_by_fixture_parameters(batch)
+                context.session.increment_total_num_tests(len(batch))
+                for test in batch:
+                    collected.append(test)
+                    context.reporter.report_test_collected(collected, test)
+                if exhausted:
+                    # this is the last batch, so collection ends before its tests run
+                    collection_ended = True
+                    self._report_collection_end(collected)
+                for test in batch:
+                    yield test
+        finally:
+            if not collection_ended:
+                self._report_collection_end(collected)
+
+    def _report_collection_end(self, collected):
+        context.reporter.report_collection_end(collected)
+        self._report_collection_stats()
+
+    def _report_collection_stats(self):
+        cache = get_rewritten_code_cache()
+        if cache is not None:
+            _logger.debug("Rewritten code cache: {0.hits} hits, {0.misses} misses", cache)
+            if cache.misses:
+                cache.evict()
+        _logger.debug("Imported {0} files in {1:.3f} seconds", len(self.collection_stats),
+                      self.collection_stats.get_total_import_duration())
+        if config.root.run.dump_collection_stats:
+            context.reporter.report_collection_stats(self.collection_stats)
+
+    def _iter_sources(self, paths):
+        return (t for repetition in range(config.root.run.repeat_all)
+                for t in self._generate_test_sources(paths))
+
     def _collect(self, iterator):
         returned = []
         context.reporter.report_collection_start()
@@ -78,24 +167,47 @@ class Loader(object):
             iterator = self._generate_test_sources(thing[0], matcher=thing[1])
 
         elif isinstance(thing, (list, GeneratorType, itertools.chain)):
-            iterator = itertools.chain.from_iterable(self._generate_test_sources(x) for x in thing)
+            iterator = itertools.chain.from_iterable(
+                self._iter_tests_resume(list(group)) if is_resume else
+                itertools.chain.from_iterable(self._generate_test_sources(x) for x in group)
+                for is_resume, group in itertools.groupby(thing, key=lambda x: isinstance(x, ResumedTestData)))
         elif isinstance(thing, string_types):
             iterator = self._iter_test_address(thing)
         elif isinstance(thing, RunnableTest):
             iterator = [thing]
         elif isinstance(thing, ResumedTestData):
-            iterator = self._iter_test_resume(thing)
+            iterator = self._iter_tests_resume([thing])
         elif not isinstance(thing, RunnableTestFactory):
             thing = self._get_runnable_test_factory(thing)
             iterator = thing.generate_tests(fixture_store=context.session.fixture_store)
 
         return (t for t in iterator if matcher is None or matcher.matches(t.__slash__))
 
-    def _iter_test_resume(self, resume_state):
-        for test in self._iter_path(resume_state.file_name):
-            if resume_state.function_name == test.__slash__.address_in_file:
-                if resume_state.variation:
-                    if not resume_state.variation == test.get_variation().id:
+    def _iter_tests_resume(self, resume_states):
+        """Loads the tests matching the given resume states. Each file is loaded only once, and its tests are
+        matched against all resume states referring to it
+        """
+        states_by_file = OrderedDict()
+        for resume_state in resume_states:
+            states_by_file.setdefault(resume_state.file_name, []).append(resume_state)
+
+        for file_name, file_resume_states in iteritems(states_by_file):
+            # maps function names to the set of their resumed variations, or to None if all variations are resumed
+            wanted = {}
+            for resume_state in file_resume_states:
+                if not resume_state.variation:
+                    wanted[resume_state.function_name] = None
+                elif wanted.setdefault(resume_state.function_name, set()) is not None:
+                    wanted[resume_state.function_name].add(_get_variation_key(resume_state.variation))
+
+            for test in self._iter_path(file_name):
+                address_in_file = test.__slash__.address_in_file
+                if address_in_file not in wanted:
+                    continue
+                variations = wanted[address_in_file]
+                if variations is not None:
+                    variation = test.get_variation()
+                    if _get_variation_key(variation.id if variation else {}) not in variations:
                         continue
                 yield test
 
@@ -106,8 +218,13 @@ class Loader(object):
             path = address
             address_in_file = None
 
+        variation_selector = None
+        factory_names = None
+        if address_in_file is not None:
+            address_in_file, variation_selector = _split_variation_selector(address_in_file)
+            factory_names = [address_in_file.split('.', 1)[0]]
 
-        tests = list(self._iter_path(path))
+        tests = list(self._iter_path(path, factory_names=factory_names))
 
         # special case for directories where we couldn't load any tests (without filter)
         if not tests and address_in_file is None:
@@ -119,6 +236,8 @@ class Loader(object):
             if address_in_file is not None:
                 if not self._address_in_file_matches(address_in_file, test):
                     continue
+                if variation_selector is not None and not _variation_matches(variation_selector, test):
+                    continue
             matched = True
             yield test
         if not matched:
@@ -135,65 +254,159 @@ class Loader(object):
                 return True
         return False
 
-    def _iter_path(self, path):
-        return self._iter_paths([path])
+    def _iter_path(self, path, factory_names=None):
+        return self._iter_paths([path], factory_names=factory_names)
 
-    def _iter_paths(self, paths):
+    def _iter_paths(self, paths, factory_names=None):
+        """
+        :param factory_names: if not None, only tests generated by test factories (test functions or test classes)
+           with these names are loaded
+        """
         paths = list(paths)
         for path in paths:
             if not os.path.exists(path):
                 msg = "Path {!r} could not be found".format(path)
                 with handling_exceptions():
                     raise CannotLoadTests(msg)
-        for path in paths:
-            for file_path in _walk(path):
-                _logger.debug("Checking {0}", file_path)
-                if not self._is_file_wanted(file_path):
-                    _logger.debug("{0} is not wanted. Skipping...", file_path)
+        file_paths = (file_path for path in paths for file_path in _walk(path))
+        cached_by_path = {}
+        collected_in_parallel = {}
+        if self._collection_workers and self._prefer_cached:
+            # tests collected by worker processes cannot be run, so the pool is only of use when listing tests
+            file_paths = list(file_paths)
+            cached_by_path, collected_in_parallel = self._collect_in_parallel(file_paths)
+        for file_path in file_paths:
+            _logger.debug("Checking {0}", file_path)
+            if not self._is_file_wanted(file_path):
+                _logger.debug("{0} is not wanted. Skipping...", file_path)
+                continue
+            cache_key, cached = cached_by_path.get(file_path) or self._get_cached_tests(file_path)
+            needs_caching = cache_key is not None and cached is None
+            collected = collected_in_parallel.get(file_path) if cached is None else None
+            if collected is not None:
+                cached = get_cached_tests(collected.descriptors)
+                if needs_caching:
+                    self._get_collection_cache().store_descriptors(file_path, cache_key, collected.descriptors)
+                    needs_caching = False
+            if cached is not None and factory_names is not None:
+                cached = [test for test in cached if test.__slash__.factory_name in factory_names]
+            if collected is not None:
+                # the file is not imported by this process, so the import done by the worker is the one recorded
+                self.collection_stats.add(file_path, collected.import_duration, len(collected.descriptors),
+                                          in_worker=True)
+            if cached is not None:
+                selected = [test for test in cached if not self._is_excluded(test)]
+                if self._prefer_cached:
+                    _logger.debug("Using cached tests for {0}", file_path)
+                    for test in selected:
+                        yield test
+                    continue
+                if not selected:
+                    _logger.debug("No cached test of {0} is selected. Skipping...", file_path)
                     continue
-                module = None
-                try:
-                    with handling_exceptions(context="during import"):
-                        with dessert.rewrite_assertions_context():
-                            module = import_file(file_path)
-                except Exception as e:
-                    tb_file, tb_lineno, _, _ = traceback.extract_tb(sys.exc_info()[2])[-1]
-                    raise CannotLoadTests(
-                        "Could not load {0!r} ({1}:{2} - {3})".format(file_path, tb_file, tb_lineno, e))
-                if module is not None:
-                    with self._adding_local_fixtures(file_path, module):
-                        for runnable in self._iter_runnable_tests_in_module(file_path, module):
-                            if self._is_excluded(runnable):
-                                continue
-                            yield runnable
+            module = None
+            start_time = time.time()
+            try:
+                with handling_exceptions(context="during import"):
+                    module = import_file_rewriting_assertions(file_path)
+            except Exception as e:
+                tb_file, tb_lineno, _, _ = traceback.extract_tb(sys.exc_info()[2])[-1]
+                raise CannotLoadTests(
+                    "Could not load {0!r} ({1}:{2} - {3})".format(file_path, tb_file, tb_lineno, e))
+            import_duration = time.time() - start_time
+            if module is not None:
+                with self._adding_local_fixtures(file_path, module):
+                    needs_caching = needs_caching and factory_names is None
+                    runnables = list(self._iter_runnable_tests_in_module(
+                        file_path, module, factory_names, prefilter=not needs_caching))
+                    self.collection_stats.add(file_path, import_duration, len(runnables))
+                    if needs_caching:
+                        self._get_collection_cache().store(file_path, cache_key, runnables)
+                    for runnable in runnables:
+                        if self._is_excluded(runnable):
+                            continue
+                        yield runnable
+
+    def _get_cached_tests(self, file_path):
+        """Returns a tuple of the collection cache key of the file and of its cached tests (None if there are none)
+        """
+        collection_cache = self._get_collection_cache()
+        if collection_cache is None:
+            return None, None
+        cache_key = collection_cache.get_key(file_path, self._local_config.get_slashconf_paths(file_path))
+        return cache_key, collection_cache.get(file_path, cache_key)
+
+    def _collect_in_parallel(self, file_paths):
+        cached_by_path = {}
+        pending = []
+        for file_path in file_paths:
+            if not self._is_file_wanted(file_path):
+                continue
+            cached_by_path[file_path] = self._get_cached_tests(file_path)
+            if cached_by_path[file_path][1] is None:
+                pending.append(file_path)
+        return cached_by_path, collect_in_parallel(self, pending, self._collection_workers)
 
     @contextmanager
     def _adding_local_fixtures(self, file_path, module):
-        with context.session.fixture_store.new_namespace_context():
-            self._local_config.push_path(os.path.dirname(file_path))
-            try:
-                context.session.fixture_store.add_fixtures_from_dict(
-                    self._local_config.get_dict())
-                with context.session.fixture_store.new_namespace_context():
-                    context.session.fixture_store.add_fixtures_from_dict(
-                        vars(module))
-                    context.session.fixture_store.resolve()
+        fixture_store = context.session.fixture_store
+        self._local_config.push_path(os.path.dirname(file_path))
+        try:
+            # files affected by the same slashconf files share the namespace holding their fixtures
+            with fixture_store.new_namespace_context(key=self._local_config.get_key()) as is_new:
+                if is_new:
+                    fixture_store.add_fixtures_from_dict(self._local_config.get_dict())
+                with fixture_store.new_namespace_context():
+                    fixture_store.add_fixtures_from_dict(vars(module))
+                    fixture_store.resolve()
                     yield
-            finally:
-                self._local_config.pop_path()
+        finally:
+            self._local_config.pop_path()
+
 
+    _cached_filter_predicate = NOTHING
+
+    def _get_filter_predicate(self):
+        if self._cached_filter_predicate is NOTHING:
+            matchers = self._get_matchers()
+            if matchers is None:
+                self._cached_filter_predicate = None
+            elif len(matchers) == 1:
+                self._cached_filter_predicate = matchers[0].get_predicate()
+            else:
+                predicates = tuple(m.get_predicate() for m in matchers)
+                self._cached_filter_predicate = lambda metadata: all(predicate(metadata) for predicate in predicates)
+        return self._cached_filter_predicate
 
     def _is_excluded(self, test):
+        predicate = self._get_filter_predicate()
+        if predicate is None:
+            return False
+        return not predicate(test.__slash__)
+
+    def _is_factory_excluded(self, factory):
+        """Checks whether the tags of a factory's tests already exclude all of them, which spares generating them
+        """
         matchers = self._get_matchers()
         if matchers is None:
             return False
-        return not all(m.matches(test.__slash__) for m in matchers)
+        all_test_tags = factory.get_test_tags()
+        if all_test_tags is None:
+            return False
+        return all(any(m.matches_tags(tags) is False for m in matchers) for tags in all_test_tags)
 
     def _is_file_wanted(self, filename):
         return filename.endswith(".py")
 
-    def _iter_runnable_tests_in_module(self, file_path, module):
-        for thing_name in sorted(dir(module)):
+    def _iter_runnable_tests_in_module(self, file_path, module, factory_names=None, prefilter=False):
+        """
+        :param prefilter: if True, factories whose tests are all excluded by their tags are skipped before
+           generating their tests
+        """
+        thing_names = dir(module)
+        if factory_names is not None:
+            thing_names = set(thing_names).intersection(factory_names)
+        for thing_name in sorted(thing_names):
             thing = getattr(module, thing_name)
             if thing is RunnableTestFactory:  # probably imported directly
                 continue
@@ -207,6 +420,10 @@ class Loader(object):
             factory.set_module_name(module.__name__)
             factory.set_filename(file_path)
 
+            if prefilter and self._is_factory_excluded(factory):
+                _logger.debug("Tests of {0} are excluded by their tags. Skipping...", thing_name)
+                continue
+
             for test in factory.generate_tests(fixture_store=context.session.fixture_store):
                 assert test.__slash__ is not None
                 yield test
@@ -223,6 +440,67 @@ class Loader(object):
         return None
 
 
+def _split_variation_selector(address_in_file):
+    """Splits an address such as ``test_x(param=3)`` into the address and its variation selector (``param=3``)
+    """
+    if address_in_file.endswith(')') and '(' in address_in_file:
+        index = address_in_file.index('(')
+        return address_in_file[:index], address_in_file[index + 1:-1]
+    return address_in_file, None
+
+
+def _variation_matches(variation_selector, test):
+    """Checks whether a variation selector (comma-separated ``name=value`` pairs) matches the variation of a test.
+    Each value is compared with the value of the parameter itself, either as a Python literal (e.g. ``pair=(1, 2)``)
+    or as it appears in test addresses (e.g. ``pair=pair0``). Parameters omitted from the selector match any value
+    """
+    variation = test.get_variation()
+    values = variation.values if variation else {}
+    for item in _split_variation_selector_items(variation_selector):
+        name, _, selected = item.partition('=')
+        name = name.strip()
+        if name not in values or not _parameter_value_matches(selected.strip(), name, values[name], variation):
+            return False
+    return True
+
+
+def _split_variation_selector_items(variation_selector):
+    # values may contain commas of their own, within brackets or quotes
+    returned = []
+    depth = 0
+    quote = None
+    start = 0
+    for index, char in enumerate(variation_selector):
+        if quote is not None:
+            if char == quote:
+                quote = None
+        elif char in '\'"':
+            quote = char
+        elif char in '([{':
+            depth += 1
+        elif char in ')]}':
+            depth -= 1
+        elif char == ',' and depth == 0:
+            returned.append(variation_selector[start:index])
+            start = index + 1
+    returned.append(variation_selector[start:])
+    return returned
+
+
+def _parameter_value_matches(selected, name, value, variation):
+    try:
+        if ast.literal_eval(selected) == value:
+            return True
+    except (ValueError, SyntaxError):
+        pass
+    return selected == str(value) or \
+        selected == variation._format_parameter_value_safe(name, value)  # pylint: disable=protected-access
+
+
+def _get_variation_key(variation_id):
+    return frozenset(iteritems(variation_id))
+
+
 def _walk(p):
     if os.path.isfile(p):
         yield p
@@ -0,0 +1 @@
+from .runner import run_tests_in_parallel
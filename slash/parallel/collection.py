@@ -0,0 +1,64 @@
+import time
+
+import logbook
+
+from ..core.collection_cache import _metadata_to_dict
+from ..utils.rewriting import import_file_rewriting_assertions
+from .runner import _get_multiprocessing_context
+
+_logger = logbook.Logger(__name__)
+
+_worker_loader = None
+
+
+class CollectedFile(object):
+    """Holds the outcome of importing a test file in a collection worker: lightweight descriptors of the tests
+    it contains (see :func:`slash.core.collection_cache.CachedMetadata.from_dict`), and the time its import took
+    """
+
+    def __init__(self, descriptors, import_duration):
+        super(CollectedFile, self).__init__()
+        self.descriptors = descriptors
+        self.import_duration = import_duration
+
+
+def collect_in_parallel(loader, file_paths, num_workers):
+    """Imports and enumerates the tests of *file_paths* in a pool of *num_workers* worker processes.
+
+    Returns a dictionary mapping each file path to a :class:`CollectedFile`, or to None if the file could not be
+    loaded by the worker. Such files should be loaded again in the calling process, so that errors are reported
+    properly
+    """
+    file_paths = list(file_paths)
+    if not file_paths:
+        return {}
+    num_workers = min(num_workers, len(file_paths))
+    _logger.debug('Collecting {0} files in {1} worker processes', len(file_paths), num_workers)
+    pool = _get_multiprocessing_context().Pool(num_workers, initializer=_init_worker, initargs=(loader,))
+    try:
+        return dict(zip(file_paths, pool.map(_collect_file, file_paths, chunksize=1)))
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def _init_worker(loader):
+    global _worker_loader  # pylint: disable=global-statement
+    _worker_loader = loader
+
+
+def _collect_file(file_path):
+    loader = _worker_loader
+    start_time = time.time()
+    try:
+        module = import_file_rewriting_assertions(file_path)
+        import_duration = time.time() - start_time
+        with loader._adding_local_fixtures(file_path, module):  # pylint: disable=protected-access
+            # descriptors may end up in the collection cache, in which case they should not be prefiltered
+            tests = loader._iter_runnable_tests_in_module(  # pylint: disable=protected-access
+                file_path, module, prefilter=loader._get_collection_cache() is None)  # pylint: disable=protected-access
+            descriptors = [_metadata_to_dict(test.__slash__) for test in tests]
+    except Exception:  # pylint: disable=broad-except
+        _logger.debug('Could not collect {0} in worker process', file_path, exc_info=True)
+        return None
+    return CollectedFile(descriptors, import_duration)
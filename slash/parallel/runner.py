@@ -0,0 +1,164 @@
+import itertools
+import multiprocessing
+import pickle
+
+import logbook
+
+from .. import hooks
+from .._compat import queue
+from ..conf import config
+from ..core.deferred_cleanups import attributed_to
+from ..ctx import context
+from ..exception_handling import handling_exceptions
+from .scheduler import get_work_items, load_test_durations, save_test_durations
+from .worker import run_worker
+
+_logger = logbook.Logger(__name__)
+
+_POLL_INTERVAL = 0.5
+
+
+def run_tests_in_parallel(iterable, num_workers, stop_on_error):
+    """Runs tests from an iterable in *num_workers* worker processes, merging the results they report into
+    the current session
+    """
+    from ..runner import _get_test_context, _set_test_metadata, _mark_unrun_tests  # pylint: disable=cyclic-import
+
+    session = context.session
+    tests = list(iterable)
+    mp_context = _get_multiprocessing_context()
+    work_queue = mp_context.Queue()
+    result_queue = mp_context.Queue()
+    stop_event = mp_context.Event()
+
+    durations_path = config.root.run.parallel_durations_path
+    for work_item in get_work_items(tests, load_test_durations(durations_path) if durations_path else None):
+        work_queue.put(work_item)
+    for _ in range(num_workers):
+        work_queue.put(None)
+
+    workers = {}
+    reported = set()
+    # results of finished tests, which workers may still add errors to
+    results = {}
+    durations = {}
+    stopped = False
+    last_filename = None
+    try:
+        for worker_id in range(1, num_workers + 1):
+            worker = workers[worker_id] = mp_context.Process(
+                target=run_worker, args=(worker_id, tests, work_queue, result_queue, stop_event))
+            worker.daemon = True
+            worker.start()
+        _logger.debug('Started {0} worker processes', num_workers)
+
+        while workers:
+            try:
+                message = result_queue.get(timeout=_POLL_INTERVAL)
+            except queue.Empty:
+                _reap_dead_workers(workers, result_queue, session)
+                continue
+
+            if message[0] == 'worker_done':
+                _, worker_id, errors, failures, fixture_timings = message
+                for error in errors:
+                    session.results.global_result.add_error(error)
+                for failure in failures:
+                    session.results.global_result.add_failure(failure)
+                session.fixture_store.timings.merge(fixture_timings)
+                workers.pop(worker_id).join()
+                continue
+
+            if message[0] == 'error_added':
+                _, index, error = message
+                _add_late_error(tests[index], results[index], error)
+                continue
+
+            _, index, test_id, pickled_result, duration = message
+            test = tests[index]
+            reported.add(index)
+            durations[test.__slash__.address] = duration
+            _set_test_metadata(test)
+            test_filename = test.__slash__.file_path
+            if last_filename != test_filename:
+                if last_filename is not None:
+                    session.reporter.report_file_end(last_filename)
+                session.reporter.report_file_start(test_filename)
+                last_filename = test_filename
+            with _get_test_context(test, logging=False, test_id=test_id) as result:
+                result.deserialize(pickle.loads(pickled_result))
+                _replay_test(test, result)
+            results[index] = result
+            session.results.spill(result)
+            if result.has_fatal_exception():
+                _logger.debug("Stopping on fatal exception")
+                stopped = True
+            elif not result.is_success(allow_skips=True) and stop_on_error:
+                _logger.debug("Stopping (run.stop_on_error==True)")
+                stopped = True
+            if stopped:
+                stop_event.set()
+    finally:
+        stop_event.set()
+        for worker in workers.values():
+            worker.terminate()
+            worker.join()
+
+    if last_filename is not None:
+        session.reporter.report_file_end(last_filename)
+    if durations_path and durations:
+        save_test_durations(durations_path, durations)
+    _mark_unrun_tests([test for index, test in enumerate(tests) if index not in reported])
+    if not stopped and len(reported) == len(tests):
+        session.mark_complete()
+
+
+def _get_multiprocessing_context():
+    get_context = getattr(multiprocessing, 'get_context', None)
+    if get_context is None:
+        return multiprocessing
+    return get_context('fork')
+
+
+def _reap_dead_workers(workers, result_queue, session):
+    for worker_id, worker in list(workers.items()):
+        # workers flush their messages before exiting, so we only give up on them once everything was read
+        if not worker.is_alive() and result_queue.empty():
+            workers.pop(worker_id)
+            session.results.global_result.add_error(
+                'Worker #{0} exited unexpectedly (exit code: {1})'.format(worker_id, worker.exitcode))
+
+
+def _add_late_error(test, result, error):
+    with handling_exceptions(swallow=True), attributed_to(test, result):
+        if error.is_failure():
+            result.add_failure(error)
+        else:
+            result.add_error(error)
+
+
+def _replay_test(test, result):
+    """Fires the reporter callbacks and hooks for a test which has already been run by a worker process
+    """
+    from ..runner import _fire_test_summary_hooks  # pylint: disable=cyclic-import
+
+    reporter = context.session.reporter
+    reporter.report_test_start(test)
+    for error in result.get_errors():
+        reporter.report_test_error_added(test, error)
+    for failure in result.get_failures():
+        reporter.report_test_failure_added(test, failure)
+    for skip in result.get_skips():
+        reporter.report_test_skip_added(test, skip)
+
+    with handling_exceptions(swallow=True):
+        if result.is_started():
+            hooks.test_start()  # pylint: disable=no-member
+            for error in itertools.chain(result.get_errors(), result.get_failures()):
+                hooks.error_added(result=result, error=error)  # pylint: disable=no-member
+            _fire_test_summary_hooks(test, result)
+            with context.session.cleanups.forbid_implicit_scoping_context():
+                hooks.test_end()  # pylint: disable=no-member
+        else:
+            hooks.test_avoided(reason=', '.join(result.get_skips()))  # pylint: disable=no-member
+    reporter.report_test_end(test, result)
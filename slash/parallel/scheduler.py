@@ -0,0 +1,81 @@
+import os
+
+import logbook
+
+from .._compat import OrderedDict, iteritems, json
+from ..core.fixtures.utils import get_scope_by_name
+from ..core.ordering import get_wide_parameter_indices, iter_needed_fixtures
+from ..utils.path import ensure_containing_directory
+
+_logger = logbook.Logger(__name__)
+
+_DEFAULT_EXPECTED_DURATION = 1.0
+
+
+def get_work_items(tests, expected_durations=None):
+    """Splits tests into work items (lists of test indices) to be handed to parallel workers.
+
+    Tests of the same module which depend on module-scoped fixtures are kept in the same work item, as
+    long as they share the values of the parametrizations these fixtures depend on. This way each module
+    fixture value is only set up once. Work items are returned in descending order of their expected
+    duration, which balances the load between the workers pulling them
+    """
+    if expected_durations is None:
+        expected_durations = {}
+
+    groups = OrderedDict()
+    for index, test in enumerate(tests):
+        key = get_scheduling_key(test)
+        if key is None:
+            key = index
+        groups.setdefault(key, []).append(index)
+
+    default_duration = _get_default_duration(expected_durations)
+    costs = dict((key, sum(expected_durations.get(tests[index].__slash__.address, default_duration)
+                           for index in indices))
+                 for key, indices in iteritems(groups))
+    return [groups[key] for key in sorted(groups, key=costs.__getitem__, reverse=True)]
+
+
+def get_scheduling_key(test):
+    """Returns a key grouping together tests which share their module-scoped fixture values, or None if
+    the test does not depend on any module-scoped fixture
+    """
+    module_scope = get_scope_by_name('module')
+    if not any(fixture.info.scope == module_scope for fixture in iter_needed_fixtures(test, 'module')):
+        return None
+    return (test.__slash__.module_name, get_wide_parameter_indices(test, 'module'))
+
+
+def _get_default_duration(expected_durations):
+    if not expected_durations:
+        return _DEFAULT_EXPECTED_DURATION
+    return sum(expected_durations.values()) / len(expected_durations)
+
+
+def load_test_durations(path):
+    """Loads recorded test durations, as a dictionary mapping test addresses to durations in seconds
+    """
+    path = os.path.expanduser(path)
+    if not os.path.isfile(path):
+        return {}
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (IOError, OSError, ValueError):
+        _logger.debug('Could not load test durations from {0}', path, exc_info=True)
+        return {}
+
+
+def save_test_durations(path, durations):
+    """Updates recorded test durations with the given ones
+    """
+    path = os.path.expanduser(path)
+    recorded = load_test_durations(path)
+    recorded.update(durations)
+    try:
+        ensure_containing_directory(path)
+        with open(path, 'w') as f:
+            json.dump(recorded, f)
+    except (IOError, OSError):
+        _logger.debug('Could not save test durations to {0}', path, exc_info=True)
@@ -0,0 +1,118 @@
+import os
+import time
+
+import gossip
+import logbook
+
+from .._compat import queue
+from ..conf import config
+from ..ctx import context
+from ..reporting.reporter_interface import ReporterInterface
+from ..utils.id_space import IDSpace
+
+_logger = logbook.Logger(__name__)
+
+_POLL_INTERVAL = 0.5
+
+#: hooks fired again by the parent process as test results arrive (see :func:`slash.parallel.runner._replay_test`)
+_REPLAYED_HOOK_NAMES = ('test_start', 'test_end', 'error_added', 'test_success', 'test_failure', 'test_error',
+                        'test_skip', 'test_avoided')
+_PLUGIN_TOKEN_PREFIX = 'slash.plugins.'
+
+
+def run_worker(worker_id, tests, work_queue, result_queue, stop_event):
+    """Entry point for worker processes. Runs the tests whose indices are received through *work_queue*,
+    sending their serialized results back through *result_queue*
+    """
+    from ..runner import run_tests  # pylint: disable=cyclic-import
+
+    session = context.session
+    global_result = session.results.global_result
+    num_global_errors, num_global_failures = len(global_result.get_errors()), len(global_result.get_failures())
+    exit_code = 0
+    try:
+        config.root.run.parallel = 0
+        session.parallel_worker_id = worker_id
+        session.id_space = IDSpace('{0}_w{1}'.format(session.id, worker_id))
+        indices = dict((id(test), index) for index, test in enumerate(tests))
+        session.reporter = _WorkerReporter(indices, result_queue, stop_event)
+        _unregister_replayed_plugin_hooks()
+        try:
+            run_tests(_iter_assigned_tests(tests, work_queue, stop_event))
+        except Exception:  # pylint: disable=broad-except
+            _logger.error('Worker #{0} failed', worker_id, exc_info=True)
+            global_result.add_error()
+        try:
+            # errors of deferred cleanups are added to results which were already sent, and are sent on their own
+            session.cleanups.wait_for_deferred_cleanups()
+        except Exception:  # pylint: disable=broad-except
+            _logger.error('Worker #{0} failed waiting for deferred cleanups', worker_id, exc_info=True)
+            global_result.add_error()
+        result_queue.put(('worker_done', worker_id,
+                          global_result.get_errors()[num_global_errors:],
+                          global_result.get_failures()[num_global_failures:],
+                          session.fixture_store.timings.to_dict()['fixtures']))
+        result_queue.close()
+        result_queue.join_thread()
+    except BaseException:  # pylint: disable=broad-except
+        exit_code = -1
+    finally:
+        # we must not return to the forked caller's stack, which would end the session a second time
+        os._exit(exit_code)  # pylint: disable=protected-access
+
+
+def _unregister_replayed_plugin_hooks():
+    # plugins get these hooks once, from the parent process. Hooks registered by test code and slashconf files
+    # are still fired in the worker, where the tests actually run
+    for hook_name in _REPLAYED_HOOK_NAMES:
+        for registration in list(gossip.get_hook('slash.{0}'.format(hook_name)).get_registrations()):
+            if (registration.token or '').startswith(_PLUGIN_TOKEN_PREFIX):
+                registration.unregister()
+
+
+def _iter_assigned_tests(tests, work_queue, stop_event):
+    while not stop_event.is_set():
+        try:
+            item = work_queue.get(timeout=_POLL_INTERVAL)
+        except queue.Empty:
+            continue
+        if item is None:
+            break
+        for index in item:
+            if stop_event.is_set():
+                return
+            yield tests[index]
+
+
+class _WorkerReporter(ReporterInterface):
+
+    def __init__(self, indices, result_queue, stop_event):
+        super(_WorkerReporter, self).__init__()
+        self._indices = indices
+        self._result_queue = result_queue
+        self._stop_event = stop_event
+        self._test_start_time = None
+        self._ended = set()
+
+    def report_test_start(self, test):
+        self._test_start_time = time.time()
+
+    def report_test_end(self, test, result):
+        duration = time.time() - self._test_start_time
+        index = self._indices[id(test)]
+        self._ended.add(index)
+        self._result_queue.put(('test_end', index, result.test_id, result.dumps(), duration))
+        if result.has_fatal_exception():
+            self._stop_event.set()
+
+    def report_test_error_added(self, test, error):
+        self._report_late_error(test, error)
+
+    def report_test_failure_added(self, test, error):
+        self._report_late_error(test, error)
+
+    def _report_late_error(self, test, error):
+        # errors added after the test ended (e.g. by deferred cleanups) are missing from the result already sent
+        index = self._indices.get(id(test)) if test is not None else None
+        if index is not None and index in self._ended:
+            self._result_queue.put(('error_added', index, error))
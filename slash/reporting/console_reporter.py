@@ -140,6 +140,25 @@ class ConsoleReporter(ReporterInterface):
     def report_collection_end(self, collected):
         self._report_num_collected(collected, stillworking=False)
 
+    def report_collection_stats(self, stats):
+        self._terminal.sep('=', 'Collection Statistics', white=True, bold=True)
+        for file_stats in stats.get_files():
+            self._terminal.write('{0:>9.3f}s {1:>6} tests  {2}{3}\n'.format(
+                file_stats.import_duration, file_stats.num_tests, file_stats.file_path,
+                ' (worker)' if file_stats.in_worker else ''))
+        self._terminal.write('Total import time: {0:.3f}s\n'.format(stats.get_total_import_duration()), bold=True)
+
+    def report_fixture_timings(self, timings):
+        summaries = timings.get_summaries()[:config.root.run.show_slowest_fixtures]
+        if not summaries:
+            return
+        self._terminal.sep('=', 'Slowest Fixtures', white=True, bold=True)
+        for summary in summaries:
+            self._terminal.write('{0:>9.3f}s (setup {1:.3f}s x{2}, teardown {3:.3f}s x{4}) {5:<9} {6}\n'.format(
+                summary.get_total_duration(), summary.setup_duration, summary.num_setups,
+                summary.teardown_duration, summary.num_teardowns, summary.scope, summary.get_description()))
+        self._terminal.write('Total fixture time: {0:.3f}s\n'.format(timings.get_total_duration()), bold=True)
+
     def _report_num_collected(self, collected, stillworking):
         if self._terminal.isatty():
             self._terminal.write('\r')
@@ -196,11 +215,15 @@ class ConsoleReporter(ReporterInterface):
         return theme('session-summary-failure')
 
     def _iter_reported_results(self, session):
-        for test_index, test_result in enumerate(session.results.iter_test_results()):
-            infos = self._get_result_info_generators(test_result)
-            if not infos:
-                continue
-            yield test_index, test_result, infos
+        statuses = []
+        if self._verobsity_allows(VERBOSITIES.ERROR):
+            statuses.extend(['error', 'failure'])
+        if self._verobsity_allows(VERBOSITIES.INFO):
+            statuses.append('skip')
+        if not statuses:
+            return
+        for test_result in session.results.query(status=statuses):
+            yield session.results.get_position(test_result), test_result, self._get_result_info_generators(test_result)
 
     def _report_test_summary_header(self, index, test_result):
         self._terminal.lsep(
@@ -30,6 +30,12 @@ class ReporterInterface(object):
     def report_collection_end(self, collected):
         pass
 
+    def report_collection_stats(self, stats):
+        pass
+
+    def report_fixture_timings(self, timings):
+        pass
+
     def report_test_start(self, test):
         pass
 
@@ -9,10 +9,12 @@ from .conf import config
 from .ctx import context
 from .exception_handling import handling_exceptions
 from .exceptions import NoActiveSession
+from .core.error import distill_expired_tracebacks
 from .core.function_test import FunctionTest
 from .core.metadata import ensure_test_metadata
 from .core.exclusions import is_excluded
 from .core import requirements
+from .parallel import run_tests_in_parallel
 from .utils.iteration import PeekableIterator
 
 
@@ -33,6 +35,10 @@ def run_tests(iterable, stop_on_error=None):
     if context.session is None or not context.session.started:
         raise NoActiveSession("A session is not currently started")
 
+    if config.root.run.parallel > 0:
+        run_tests_in_parallel(iterable, config.root.run.parallel, should_stop_on_error())
+        return
+
     test_iterator = PeekableIterator(iterable)
     last_filename = None
     complete = False
@@ -55,6 +61,8 @@ def run_tests(iterable, stop_on_error=None):
             context.session.reporter.report_test_end(test, result)
             if not test_iterator.has_next() or ensure_test_metadata(test_iterator.peek()).file_path != last_filename:
                 context.session.reporter.report_file_end(last_filename)
+            context.session.results.spill(result)
+            distill_expired_tracebacks()
             if result.has_fatal_exception():
                 _logger.debug("Stopping on fatal exception")
                 break
@@ -196,15 +204,18 @@ def _set_test_metadata(test):
 def _mark_unrun_tests(test_iterator):
     remaining = list(test_iterator)
     for test in remaining:
-        with _get_test_context(test, logging=False):
+        with _get_test_context(test, logging=False) as result:
             pass
+        context.session.results.spill(result)
 
 @contextmanager
-def _get_test_context(test, logging=True):
+def _get_test_context(test, logging=True, test_id=None):
     ensure_test_metadata(test)
 
     assert test.__slash__.id is None
-    test.__slash__.id = context.session.id_space.allocate()
+    if test_id is None:
+        test_id = context.session.id_space.allocate()
+    test.__slash__.id = test_id
     with _set_current_test_context(test):
         result = context.session.results.create_result(test)
         prev_result = context.result
@@ -1,7 +1,7 @@
 import functools
 
 from ..ctx import context
-from ..core.markers import repeat_marker
+from ..core.markers import combinatorial_marker, repeat_marker
 from ..core import requirements
 from ..exceptions import SkipTest
 
@@ -19,6 +19,16 @@ def repeat(num_repetitions):
     """
     return repeat_marker(num_repetitions)
 
+def combinatorial(strength=2):
+    """
+    Marks a test (or a test class) to be run with a covering array of its parametrization values, rather than
+    with every possible combination of them. Every combination of values of any *strength* parameters is still
+    covered by at least one test -- the default of 2 results in pairwise testing
+    """
+    if callable(strength):
+        return combinatorial_marker(2)(strength)
+    return combinatorial_marker(strength)
+
 
 def skipped(thing, reason=None):
     """
@@ -0,0 +1,100 @@
+import itertools
+
+from .._compat import xrange
+
+
+def iter_covering_array(num_values, strength):
+    """Yields tuples of value indices, forming a covering array of the given strength: for every *strength*
+    parameters, each combination of their values appears in at least one of the yielded tuples.
+
+    :param num_values: a list holding the number of values of each parameter
+    :param strength: the number of parameters whose value combinations are covered (2 for pairwise testing)
+
+    The array is built with the IPOG strategy -- starting from all combinations of the *strength* parameters
+    having the most values, and adding the other parameters one at a time -- in a deterministic manner, so the
+    same tuples are yielded for the same input on every run. Tuples are yielded in lexicographic order
+    """
+    num_params = len(num_values)
+    if strength <= 0 or strength >= num_params or 0 in num_values:
+        for value_indices in itertools.product(*(xrange(n) for n in num_values)):
+            yield value_indices
+        return
+
+    # parameters with more values are added first, which keeps the array smaller
+    order = sorted(xrange(num_params), key=lambda param: (-num_values[param], param))
+    sizes = [num_values[param] for param in order]
+    rows = [list(values) for values in itertools.product(*(xrange(size) for size in sizes[:strength]))]
+    for param in xrange(strength, num_params):
+        _add_parameter(rows, sizes, param, strength)
+
+    returned = set()
+    for row in rows:
+        original_row = [None] * num_params
+        for position, param in enumerate(order):
+            # values left unassigned are not needed to cover any combination
+            original_row[param] = row[position] if row[position] is not None else 0
+        returned.add(tuple(original_row))
+
+    for row in sorted(returned):
+        yield row
+
+
+def _add_parameter(rows, sizes, param, strength):
+    """Extends *rows*, which cover all combinations of parameters before *param*, to also cover the combinations
+    involving *param*
+    """
+    combos = list(itertools.combinations(xrange(param), strength - 1))
+    uncovered = dict((combo, set(itertools.product(*[xrange(sizes[p]) for p in combo + (param,)])))
+                     for combo in combos)
+
+    # horizontal growth: extend each existing row with the value covering the most missing combinations. On ties,
+    # values are rotated from one row to the next, which yields orthogonal latin squares where they exist
+    value = -1
+    for row in rows:
+        keys = [(combo, tuple(row[p] for p in combo)) for combo in combos]
+        keys = [(combo, key) for combo, key in keys if None not in key]
+        gains = [0] * sizes[param]
+        for combo, key in keys:
+            combo_uncovered = uncovered[combo]
+            for candidate in xrange(sizes[param]):
+                if key + (candidate,) in combo_uncovered:
+                    gains[candidate] += 1
+        last_value = value
+        value = max(xrange(sizes[param]),
+                    key=lambda candidate: (gains[candidate], -((candidate - last_value - 1) % sizes[param])))
+        row.append(value)
+        for combo, key in keys:
+            uncovered[combo].discard(key + (value,))
+
+    # vertical growth: combinations still missing are placed in rows having unassigned values where possible, or
+    # in new rows otherwise
+    open_rows = [row for row in rows if None in row]
+    for combo in combos:
+        params = combo + (param,)
+        for values in sorted(uncovered[combo]):
+            if values not in uncovered[combo]:
+                continue  # covered by a row filled in the meantime
+            row = _find_compatible_row(open_rows, params, values)
+            if row is None:
+                row = [None] * (param + 1)
+                rows.append(row)
+                open_rows.append(row)
+            for p, value in zip(params, values):
+                row[p] = value
+            if None not in row:
+                open_rows.remove(row)
+            _discard_covered(uncovered, combos, param, row)
+
+
+def _find_compatible_row(rows, params, values):
+    for row in rows:
+        if all(row[p] is None or row[p] == value for p, value in zip(params, values)):
+            return row
+    return None
+
+
+def _discard_covered(uncovered, combos, param, row):
+    for combo in combos:
+        key = tuple(row[p] for p in combo + (param,))
+        if None not in key:
+            uncovered[combo].discard(key)
@@ -21,6 +21,18 @@ class Include(object):
             return False
         return self.pattern in metadata.address
 
+    def compile(self):
+        pattern = self.pattern
+        if self.only_tags:
+            return lambda metadata: metadata.tags.matches_pattern(pattern)
+        return lambda metadata: metadata.tags.matches_pattern(pattern) or pattern in metadata.address
+
+    def compile_tags(self):
+        pattern = self.pattern
+        if self.only_tags:
+            return lambda tags: tags.matches_pattern(pattern)
+        return lambda tags: True if tags.matches_pattern(pattern) else None
+
     def __repr__(self):
         return '<{0}{1}>'.format(self.pattern, ' (only tags)' if self.only_tags else '')
 
@@ -41,14 +53,44 @@ class BinaryMatching(object):
     def matches(self, metadata):
         return self.aggregator(matcher.matches(metadata) for matcher in self.matchers)  # pylint: disable=not-callable
 
+    def compile(self):
+        predicates = tuple(matcher.compile() for matcher in self.matchers)
+        aggregator = self.aggregator
+        return lambda metadata: aggregator(predicate(metadata) for predicate in predicates)
+
+    def compile_tags(self):
+        predicates = tuple(matcher.compile_tags() for matcher in self.matchers)
+        aggregate = self._aggregate_tag_results
+        return lambda tags: aggregate([predicate(tags) for predicate in predicates])
+
+    @classmethod
+    def _aggregate_tag_results(cls, results):
+        raise NotImplementedError()  # pragma: no cover
+
 
 class AndMatching(BinaryMatching):
     aggregator = all
 
+    @classmethod
+    def _aggregate_tag_results(cls, results):
+        if False in results:
+            return False
+        if None in results:
+            return None
+        return True
+
 
 class OrMatching(BinaryMatching):
     aggregator = any
 
+    @classmethod
+    def _aggregate_tag_results(cls, results):
+        if True in results:
+            return True
+        if None in results:
+            return None
+        return False
+
 
 class Exclude(object):
 
@@ -59,6 +101,18 @@ class Exclude(object):
     def matches(self, metadata):
         return not self.matcher.matches(metadata)
 
+    def compile(self):
+        predicate = self.matcher.compile()
+        return lambda metadata: not predicate(metadata)
+
+    def compile_tags(self):
+        predicate = self.matcher.compile_tags()
+
+        def returned(tags):
+            result = predicate(tags)
+            return None if result is None else not result
+        return returned
+
 
 matcher = Word(alphanums + '._,-=:/')
 matcher.setParseAction(Include)
@@ -75,9 +129,24 @@ class Matcher(object):
     def __init__(self, pattern):
         super(Matcher, self).__init__()
         self._matcher = boolExpr.parseString(pattern)[0]
+        self._predicate = self._matcher.compile()
+        self._tags_predicate = self._matcher.compile_tags()
 
     def __repr__(self):
         return repr(self._matcher)
 
     def matches(self, metadata):
-        return self._matcher.matches(metadata)
+        if isinstance(metadata, str):
+            return self._matcher.matches(metadata)
+        return self._predicate(metadata)
+
+    def get_predicate(self):
+        """Returns a function receiving test metadata, and returning whether or not it matches the pattern
+        """
+        return self._predicate
+
+    def matches_tags(self, tags):
+        """Checks whether tests with the given tags can match the pattern. Returns True or False if the tags alone
+        determine the outcome, or None if it depends on other properties of the tests (e.g. their addresses)
+        """
+        return self._tags_predicate(tags)
@@ -1,6 +1,7 @@
 from collections import OrderedDict
 import functools
 import inspect
+import pickle
 import sys
 
 from sentinels import NOTHING
@@ -79,3 +80,13 @@ def call_all_raise_first(_funcs, *args, **kwargs):
             exc_info = sys.exc_info()
     if exc_info is not None:
         reraise(*exc_info)
+
+
+def is_picklable(obj):
+    """Returns whether or not the given object survives a round trip through pickle
+    """
+    try:
+        pickle.loads(pickle.dumps(obj))
+    except Exception:  # pylint: disable=broad-except
+        return False
+    return True
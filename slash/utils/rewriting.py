@@ -0,0 +1,190 @@
+import ast
+import hashlib
+import marshal
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+import dessert
+import dessert.rewrite
+import logbook
+from emport import import_file
+
+from ..__version__ import __version__
+from ..conf import config
+from .path import ensure_directory
+
+try:
+    import importlib.machinery
+    import importlib.util
+except ImportError:  # python 2
+    _SUPPORTS_CACHING = False
+else:
+    _SUPPORTS_CACHING = hasattr(importlib.machinery.PathFinder, 'find_spec')
+
+_logger = logbook.Logger(__name__)
+
+_caches_by_path = {}
+
+_DESSERT_VERSION = getattr(dessert.__version__, '__version__', dessert.__version__)
+
+_ENTRY_SUFFIX = '.code'
+_SECONDS_IN_DAY = 24 * 60 * 60
+
+
+def import_file_rewriting_assertions(path):
+    """Imports a test file or a slashconf file, rewriting its assertions (as well as those of the modules it imports).
+    The rewritten code of the file itself is cached under ``run.rewritten_code_cache_path`` when it is set
+    """
+    with _rewriting_context(path):
+        return import_file(path)
+
+
+def get_rewritten_code_cache():
+    """Returns the :class:`RewrittenCodeCache` currently in use, or None if caching is disabled
+    """
+    cache_path = config.root.run.rewritten_code_cache_path
+    if not cache_path or not _SUPPORTS_CACHING:
+        return None
+    cache_path = os.path.expanduser(cache_path)
+    returned = _caches_by_path.get(cache_path)
+    if returned is None:
+        returned = _caches_by_path[cache_path] = RewrittenCodeCache(
+            cache_path, max_entries=config.root.run.rewritten_code_cache_max_entries,
+            max_age_days=config.root.run.rewritten_code_cache_max_age_days)
+    return returned
+
+
+@contextmanager
+def _rewriting_context(path):
+    with dessert.rewrite_assertions_context():
+        cache = get_rewritten_code_cache()
+        if cache is None:
+            yield
+            return
+        # modules imported by the file are rewritten by dessert as usual, but not cached
+        finder = _CachingRewritingFinder(cache, path)
+        sys.meta_path.insert(0, finder)
+        try:
+            yield
+        finally:
+            sys.meta_path.remove(finder)
+
+
+class RewrittenCodeCache(object):
+    """Stores the code objects of rewritten modules on disk, keyed by their path, their source and the versions
+    of the components affecting the rewriting.
+
+    Entries not used for more than *max_age_days* days are evicted, as are the least recently used entries
+    once there are more than *max_entries* of them
+    """
+
+    def __init__(self, path, max_entries=None, max_age_days=None):
+        super(RewrittenCodeCache, self).__init__()
+        self._path = path
+        self._max_entries = max_entries
+        self._max_age_days = max_age_days
+        self.hits = self.misses = 0
+
+    def get_code(self, filename, source):
+        entry_path = os.path.join(self._path, self._get_key(filename, source) + _ENTRY_SUFFIX)
+        try:
+            with open(entry_path, 'rb') as f:
+                returned = marshal.load(f)
+            # the modification time of entries marks when they were last used
+            os.utime(entry_path, None)
+        except (IOError, OSError, EOFError, ValueError, TypeError):
+            returned = None
+        if returned is not None:
+            self.hits += 1
+            return returned
+
+        self.misses += 1
+        returned = _rewrite(filename, source)
+        tmp_path = '{0}.{1}.tmp'.format(entry_path, os.getpid())
+        try:
+            ensure_directory(self._path)
+            with open(tmp_path, 'wb') as f:
+                marshal.dump(returned, f)
+            os.rename(tmp_path, entry_path)
+        except (IOError, OSError):
+            _logger.debug('Could not cache rewritten code of {0}', filename, exc_info=True)
+        return returned
+
+    def evict(self):
+        entries = sorted(self._iter_entries(), reverse=True)
+        if self._max_age_days is not None:
+            threshold = time.time() - self._max_age_days * _SECONDS_IN_DAY
+            while entries and entries[-1][0] < threshold:
+                self._remove(entries.pop()[1])
+        if self._max_entries is not None:
+            while len(entries) > self._max_entries:
+                self._remove(entries.pop()[1])
+
+    def __len__(self):
+        return sum(1 for _ in self._iter_entries())
+
+    def _iter_entries(self):
+        if not os.path.isdir(self._path):
+            return
+        for filename in os.listdir(self._path):
+            if not filename.endswith(_ENTRY_SUFFIX):
+                continue
+            entry_path = os.path.join(self._path, filename)
+            try:
+                yield os.path.getmtime(entry_path), entry_path
+            except OSError:
+                continue
+
+    def _remove(self, entry_path):
+        try:
+            os.unlink(entry_path)
+        except OSError:
+            _logger.debug('Could not remove rewritten code cache entry {0}', entry_path, exc_info=True)
+
+    def _get_key(self, filename, source):
+        # code objects refer to the path of their file (e.g. in tracebacks), so it is a part of the key
+        hasher = hashlib.sha1()
+        hasher.update('{0}|{1}|{2}|{3}'.format(
+            sys.version, _DESSERT_VERSION, __version__, os.path.abspath(filename)).encode('utf-8'))
+        hasher.update(source)
+        return hasher.hexdigest()
+
+
+class _CachingRewritingFinder(object):
+
+    def __init__(self, cache, path):
+        super(_CachingRewritingFinder, self).__init__()
+        self._cache = cache
+        if os.path.isdir(path):
+            path = os.path.join(path, '__init__.py')
+        self._path = os.path.abspath(path)
+
+    def find_spec(self, name, path=None, target=None):  # pylint: disable=unused-argument
+        spec = importlib.machinery.PathFinder.find_spec(name, path)
+        if spec is None or spec.origin in (None, 'namespace') or \
+           not isinstance(spec.loader, importlib.machinery.SourceFileLoader) or \
+           os.path.abspath(spec.origin) != self._path:
+            return None
+        return importlib.util.spec_from_file_location(
+            name, spec.origin, loader=self, submodule_search_locations=spec.submodule_search_locations)
+
+    def create_module(self, spec):  # pylint: disable=unused-argument
+        return None
+
+    def exec_module(self, module):
+        filename = module.__spec__.origin
+        with open(filename, 'rb') as f:
+            source = f.read()
+        exec(self._cache.get_code(filename, source), module.__dict__)  # pylint: disable=exec-used
+
+
+def _rewrite(filename, source):
+    tree = ast.parse(source, filename=filename)
+    try:
+        dessert.rewrite.rewrite_asserts(tree, source=source, module_path=filename)
+    except TypeError:
+        # older versions of dessert do not receive the module source
+        dessert.rewrite.rewrite_asserts(tree, module_path=filename)
+    return compile(tree, filename, 'exec', dont_inherit=True)
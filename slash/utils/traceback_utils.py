@@ -1,13 +1,14 @@
 from __future__ import absolute_import
 
-import inspect
 import linecache
 import os
 import sys
 import traceback
 import types
 
-from .._compat import PY2
+from sentinels import NOTHING
+
+from .._compat import PY2, iteritems
 from .. import context
 from .python import get_underlying_func
 
@@ -25,38 +26,88 @@ def get_traceback_string(exc_info=None):
     return "".join(traceback.format_exception(exc_type, exc_value, exc_tb))
 
 
-def distill_traceback(tb, **kw):
-    return _distill_frames(_get_tb_frames(tb), **kw)
+def distill_traceback(tb, frame_correction=0):
+    return distill_frames(_correct_frames(get_traceback_frames(tb), frame_correction))
+
+
+def distill_call_stack(frame_correction=0):
+    return distill_frames(get_call_stack_frames(frame_correction=frame_correction + 1))
+
+
+def get_traceback_frames(tb):
+    """Returns the frames of a traceback as (frame, line number) pairs, which can later be distilled through
+    :func:`distill_frames`
+    """
+    returned = []
+    while tb is not None:
+        returned.append((tb.tb_frame, tb.tb_lineno))
+        tb = tb.tb_next
+    return returned
 
 
-def distill_call_stack(**kw):
-    return _distill_frames(_get_sys_trace_frames(), **kw)
+def get_call_stack_frames(frame_correction=0):
+    """Like :func:`get_traceback_frames`, only for the current call stack. The line numbers are recorded right away,
+    as the frames keep running after this call
+    """
+    return [(frame, frame.f_lineno) for frame in _correct_frames(_get_sys_trace_frames(), frame_correction)]
 
 
-def _distill_frames(frames, frame_correction=0):
+def distill_frames(frames, test_code=NOTHING):
+    """Distills (frame, line number) pairs into a :class:`DistilledTraceback`. *test_code* is the code object of the
+    test function during which the frames were captured (by default, that of the current test). Frames already
+    distilled by :func:`distill_running_frames` are kept as they are
+    """
+    if test_code is NOTHING:
+        test_code = get_current_test_code()
     returned = DistilledTraceback()
-    frames = frames[:len(frames)-frame_correction+1]
     for frame in frames:
-        if isinstance(frame, tuple):
-            frame, lineno = frame
-        else:
-            lineno = None
+        if isinstance(frame, DistilledFrame):
+            returned.frames.append(frame)
+            continue
+        frame, lineno = frame
         if _is_frame_and_below_muted(frame):
             break
         if not _is_frame_muted(frame):
-            returned.frames.append(DistilledFrame(frame, lineno))
+            returned.frames.append(DistilledFrame(frame, lineno, test_code=test_code))
     return returned
 
 
-def _get_tb_frames(tb):
+def distill_running_frames(frames, test_code=NOTHING):
+    """Distills those of the given (frame, line number) pairs whose frames are still running, as their variables may
+    change later on. Returns a list in which these frames are replaced by :class:`DistilledFrame` objects, while the
+    pairs of frames which already returned are kept, to be passed to :func:`distill_frames` once needed
+    """
+    if test_code is NOTHING:
+        test_code = get_current_test_code()
+    running = set(_get_sys_trace_frames())
     returned = []
-    while tb is not None:
-        returned.append((tb.tb_frame, tb.tb_lineno))
-        tb = tb.tb_next
+    for frame, lineno in frames:
+        if _is_frame_and_below_muted(frame):
+            break
+        if _is_frame_muted(frame):
+            continue
+        returned.append(DistilledFrame(frame, lineno, test_code=test_code) if frame in running else (frame, lineno))
     return returned
 
+
+def get_current_test_code():
+    if context.test is None:
+        return None
+    return get_underlying_func(context.test.get_test_function()).__code__
+
+
+def _correct_frames(frames, frame_correction):
+    return frames[:len(frames)-frame_correction+1]
+
+
 def _get_sys_trace_frames():
-    return [f[0] for f in reversed(inspect.stack()[:-1])]
+    # equivalent to the frames returned by inspect.stack(), outermost first, without reading any source lines
+    returned = []
+    frame = sys._getframe()  # pylint: disable=protected-access
+    while frame is not None:
+        returned.append(frame)
+        frame = frame.f_back
+    return returned[-2::-1]
 
 def _is_frame_muted(frame):
     try:
@@ -124,7 +175,10 @@ class DistilledTraceback(object):
 
 class DistilledFrame(object):
 
-    def __init__(self, frame, lineno=None):
+    __slots__ = ('filename', 'lineno', 'func_name', 'locals', 'globals', 'code_line', 'code_string',
+                 '_is_in_test_code')
+
+    def __init__(self, frame, lineno=None, test_code=NOTHING):
         super(DistilledFrame, self).__init__()
         self.filename = os.path.abspath(frame.f_code.co_filename)
         if lineno is None:
@@ -137,15 +191,20 @@ class DistilledFrame(object):
         self.code_string = "".join(
             linecache.getline(self.filename, lineno)
             for lineno in range(frame.f_code.co_firstlineno, self.lineno + 1)) or None
-        if context.test is not None:
-            test_function = get_underlying_func(context.test.get_test_function())
-            self._is_in_test_code = frame.f_code is test_function.__code__
-        else:
-            self._is_in_test_code = False
+        if test_code is NOTHING:
+            test_code = get_current_test_code()
+        self._is_in_test_code = test_code is not None and frame.f_code is test_code
 
     def is_in_test_code(self):
         return self._is_in_test_code
 
+    def __getstate__(self):
+        return dict((attr, getattr(self, attr)) for attr in self.__slots__)
+
+    def __setstate__(self, state):
+        for attr, value in iteritems(state):
+            setattr(self, attr, value)
+
     def to_dict(self):
         serialized = {}
         for attr in ['filename', 'lineno', 'func_name', 'locals', 'globals', 'code_line', 'code_string']:
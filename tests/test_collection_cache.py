@@ -0,0 +1,119 @@
+# pylint: disable=redefined-outer-name
+import os
+
+import pytest
+import slash
+from slash._compat import StringIO
+from slash.core.collection_cache import CachedTest
+from slash.frontend.slash_list import slash_list
+from slash.frontend.slash_run import slash_run
+
+from .utils import NullFile
+
+
+def test_slash_list_uses_cache(tests_dir, imported):
+    first_output = _list(tests_dir)
+    assert imported == ['a', 'b']
+
+    second_output = _list(tests_dir)
+    assert imported == ['a', 'b']
+    assert second_output == first_output
+    assert 'test_b_1(param=2)' in second_output
+    assert 'Tags: [\'slow\']' in second_output
+
+
+def test_changed_file_is_reimported(tests_dir, imported):
+    _list(tests_dir)
+    with open(os.path.join(tests_dir, 'test_b.py'), 'a') as f:
+        f.write('\ndef test_b_2():\n    pass\n')
+    _list(tests_dir)
+    assert imported == ['a', 'b', 'b']
+
+
+def test_changed_slashconf_invalidates_cache(tests_dir, imported):
+    _list(tests_dir)
+    with open(os.path.join(tests_dir, 'slashconf.py'), 'w') as f:
+        f.write('# changed\n')
+    _list(tests_dir)
+    assert imported == ['a', 'b', 'a', 'b']
+
+
+def test_no_cache_by_default(tests_dir, imported):
+    _list(tests_dir, use_cache=False)
+    _list(tests_dir, use_cache=False)
+    assert imported == ['a', 'b', 'a', 'b']
+
+
+def test_loader_returns_cached_tests(tests_dir):
+    for expect_cached in (False, True):
+        with slash.Session():
+            tests = slash.loader.Loader(prefer_cached=True, use_collection_cache=True).get_runnables(tests_dir)
+        assert len(tests) == 5
+        assert all(isinstance(test, CachedTest) == expect_cached for test in tests)
+
+
+def test_filtered_run_skips_unselected_files(tests_dir, imported):
+    for _ in range(2):
+        app = slash_run([tests_dir, '--collection-cache', '-k', 'test_a'], report_stream=NullFile())
+        assert app.exit_code == 0
+        assert app.session.results.get_num_successful() == 1
+    # the second run knows test_b.py has no matching tests
+    assert imported == ['a', 'b', 'a']
+
+
+def test_filter_by_tag_uses_cached_tags(tests_dir, imported):
+    for _ in range(2):
+        app = slash_run([tests_dir, '--collection-cache', '-k', 'tag:slow'], report_stream=NullFile())
+        assert app.exit_code == 0
+        assert app.session.results.get_num_successful() == 1
+    assert imported == ['a', 'b', 'b']
+
+
+def _list(tests_dir, use_cache=True):
+    report_stream = StringIO()
+    args = [tests_dir, '--only-tests', '--show-tags', '--no-color']
+    if use_cache:
+        args.append('--collection-cache')
+    assert slash_list(args, report_stream) == 0
+    return report_stream.getvalue()
+
+
+@pytest.fixture
+def imported(monkeypatch):
+    returned = []
+    orig_import_file = slash.utils.rewriting.import_file
+
+    def import_file(path):
+        filename = os.path.basename(path)
+        if filename.startswith('test_'):
+            returned.append(filename[len('test_'):-len('.py')])
+        return orig_import_file(path)
+
+    monkeypatch.setattr(slash.utils.rewriting, 'import_file', import_file)
+    return returned
+
+
+@pytest.fixture
+def tests_dir(tmpdir, config_override):
+    config_override('run.collection_cache_path', str(tmpdir.join('cache')))
+    returned = tmpdir.join('tests')
+    returned.join('slashconf.py').write('', ensure=True)
+    returned.join('test_a.py').write(_TEST_FILE_TEMPLATE.format(name='a'))
+    returned.join('test_b.py').write(_TEST_FILE_TEMPLATE.format(name='b') + """
+@slash.tag('slow')
+def test_b_0():
+    pass
+
+@slash.parametrize('param', [1, 2])
+def test_b_1(param):
+    pass
+""")
+    return str(returned)
+
+
+_TEST_FILE_TEMPLATE = """
+import slash
+
+def test_{name}():
+    pass
+"""
@@ -0,0 +1,134 @@
+import itertools
+import time
+
+import pytest
+import slash
+from slash.loader import Loader
+from slash.utils.combinatorics import iter_covering_array
+
+
+@pytest.mark.parametrize('num_values,strength', [
+    ([2, 2, 2], 2),
+    ([3, 3, 3, 3], 2),
+    ([6, 5, 4, 3, 2, 2, 2, 2], 2),
+    ([3, 2, 3, 2, 3], 3),
+    ([4, 1, 3, 2], 2),
+])
+def test_covering_array(num_values, strength):
+    rows = list(iter_covering_array(num_values, strength))
+    assert rows == sorted(set(rows))
+    assert len(rows) < _product(num_values)
+    _assert_covering(rows, num_values, strength)
+
+
+@pytest.mark.parametrize('num_values,strength,optimal_size', [
+    ([2, 2, 2], 2, 4),
+    ([3, 3, 3, 3], 2, 9),
+    ([5, 5, 5], 2, 25),
+    ([6, 5, 4, 3, 2, 2, 2, 2], 2, 30),
+    ([2, 2, 2, 2], 3, 8),
+])
+def test_covering_array_size(num_values, strength, optimal_size):
+    assert len(list(iter_covering_array(num_values, strength))) == optimal_size
+
+
+def test_covering_array_large():
+    num_values = [10] * 8
+    start_time = time.time()
+    rows = list(iter_covering_array(num_values, 3))
+    assert time.time() - start_time < 10
+    # the best known array has 1,331 rows, and choosing each row greedily out of all uncovered combinations yielded 2,204
+    assert len(rows) < 2100
+    _assert_covering(rows, num_values, 3)
+
+
+def test_covering_array_is_deterministic():
+    num_values = [5, 4, 3, 3, 2, 2]
+    assert list(iter_covering_array(num_values, 2)) == list(iter_covering_array(num_values, 2))
+
+
+@pytest.mark.parametrize('strength', [0, 3, 4])
+def test_covering_array_full_product(strength):
+    num_values = [2, 3, 2]
+    assert list(iter_covering_array(num_values, strength)) == list(itertools.product(range(2), range(3), range(2)))
+
+
+@pytest.mark.parametrize('use_config', [True, False])
+def test_combinatorial_function(tmpdir, config_override, use_config):
+    marker = ''
+    if use_config:
+        config_override('run.combinatorial_strength', 2)
+    else:
+        marker = '@slash.combinatorial()'
+    variations = _load_variation_values(tmpdir, _FUNCTION_TEST_SOURCE.format(marker=marker))
+    assert 9 <= len(variations) < 81
+    _assert_pairs_covered(variations, ['a', 'b', 'c', 'd'], range(3))
+
+
+def test_combinatorial_class(tmpdir):
+    variations = _load_variation_values(tmpdir, """
+import slash
+
+@slash.combinatorial
+class SomeTest(slash.Test):
+    @slash.parametrize('a', range(3))
+    @slash.parametrize('b', range(3))
+    @slash.parametrize('c', range(3))
+    def test_method(self, a, b, c):
+        pass
+""")
+    assert len(variations) < 27
+    _assert_pairs_covered(variations, ['a', 'b', 'c'], range(3))
+
+
+def test_combinatorial_marker_overrides_config(tmpdir, config_override):
+    config_override('run.combinatorial_strength', 2)
+    variations = _load_variation_values(tmpdir, _FUNCTION_TEST_SOURCE.format(marker='@slash.combinatorial(0)'))
+    assert len(variations) == 81
+
+
+def test_combinatorial_variations_are_stable(tmpdir, config_override):
+    config_override('run.combinatorial_strength', 2)
+    source = _FUNCTION_TEST_SOURCE.format(marker='')
+    assert _load_variation_values(tmpdir.join('1'), source) == _load_variation_values(tmpdir.join('2'), source)
+
+
+_FUNCTION_TEST_SOURCE = """
+import slash
+
+{marker}
+@slash.parametrize('a', range(3))
+@slash.parametrize('b', range(3))
+@slash.parametrize('c', range(3))
+@slash.parametrize('d', range(3))
+def test_something(a, b, c, d):
+    pass
+"""
+
+
+def _load_variation_values(tmpdir, source):
+    path = tmpdir.join('test_combinatorial.py')
+    path.write(source, ensure=True)
+    with slash.Session():
+        tests = Loader().get_runnables(str(path))
+    return [dict((name.split('.')[-1], value) for name, value in test.get_variation().values.items())
+            for test in tests]
+
+
+def _assert_pairs_covered(variations, names, values):
+    for name1, name2 in itertools.combinations(names, 2):
+        covered = set((variation[name1], variation[name2]) for variation in variations)
+        assert covered == set(itertools.product(values, values))
+
+
+def _assert_covering(rows, num_values, strength):
+    for params in itertools.combinations(range(len(num_values)), strength):
+        covered = set(tuple(row[param] for param in params) for row in rows)
+        assert len(covered) == _product(num_values[param] for param in params)
+
+
+def _product(numbers):
+    returned = 1
+    for number in numbers:
+        returned *= number
+    return returned
@@ -0,0 +1,117 @@
+# pylint: disable=unused-argument, unused-variable
+import threading
+
+import pytest
+import slash
+
+from .utils import make_runnable_tests
+
+_WAIT_TIMEOUT = 10
+
+
+def test_independent_fixtures_set_up_concurrently(concurrent_setup, config_override):
+    config_override('run.fixture_timing_details', True)
+    events = []
+    names = ('db', 'broker', 'device')
+    # each setup waits for all others to start, which only happens if they overlap
+    started = dict((name, threading.Event()) for name in names)
+    overlapped = []
+
+    with slash.Session() as s:
+        for name in names:
+            _add_fixture(s, name, events, started=started, overlapped=overlapped)
+
+        def test_something(db, broker, device):
+            assert (db, broker, device) == ('db', 'broker', 'device')
+
+        _run(s, test_something)
+
+    assert s.results.is_success(allow_skips=False)
+    assert overlapped == [True, True, True]
+    assert sorted(summary.name for summary in s.fixture_store.timings.get_summaries()) == sorted(names)
+    [result] = s.results.iter_test_results()
+    assert sorted((timing['fixture'], timing['phase']) for timing in result.details.all()['fixture_timings']) == \
+        sorted((name, phase) for name in names for phase in ('setup', 'teardown'))
+    setup_events = [event for event in events if event[0].endswith(':setup')]
+    assert len(set(thread_name for _, _, thread_name in setup_events)) == 3
+    # each fixture sees itself as the current fixture
+    assert all(event_name.split(':')[0] == current_fixture for event_name, current_fixture, _ in setup_events)
+
+
+def test_dependencies_set_up_first_and_torn_down_last(concurrent_setup):
+    events = []
+
+    with slash.Session() as s:
+        _add_fixture(s, 'db', events)
+        _add_fixture(s, 'broker', events)
+
+        @s.fixture_store.add_fixture
+        @slash.yield_fixture
+        def app(db, broker):
+            events.append(('app:setup', slash.context.fixture.name, None))
+            yield 'app'
+            events.append(('app:teardown', None, None))
+
+        def test_something(app, db):
+            events.append(('test', None, None))
+
+        _run(s, test_something)
+
+    assert s.results.is_success(allow_skips=False)
+    names = [event_name for event_name, _, _ in events]
+    assert sorted(names[:2]) == ['broker:setup', 'db:setup']
+    assert names[2:5] == ['app:setup', 'test', 'app:teardown']
+    assert sorted(names[5:]) == ['broker:teardown', 'db:teardown']
+
+
+def test_fixture_error_attributed_to_test(concurrent_setup):
+    events = []
+
+    with slash.Session() as s:
+        _add_fixture(s, 'db', events)
+
+        @s.fixture_store.add_fixture
+        @slash.fixture
+        def broker():
+            raise ZeroDivisionError()
+
+        @s.fixture_store.add_fixture
+        @slash.fixture
+        def app(db, broker):
+            events.append(('app:setup', None, None))
+
+        def test_something(app):
+            events.append(('test', None, None))
+
+        _run(s, test_something)
+
+    [result] = s.results.iter_test_results()
+    [error] = result.get_errors()
+    assert error.exception_type is ZeroDivisionError
+    names = [event_name for event_name, _, _ in events]
+    assert names == ['db:setup', 'db:teardown']
+
+
+def _add_fixture(session, name, events, started=None, overlapped=None):
+
+    def fixture_func():
+        events.append(('{0}:setup'.format(name), slash.context.fixture.name, threading.current_thread().name))
+        if started is not None:
+            started[name].set()
+            overlapped.append(all(event.wait(_WAIT_TIMEOUT) for event in started.values()))
+        slash.context.fixture.add_cleanup(lambda: events.append(('{0}:teardown'.format(name), None, None)))
+        return name
+
+    fixture_func.__name__ = name
+    session.fixture_store.add_fixture(slash.fixture(name=name)(fixture_func))
+
+
+def _run(session, test_func):
+    session.fixture_store.resolve()
+    with session.get_started_context():
+        slash.runner.run_tests(make_runnable_tests(test_func))
+
+
+@pytest.fixture
+def concurrent_setup(config_override):
+    config_override('run.concurrent_fixture_setup', 4)
@@ -0,0 +1,134 @@
+# pylint: disable=unused-argument, unused-variable
+import threading
+import time
+
+import gossip
+import slash
+from slash.reporting.null_reporter import NullReporter
+
+from .utils import make_runnable_tests
+
+_WAIT_TIMEOUT = 10
+
+
+def test_deferred_cleanup_does_not_block_next_test():
+    events = []
+    test_2_started = threading.Event()
+
+    @gossip.register('slash.session_end')
+    def session_end():
+        events.append('session_end')
+
+    def test_1():
+        def cleanup():
+            # only returns True if the next test starts while the cleanup is still running
+            events.append(('cleanup', test_2_started.wait(_WAIT_TIMEOUT)))
+        slash.add_cleanup(cleanup, deferred=True)
+
+    def test_2():
+        test_2_started.set()
+        events.append('test_2')
+
+    session = _run(test_1, test_2)
+    assert session.results.is_success(allow_skips=False)
+    # the session waits for deferred cleanups before it ends
+    assert events == ['test_2', ('cleanup', True), 'session_end']
+
+
+def test_deferred_cleanup_error_attributed_to_test():
+
+    def test_1():
+        slash.add_cleanup(lambda: 1 / 0, deferred=True)
+
+    def test_2():
+        pass
+
+    session = _run(test_1, test_2)
+    first, second = session.results.iter_test_results()
+    [error] = first.get_errors()
+    assert error.exception_type is ZeroDivisionError
+    assert second.is_success()
+    assert session.results.global_result.is_success()
+
+
+def test_deferred_cleanup_error_reported_for_its_test():
+    reported = []
+
+    class Reporter(NullReporter):
+
+        def report_test_error_added(self, test, error):
+            reported.append((test, error.exception_type))
+
+    def test_1():
+        slash.add_cleanup(lambda: 1 / 0, deferred=True)
+
+    def test_2():
+        pass
+
+    with slash.Session(reporter=Reporter()) as session:
+        _run_in_session(session, test_1, test_2)
+
+    first = next(iter(session.results.iter_test_results()))
+    assert [(test.__slash__.id, exception_type) for test, exception_type in reported] == \
+        [(first.test_metadata.id, ZeroDivisionError)]
+
+
+def test_deferred_fixture_teardown():
+    events = []
+    test_2_started = threading.Event()
+
+    def test_1(fixture):
+        events.append(('test_1', threading.current_thread().name))
+
+    def test_2():
+        test_2_started.set()
+        events.append(('test_2', None))
+
+    with slash.Session() as session:
+        @session.fixture_store.add_fixture
+        @slash.yield_fixture(deferred_teardown=True)
+        def fixture():
+            yield
+            assert test_2_started.wait(_WAIT_TIMEOUT)
+            events.append(('teardown', threading.current_thread().name))
+            raise ZeroDivisionError()
+
+        _run_in_session(session, test_1, test_2)
+
+    assert [name for name, _ in events] == ['test_1', 'test_2', 'teardown']
+    assert events[0][1] != events[2][1]
+    first, second = session.results.iter_test_results()
+    [error] = first.get_errors()
+    assert error.exception_type is ZeroDivisionError
+    assert second.is_success()
+
+
+def test_deferred_cleanup_threads_bounded(config_override):
+    config_override('run.deferred_cleanup_threads', 2)
+    thread_names = set()
+    lock = threading.Lock()
+
+    def cleanup():
+        time.sleep(0.05)
+        with lock:
+            thread_names.add(threading.current_thread().name)
+
+    def test_something():
+        for _ in range(6):
+            slash.add_cleanup(cleanup, deferred=True)
+
+    session = _run(test_something)
+    assert session.results.is_success(allow_skips=False)
+    assert len(thread_names) == 2
+
+
+def _run(*test_funcs):
+    with slash.Session() as session:
+        _run_in_session(session, *test_funcs)
+    return session
+
+
+def _run_in_session(session, *test_funcs):
+    session.fixture_store.resolve()
+    with session.get_started_context():
+        slash.runner.run_tests([test for func in test_funcs for test in make_runnable_tests(func)])
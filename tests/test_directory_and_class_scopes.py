@@ -0,0 +1,120 @@
+# pylint: disable=redefined-outer-name
+import os
+
+import pytest
+from slash.frontend.slash_run import slash_run
+
+from .utils import NullFile
+
+
+def test_directory_fixture_torn_down_when_leaving_directory(tests_dir, events_file):
+    _run(tests_dir)
+    events = _get_events(events_file)
+    assert events.count('pool setup') == 1
+    pool_tests = [index for index, event in enumerate(events) if event.startswith('pool test')]
+    assert len(pool_tests) == 3
+    # set up before the first test of the directory, and torn down before leaving it
+    assert events.index('pool setup') < min(pool_tests)
+    assert max(pool_tests) < events.index('pool teardown') < events.index('other test')
+
+
+def test_directory_cleanup(tests_dir, events_file):
+    _run(tests_dir)
+    events = _get_events(events_file)
+    assert events.index('directory cleanup') < events.index('other test')
+    assert events.index('directory cleanup') > events.index('test_b1')
+
+
+def test_class_fixture(tmpdir, events_file):
+    tmpdir.join('tests', 'test_classes.py').write(_CLASSES_SOURCE.format(events_file=events_file), ensure=True)
+    _run(str(tmpdir.join('tests')))
+    assert _get_events(events_file) == [
+        'setup 1', 'First.test_1', 'First.test_2', 'class cleanup', 'teardown 1',
+        'setup 2', 'Second.test_1', 'Second.test_2', 'class cleanup', 'teardown 2',
+        'setup 3', 'test_function', 'teardown 3',
+    ]
+
+
+def _run(tests_dir, num_tests=5):
+    # directories are passed explicitly, since the order in which subdirectories are walked is arbitrary
+    paths = [os.path.join(tests_dir, name) for name in sorted(os.listdir(tests_dir))]
+    app = slash_run(paths, report_stream=NullFile())
+    assert app.exit_code == 0
+    assert app.session.results.get_num_successful() == num_tests
+
+
+def _get_events(events_file):
+    with open(events_file) as f:
+        return f.read().splitlines()
+
+
+@pytest.fixture
+def events_file(tmpdir):
+    return str(tmpdir.join('events'))
+
+
+@pytest.fixture
+def tests_dir(tmpdir, events_file):
+    returned = tmpdir.join('tests')
+    log_source = _LOG_SOURCE.format(events_file=events_file)
+    returned.join('a', 'slashconf.py').write(log_source + """
+@slash.fixture(scope='directory')
+def pool():
+    _log('pool setup')
+    slash.context.fixture.add_cleanup(lambda: _log('pool teardown'))
+    return 'pool'
+""", ensure=True)
+    for name in ('test_a1.py', 'test_a2.py', 'nested/test_a3.py'):
+        returned.join('a', name).write(log_source + """
+def test_pool(pool):
+    _log('pool test')
+""", ensure=True)
+    returned.join('b', 'test_b1.py').write(log_source + """
+def test_b1():
+    _log('test_b1')
+    slash.add_cleanup(lambda: _log('directory cleanup'), scope='directory')
+""", ensure=True)
+    returned.join('c', 'test_c1.py').write(log_source + """
+def test_other():
+    _log('other test')
+""", ensure=True)
+    return str(returned)
+
+
+_LOG_SOURCE = """
+import slash
+
+def _log(event):
+    with open({events_file!r}, 'a') as f:
+        f.write(event + '\\n')
+"""
+
+_CLASSES_SOURCE = _LOG_SOURCE + """
+import itertools
+
+_counter = itertools.count(1)
+
+@slash.fixture(scope='class')
+def class_fixture():
+    index = next(_counter)
+    _log('setup {{}}'.format(index))
+    slash.context.fixture.add_cleanup(lambda: _log('teardown {{}}'.format(index)))
+    return index
+
+class First(slash.Test):
+    def test_1(self, class_fixture):
+        _log('First.test_1')
+        slash.add_cleanup(lambda: _log('class cleanup'), scope='class')
+    def test_2(self, class_fixture):
+        _log('First.test_2')
+
+class Second(slash.Test):
+    def test_1(self, class_fixture):
+        _log('Second.test_1')
+        slash.add_cleanup(lambda: _log('class cleanup'), scope='class')
+    def test_2(self, class_fixture):
+        _log('Second.test_2')
+
+def test_function(class_fixture):
+    _log('test_function')
+"""
@@ -6,9 +6,10 @@ import emport
 
 import dessert
 import pytest
+import slash
 from slash.core.error import Error
 
-from .utils import without_pyc
+from .utils import make_runnable_tests, without_pyc
 
 
 def test_error_exception_str_repr(error):
@@ -93,6 +94,93 @@ def test_error_mark_fatal(error):
     assert rv is error
     assert error.is_fatal()
 
+def test_traceback_distilled_on_first_access(error):
+    # pylint: disable=protected-access
+    assert error._frames is not None
+    assert error.traceback.frames[-1].func_name == 'func_3'
+    assert error._frames is None
+
+
+def test_traceback_set_explicitly(error):
+    # pylint: disable=protected-access
+    other = Error('other')
+    error.traceback = other.traceback
+    assert error._frames is None
+    assert error.traceback is other.traceback
+    error.traceback = None
+    assert error.traceback is None
+
+
+def test_traceback_not_distilled_when_logged(tmpdir, config_override):
+    # pylint: disable=protected-access
+    config_override('log.root', str(tmpdir.join('logs')))
+    pending = []
+
+    def test_something():
+        try:
+            func_1()
+        except NotImplementedError:
+            error = slash.add_error()
+        # the frames of the functions which raised have returned, and are distilled only when needed
+        pending.append(error._frames is not None)
+
+    with slash.Session() as session:
+        with session.get_started_context():
+            slash.runner.run_tests(make_runnable_tests(test_something))
+
+    assert pending == [True]
+    [result] = session.results.iter_test_results()
+    with open(result.get_log_path()) as f:
+        log = f.read()
+    assert 'Error added' in log
+    assert ', in test_something' in log
+    assert ', in func_3' in log
+
+
+def test_running_frames_distilled_when_error_added():
+    errors = []
+
+    def test_something():
+        for i in range(3):  # pylint: disable=unused-variable
+            errors.append(slash.add_error('bad {0}'.format(i)))
+            try:
+                func_1()
+            except NotImplementedError:
+                errors.append(slash.add_error())
+
+    with slash.Session() as session:
+        with session.get_started_context():
+            slash.runner.run_tests(make_runnable_tests(test_something))
+
+    for index, error in enumerate(errors):
+        [test_frame] = [frame for frame in error.traceback.frames if frame.func_name == 'test_something']
+        assert test_frame.locals['i'] == {'value': repr(index // 2)}
+
+
+def test_manual_error_lines_recorded_when_added():
+    def func():
+        returned = Error('some_error')
+        line = 'after error'
+        return returned, line
+
+    err, _ = func()
+    assert err.cause.func_name == 'func'
+    assert err.cause.code_line.strip() == "returned = Error('some_error')"
+    # variables are captured when the error is added, not when its traceback is first used
+    assert 'line' not in err.cause.locals
+
+
+def test_traceback_frames_max_age(config_override):
+    # pylint: disable=protected-access
+    config_override('log.traceback_frames_max_age', 0)
+    try:
+        raise RuntimeError()
+    except RuntimeError:
+        err = Error.capture_exception()
+    assert err._frames is None
+    assert err.traceback.frames[-1].func_name == 'test_traceback_frames_max_age'
+
+
 ####
 
 
@@ -53,6 +53,72 @@ def test_fixture_namespaces(tmpdir):
 
     run_tests_assert_success([str(root_dir)])
 
+def test_namespaces_shared_by_key():
+    with slash.Session() as s:
+        store = s.fixture_store
+        with store.new_namespace_context(key='a') as is_new:
+            assert is_new
+            first = store.get_current_namespace()
+        with store.new_namespace_context(key='a') as is_new:
+            assert not is_new
+            assert store.get_current_namespace() is first
+        with store.new_namespace_context(key='b') as is_new:
+            assert is_new
+            assert store.get_current_namespace() is not first
+        with store.new_namespace_context() as is_new:
+            assert is_new
+            assert store.get_current_namespace() is not first
+
+
+def test_slashconf_fixtures_shared_between_files(tmpdir):
+    root_dir = tmpdir.join('tests')
+
+    with _into(root_dir.join('slashconf.py')) as writeln:
+        _write_fixture1(writeln)
+
+    for dir_name in ('a', 'b'):
+        with _into(root_dir.join(dir_name, 'test_something.py')) as writeln:
+            writeln('def test_something(fixture1):')
+            writeln('    pass')
+
+    with _into(root_dir.join('b', 'test_override.py')) as writeln:
+        writeln('import slash')
+        writeln('@slash.fixture')
+        writeln('def fixture1():')
+        writeln('    return "overridden"')
+        writeln('def test_override(fixture1):')
+        writeln('    assert fixture1 == "overridden"')
+
+    with _into(root_dir.join('b', 'test_not_overridden.py')) as writeln:
+        writeln('def test_not_overridden(fixture1):')
+        writeln('    assert fixture1 is None')
+
+    session = run_tests_assert_success([str(root_dir)])
+    assert session.results.get_num_successful() == 4
+
+
+def test_needed_parametrizations_of_deep_fixture_graphs():
+    # every fixture depends on the three before it, making the number of paths through the graph exponential
+    with slash.Session() as s:
+        fixtures = []
+        for index in range(60):
+            fixtures.append(_make_fixture(s.fixture_store, index, fixtures[-3:]))
+        s.fixture_store.resolve()
+        last = s.fixture_store.get_fixture_by_id(fixtures[-1].__slash_fixture__.id)
+        [param_id] = s.fixture_store.get_all_needed_fixture_ids(last)
+        assert s.fixture_store.get_fixture_by_id(param_id).values == [[1], [2]]
+
+
+def _make_fixture(store, index, needed):
+    needed_names = [func.__name__ for func in needed]
+    if needed_names:
+        func = eval('lambda {0}: None'.format(', '.join(needed_names)))  # pylint: disable=eval-used
+    else:
+        func = slash.parametrize('param', [1, 2])(lambda param: None)
+    func.__name__ = 'fixture{0}'.format(index)
+    return store.add_fixture(slash.fixture(name=func.__name__)(func))
+
+
 def _write_fixture1(writeln):
     writeln('import slash')
 
@@ -0,0 +1,108 @@
+# pylint: disable=redefined-outer-name
+import pytest
+import slash
+from slash.core.ordering import group_by_fixture_parameters
+from slash.frontend.slash_run import slash_run
+
+from .utils import NullFile
+
+
+def test_fixture_not_torn_down_without_grouping(tests_file, events_file):
+    _run(tests_file)
+    events = _get_events(events_file)
+    # without the option, teardown behaviour is unchanged: the fixture is set up once for the module
+    assert [event for event in events if not event.startswith('test')] == ['setup 1', 'teardown 1']
+
+
+def test_fixture_set_up_again_when_parameters_change(tests_file, events_file, config_override):
+    config_override('run.group_by_fixture_parameters', True)
+    with slash.Session() as session:
+        tests = slash.loader.Loader().get_runnables(tests_file)
+        # running in the loaded order, consecutive tests alternate between the values of the fixture
+        tests.sort(key=lambda test: _get_params(test)[::-1] if _get_params(test) else ())
+        with session.get_started_context():
+            slash.runner.run_tests(tests)
+    assert session.results.is_success()
+    assert _get_events(events_file) == [
+        'test_other',
+        'setup 1', 'test 1 a', 'teardown 1',
+        'setup 2', 'test 2 a', 'teardown 2',
+        'setup 1', 'test 1 b', 'teardown 1',
+        'setup 2', 'test 2 b', 'teardown 2',
+    ]
+
+
+def test_grouping_sets_up_each_value_once(tests_file, events_file):
+    _run(tests_file, '--group-by-fixture-params')
+    assert _get_events(events_file) == [
+        'test_other',
+        'setup 1', 'test 1 a', 'test 1 b', 'teardown 1',
+        'setup 2', 'test 2 a', 'test 2 b', 'teardown 2',
+    ]
+
+
+def test_grouping_keeps_modules_together(tmpdir, events_file):
+    for module_name in ('a', 'b'):
+        tmpdir.join('test_{0}.py'.format(module_name)).write(_TESTS_SOURCE.format(events_file=events_file))
+    with slash.Session():
+        tests = slash.loader.Loader().get_runnables(str(tmpdir))
+        grouped = group_by_fixture_parameters(tests)
+    assert sorted(grouped, key=id) == sorted(tests, key=id)
+    module_names = [test.__slash__.module_name for test in grouped]
+    assert module_names == sorted(module_names)
+    for module_name in set(module_names):
+        assert [_get_params(test) for test in grouped if test.__slash__.module_name == module_name] == [
+            None, (1, 'a'), (1, 'b'), (2, 'a'), (2, 'b')]
+
+
+def _get_params(test):
+    variation = test.get_variation()
+    if not variation:
+        return None
+    return (variation.values['module_fixture.value'], variation.values['x'])
+
+
+def _run(tests_file, *args):
+    app = slash_run([tests_file] + list(args), report_stream=NullFile())
+    assert app.exit_code == 0
+    assert app.session.results.get_num_successful() == 5
+
+
+def _get_events(events_file):
+    with open(events_file) as f:
+        return f.read().splitlines()
+
+
+@pytest.fixture
+def events_file(tmpdir):
+    return str(tmpdir.join('events'))
+
+
+@pytest.fixture
+def tests_file(tmpdir, events_file):
+    returned = tmpdir.join('test_grouping.py')
+    returned.write(_TESTS_SOURCE.format(events_file=events_file))
+    return str(returned)
+
+
+_TESTS_SOURCE = """
+import slash
+
+def _log(event):
+    with open({events_file!r}, 'a') as f:
+        f.write(event + '\\n')
+
+@slash.fixture(scope='module')
+@slash.parametrize('value', [1, 2])
+def module_fixture(value):
+    _log('setup {{}}'.format(value))
+    slash.context.fixture.add_cleanup(lambda: _log('teardown {{}}'.format(value)))
+    return value
+
+@slash.parametrize('x', ['a', 'b'])
+def test_something(module_fixture, x):
+    _log('test {{}} {{}}'.format(module_fixture, x))
+
+def test_other():
+    _log('test_other')
+"""
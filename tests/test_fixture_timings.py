@@ -0,0 +1,128 @@
+# pylint: disable=unused-argument, unused-variable
+import json
+import time
+
+import pytest
+import slash
+from slash._compat import StringIO
+from slash.core.fixtures.timing import FixtureTimings
+from slash.frontend.slash_run import slash_run
+
+from .utils import make_runnable_tests
+
+
+def test_fixture_timings_recorded_per_test(config_override):
+    config_override('run.fixture_timing_details', True)
+
+    def test_something(fixture):
+        pass
+
+    with slash.Session() as session:
+        @session.fixture_store.add_fixture
+        @slash.fixture
+        @slash.parametrize('param', [1, 2])
+        def fixture(this, param):
+            time.sleep(0.01)
+            this.add_cleanup(lambda: time.sleep(0.02))
+
+        _run(session, test_something)
+
+    for index, result in enumerate(session.results.iter_test_results()):
+        setup, teardown = result.details.all()['fixture_timings']
+        assert setup['fixture'] == teardown['fixture'] == 'fixture'
+        assert setup['scope'] == teardown['scope'] == 'test'
+        assert setup['params'] == {'fixture.param': repr(index + 1)}
+        assert (setup['phase'], teardown['phase']) == ('setup', 'teardown')
+        assert setup['duration'] >= 0.01
+        assert teardown['duration'] >= 0.02
+
+    summaries = session.fixture_store.timings.get_summaries()
+    assert len(summaries) == 2
+    assert all(summary.num_setups == summary.num_teardowns == 1 for summary in summaries)
+
+
+def test_fixture_timing_details_off_by_default():
+
+    def test_something(fixture):
+        pass
+
+    with slash.Session() as session:
+        @session.fixture_store.add_fixture
+        @slash.fixture
+        def fixture():
+            pass
+
+        _run(session, test_something)
+
+    [result] = session.results.iter_test_results()
+    assert 'fixture_timings' not in result.details.all()
+    [summary] = session.fixture_store.timings.get_summaries()
+    assert summary.num_setups == 1
+
+
+def test_fixture_timings_aggregated():
+    timings = FixtureTimings()
+    timings.add('cheap', 'test', {}, 'setup', 1)
+    for _ in range(3):
+        timings.add('expensive', 'session', {'x': '1'}, 'setup', 2)
+        timings.add('expensive', 'session', {'x': '1'}, 'teardown', 1)
+    timings.add('expensive', 'session', {'x': '2'}, 'setup', 1.5)
+    [first, second, third] = timings.get_summaries()
+    assert (first.get_description(), first.num_setups, first.get_total_duration()) == ('expensive(x=1)', 3, 9)
+    assert second.get_description() == 'expensive(x=2)'
+    assert third.get_description() == 'cheap'
+    assert timings.get_total_duration() == 11.5
+    assert [fixture['name'] for fixture in timings.to_dict()['fixtures']] == ['expensive', 'expensive', 'cheap']
+
+
+def test_fixture_timings_merged():
+    timings = FixtureTimings()
+    timings.add('fixture', 'module', {'x': '1'}, 'setup', 1)
+    other = FixtureTimings()
+    other.add('fixture', 'module', {'x': '1'}, 'setup', 2)
+    other.add('fixture', 'module', {'x': '1'}, 'teardown', 0.5)
+    other.add('other', 'test', {}, 'setup', 0.25)
+    timings.merge(other.to_dict()['fixtures'])
+    [first, second] = timings.get_summaries()
+    assert (first.name, first.num_setups, first.num_teardowns, first.get_total_duration()) == ('fixture', 2, 1, 3.5)
+    assert (second.name, second.params) == ('other', {})
+
+
+@pytest.mark.parametrize('parallel', [False, True])
+def test_slowest_fixtures_reported(tmpdir, parallel):
+    tmpdir.join('test_something.py').write("""
+import slash
+import time
+
+@slash.fixture(scope='module')
+def slow_fixture():
+    time.sleep(0.05)
+
+def test_1(slow_fixture):
+    pass
+
+def test_2(slow_fixture):
+    pass
+""")
+    timings_path = tmpdir.join('timings.json')
+    report_stream = StringIO()
+    args = [str(tmpdir.join('test_something.py')), '--slowest-fixtures', '5', '--fixture-timings-file', str(timings_path)]
+    if parallel:
+        # both tests run in the same worker, along with their module fixture
+        args.extend(['-j', '1'])
+    app = slash_run(args, report_stream=report_stream)
+    assert app.exit_code == 0
+    output = report_stream.getvalue()
+    assert 'Slowest Fixtures' in output
+    assert 'slow_fixture' in output
+    [fixture] = json.loads(timings_path.read())['fixtures']
+    assert fixture['name'] == 'slow_fixture'
+    assert fixture['scope'] == 'module'
+    assert fixture['num_setups'] == fixture['num_teardowns'] == 1
+    assert fixture['setup_duration'] >= 0.05
+
+
+def _run(session, *test_funcs):
+    session.fixture_store.resolve()
+    with session.get_started_context():
+        slash.runner.run_tests([test for func in test_funcs for test in make_runnable_tests(func)])
@@ -0,0 +1,214 @@
+# pylint: disable=redefined-outer-name, unused-variable
+import os
+import sys
+import time
+
+import pytest
+import slash
+from slash.core.fixtures.value_cache import FixtureValueCache, get_fixture_value_cache
+from slash.exceptions import FixtureException, InvalidFixtureScope
+from slash.frontend.slash_run import slash_run
+from sentinels import NOTHING
+
+from .utils import NullFile
+
+
+def test_value_restored_in_later_sessions(tests_file, computations_file):
+    for size in (1, 2, 1, 2):
+        _run(tests_file, size)
+    # values are cached per parameter value
+    assert _get_computations(computations_file) == ['1', '2']
+
+
+def test_clear_fixture_cache(tests_file, computations_file):
+    _run(tests_file, 1)
+    assert len(get_fixture_value_cache()) == 1
+    _run(tests_file, 1, '--clear-fixture-cache')
+    assert _get_computations(computations_file) == ['1', '1']
+
+
+def test_invalidation_key(tests_file, computations_file):
+    _run(tests_file, 1)
+    with open(tests_file, 'a') as f:
+        f.write('\nINVALIDATION_KEY = "2"\n')
+    _run(tests_file, 1)
+    assert _get_computations(computations_file) == ['1', '1']
+
+
+def test_non_session_fixture_cannot_be_cached():
+    with pytest.raises(InvalidFixtureScope):
+        @slash.fixture(scope='module', cache=True)
+        def fixture():
+            pass
+
+
+def test_yield_fixture_cannot_be_cached():
+    with pytest.raises(FixtureException):
+        @slash.fixture(scope='session', cache=True)
+        def fixture():
+            yield
+
+
+def test_values_keyed_by_parameter_values(tmpdir, computations_file, config_override):
+    config_override('run.fixture_cache_path', str(tmpdir.join('fixture_cache')))
+    params_file = tmpdir.join('dataset_params.py')
+    path = tmpdir.join('test_external_params.py')
+    path.write(_EXTERNAL_PARAMS_SOURCE.format(computations_file=computations_file, params_dir=str(tmpdir)))
+    for params in ([(1, 2)], [(1, 2)], [(1, 3)]):
+        # the parameter values change without the fixture's source changing
+        params_file.write('PARAMS = {0!r}\n'.format(params))
+        _run(str(path), 0)
+        sys.modules.pop('dataset_params', None)
+    assert _get_computations(computations_file) == ['(1,2)', '(1,3)']
+
+
+def test_dependency_source_change_invalidates_value(tmpdir, computations_file, config_override):
+    config_override('run.fixture_cache_path', str(tmpdir.join('fixture_cache')))
+    path = tmpdir.join('test_cached_dependency.py')
+    for base_value in (1, 1, 2):
+        path.write(_DEPENDENCY_SOURCE.format(computations_file=computations_file, base_value=base_value))
+        _run(str(path), 0)
+    assert _get_computations(computations_file) == ['1', '2']
+
+
+def test_fixture_adding_cleanups_cannot_be_cached(tmpdir, computations_file, config_override):
+    config_override('run.fixture_cache_path', str(tmpdir.join('fixture_cache')))
+    path = tmpdir.join('test_cached_cleanup.py')
+    path.write(_CLEANUP_SOURCE.format(computations_file=computations_file))
+    app = slash_run([str(path)], report_stream=NullFile())
+    assert app.exit_code != 0
+    [result] = app.session.results.iter_test_results()
+    [error] = result.get_errors()
+    assert error.exception_type is FixtureException
+    # the cleanup still runs, but the value is not cached
+    assert _get_computations(computations_file) == ['computed', 'cleaned_up']
+    assert len(get_fixture_value_cache()) == 0
+
+
+def test_eviction_by_number_of_entries(tmpdir):
+    cache = FixtureValueCache(str(tmpdir.join('cache')), max_entries=2)
+    for index, key in enumerate(['a', 'b', 'c']):
+        cache.store(key, index)
+        os.utime(cache._get_entry_path(key), (index, index))  # pylint: disable=protected-access
+    # using an entry makes it the most recently used one
+    assert cache.get('b') == 1
+    cache.store('d', 3)
+    assert cache.get('a') is NOTHING
+    assert cache.get('c') is NOTHING
+    assert cache.get('b') == 1
+    assert cache.get('d') == 3
+
+
+def test_eviction_by_age(tmpdir):
+    cache = FixtureValueCache(str(tmpdir.join('cache')), max_age_days=1)
+    cache.store('old', 1)
+    two_days_ago = time.time() - 2 * 24 * 60 * 60
+    os.utime(cache._get_entry_path('old'), (two_days_ago, two_days_ago))  # pylint: disable=protected-access
+    cache.store('new', 2)
+    assert cache.get('old') is NOTHING
+    assert cache.get('new') == 2
+
+
+def _run(tests_file, size, *args):
+    address = '{0}:test_dataset(dataset.size={1})'.format(tests_file, size) if size else tests_file
+    app = slash_run([address] + list(args), report_stream=NullFile())
+    assert app.exit_code == 0
+    assert app.session.results.get_num_successful() == 1
+    # test files are imported again in each session
+    for module_name, module in list(sys.modules.items()):
+        if getattr(module, '__file__', None) == tests_file:
+            sys.modules.pop(module_name)
+
+
+def _get_computations(computations_file):
+    with open(computations_file) as f:
+        return f.read().split()
+
+
+@pytest.fixture
+def computations_file(tmpdir):
+    return str(tmpdir.join('computations'))
+
+
+@pytest.fixture
+def tests_file(tmpdir, computations_file, config_override):
+    config_override('run.fixture_cache_path', str(tmpdir.join('fixture_cache')))
+    returned = tmpdir.join('test_cached_fixture.py')
+    returned.write(_TESTS_SOURCE.format(computations_file=computations_file))
+    return str(returned)
+
+
+_TESTS_SOURCE = """
+import slash
+
+INVALIDATION_KEY = "1"
+
+@slash.fixture(scope='session', cache=lambda: INVALIDATION_KEY)
+@slash.parametrize('size', [1, 2])
+def dataset(size):
+    with open({computations_file!r}, 'a') as f:
+        f.write('{{}}\\n'.format(size))
+    return list(range(size))
+
+def test_dataset(dataset):
+    assert dataset == list(range(len(dataset)))
+"""
+
+
+_EXTERNAL_PARAMS_SOURCE = """
+import sys
+
+import slash
+
+sys.path.insert(0, {params_dir!r})
+try:
+    from dataset_params import PARAMS
+finally:
+    sys.path.pop(0)
+
+@slash.fixture(scope='session', cache=True)
+@slash.parametrize('pair', PARAMS)
+def dataset(pair):
+    with open({computations_file!r}, 'a') as f:
+        f.write('({{0}},{{1}})\\n'.format(*pair))
+    return list(pair)
+
+def test_dataset(dataset):
+    pass
+"""
+
+
+_DEPENDENCY_SOURCE = """
+import slash
+
+@slash.fixture(scope='session')
+def base():
+    return {base_value}
+
+@slash.fixture(scope='session', cache=True)
+def dataset(base):
+    with open({computations_file!r}, 'a') as f:
+        f.write('{{0}}\\n'.format(base))
+    return [base]
+
+def test_dataset(dataset):
+    pass
+"""
+
+
+_CLEANUP_SOURCE = """
+import slash
+
+def _write(text):
+    with open({computations_file!r}, 'a') as f:
+        f.write(text + '\\n')
+
+@slash.fixture(scope='session', cache=True)
+def dataset(this):
+    _write('computed')
+    this.add_cleanup(lambda: _write('cleaned_up'))
+    return []
+
+def test_dataset(dataset):
+    pass
+"""
@@ -7,7 +7,7 @@ from slash import start_interactive_shell
 def test_interactive_test(forge, suite, checkpoint):
 
     def _interact(*_, **__):  # pylint: disable=unused-argument
-        assert slash.context.session.scope_manager.get_current_stack() == ['session', 'module', 'test']
+        assert slash.context.session.scope_manager.get_current_stack() == ['session', 'directory', 'module', 'class', 'test']
         assert slash.context.test.__slash__.is_interactive()
         checkpoint()
 
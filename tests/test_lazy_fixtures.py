@@ -0,0 +1,120 @@
+# pylint: disable=unused-argument, unused-variable
+import pytest
+import slash
+from slash._compat import PY2
+from slash.core.fixtures.lazy_value import LazyFixtureValue, is_computed
+
+from .utils import make_runnable_tests
+
+pytestmark = pytest.mark.skipif(PY2, reason='Lazy fixtures rely on function argument annotations')
+
+
+def test_lazy_fixture_not_computed_if_unused():
+    events = []
+
+    def test_something(fixture, other):
+        events.append('test')
+        if other:
+            events.append('accessing')
+            assert fixture.value == 'value'
+
+    _annotate(test_something, fixture=slash.lazy())
+
+    with slash.Session() as session:
+        _add_fixtures(session, events)
+
+        @session.fixture_store.add_fixture
+        @slash.fixture
+        @slash.parametrize('value', [False, True])
+        def other(value):
+            return value
+
+        _run(session, test_something)
+
+    assert session.results.is_success(allow_skips=False)
+    assert events == ['test', 'test', 'accessing', 'dependency', 'fixture', 'fixture teardown']
+
+
+def test_lazy_fixture_alias():
+    values = []
+
+    def test_something(f):
+        assert not is_computed(f)
+        values.append(f.value)
+        values.append(f.value)
+
+    _annotate(test_something, f=slash.lazy('fixture'))
+
+    with slash.Session() as session:
+        _add_fixtures(session, [])
+        _run(session, test_something)
+
+    assert session.results.is_success(allow_skips=False)
+    assert values == ['value', 'value']
+
+
+def test_lazy_fixture_error_fails_test():
+
+    def test_something(fixture):
+        fixture.value  # pylint: disable=pointless-statement
+
+    _annotate(test_something, fixture=slash.lazy())
+
+    with slash.Session() as session:
+        @session.fixture_store.add_fixture
+        @slash.fixture
+        def fixture():
+            1 / 0  # pylint: disable=pointless-statement
+
+        _run(session, test_something)
+
+    [result] = session.results.iter_test_results()
+    [error] = result.get_errors()
+    assert error.exception_type is ZeroDivisionError
+
+
+def test_lazy_value_forwarding():
+    value = LazyFixtureValue(lambda: [1, 2])
+    assert not is_computed(value)
+    assert repr(value) == '<Lazy fixture value (not computed yet)>'
+    assert value == [1, 2]
+    assert is_computed(value)
+    assert isinstance(value, list)
+    assert len(value) == 2
+    assert value + [3] == [1, 2, 3]
+    assert [0] + value == [0, 1, 2]
+    assert 2 in value
+    value.append(3)
+    assert value[-1] == 3
+
+
+class _Value(object):
+
+    def __init__(self, value):
+        super(_Value, self).__init__()
+        self.value = value
+
+
+def _add_fixtures(session, events):
+
+    @session.fixture_store.add_fixture
+    @slash.fixture
+    def dependency():
+        events.append('dependency')
+
+    @session.fixture_store.add_fixture
+    @slash.fixture
+    def fixture(this, dependency):
+        events.append('fixture')
+        this.add_cleanup(lambda: events.append('fixture teardown'))
+        return _Value('value')
+
+
+def _annotate(func, **annotations):
+    func.__annotations__.update(annotations)
+
+
+def _run(session, *test_funcs):
+    session.fixture_store.resolve()
+    with session.get_started_context():
+        slash.runner.run_tests([test for func in test_funcs for test in make_runnable_tests(func)])
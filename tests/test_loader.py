@@ -115,3 +115,108 @@ def test_import_errors_with_session():
 
 
     return suite
+
+
+@pytest.mark.parametrize('selector,expected', [
+    ('test_1(param=3)', [('test_1', {'param': 3})]),
+    ('test_2(a=1,b=y)', [('test_2', {'a': 1, 'b': 'y'})]),
+    ('test_2(b=x)', [('test_2', {'a': 1, 'b': 'x'}), ('test_2', {'a': 2, 'b': 'x'})]),
+    ('SomeTest.test_method(param=2)', [('test_method', {'param': 2})]),
+    ('test_3(pair=(3, 4))', [('test_3', {'pair': (3, 4), 'name': 'a,b'}), ('test_3', {'pair': (3, 4), 'name': 'c'})]),
+    ("test_3(pair=(1, 2),name='a,b')", [('test_3', {'pair': (1, 2), 'name': 'a,b'})]),
+    ('test_3(pair=pair1,name=c)', [('test_3', {'pair': (3, 4), 'name': 'c'})]),
+    ('OtherTest.test_method(before:x=2,pair=(1, 2))', [('test_method', {'before:x': 2, 'pair': (1, 2)})]),
+    ('OtherTest.test_method(before:x=1)', [('test_method', {'before:x': 1, 'pair': (1, 2)}),
+                                           ('test_method', {'before:x': 1, 'pair': (3, 4)})]),
+])
+def test_iter_specific_variation(parametrized_tests_file, selector, expected):
+    with Session():
+        runnables = Loader().get_runnables('{0}:{1}'.format(parametrized_tests_file, selector))
+    assert [(runnable.__slash__.function_name, runnable.get_variation().values) for runnable in runnables] == expected
+
+
+def test_iter_specific_variation_not_found(parametrized_tests_file):
+    with Session():
+        with pytest.raises(CannotLoadTests):
+            Loader().get_runnables('{0}:test_1(param=100)'.format(parametrized_tests_file))
+
+
+def test_iter_specific_factory_generates_only_factory(parametrized_tests_file):
+    with Session():
+        loader = Loader()
+        loader.get_runnables('{0}:test_1'.format(parametrized_tests_file))
+    assert [stats.num_tests for stats in loader.collection_stats.get_files()] == [5]
+
+
+@pytest.mark.parametrize('filter_string,expected', [
+    ('tag:smoke', ['test_smoke', 'test_method']),
+    ('tag:smoke and not test_method', ['test_smoke']),
+    ('tag:smoke or test_1', ['test_1'] * 5 + ['test_smoke', 'test_method']),
+])
+def test_tag_filters_skip_factories(tmpdir, config_override, filter_string, expected):
+    path = tmpdir.join('test_tagged.py')
+    path.write("""
+import slash
+
+@slash.parametrize('param', range(5))
+def test_1(param):
+    pass
+
+@slash.tag('smoke')
+def test_smoke():
+    pass
+
+class SomeTest(slash.Test):
+    @slash.tag('smoke')
+    def test_method(self):
+        pass
+
+    @slash.parametrize('param', range(5))
+    def test_other_method(self, param):
+        pass
+""")
+    config_override('run.filter_strings', [filter_string])
+    with Session():
+        loader = Loader()
+        runnables = loader.get_runnables(str(path))
+    assert sorted(runnable.__slash__.function_name for runnable in runnables) == sorted(expected)
+    if 'test_1' not in expected:
+        # test_1 is skipped without generating its variations, while SomeTest has a matching method
+        assert [stats.num_tests for stats in loader.collection_stats.get_files()] == [7]
+
+
+@pytest.fixture
+def parametrized_tests_file(tmpdir):
+    returned = tmpdir.join('test_parametrized.py')
+    returned.write("""
+import slash
+
+@slash.parametrize('param', range(5))
+def test_1(param):
+    pass
+
+@slash.parametrize('a', [1, 2])
+@slash.parametrize('b', ['x', 'y'])
+def test_2(a, b):
+    pass
+
+class SomeTest(slash.Test):
+    @slash.parametrize('param', [1, 2])
+    def test_method(self, param):
+        pass
+
+@slash.parametrize('pair', [(1, 2), (3, 4)])
+@slash.parametrize('name', ['a,b', 'c'])
+def test_3(pair, name):
+    pass
+
+class OtherTest(slash.Test):
+    @slash.parametrize('x', [1, 2])
+    def before(self, x):
+        pass
+
+    @slash.parametrize('pair', [(1, 2), (3, 4)])
+    def test_method(self, pair):
+        pass
+""")
+    return str(returned)
@@ -0,0 +1,216 @@
+# pylint: disable=redefined-outer-name
+import os
+
+import pytest
+import slash
+from slash.frontend.slash_run import slash_run
+from slash.parallel.scheduler import get_work_items
+from slash.resuming import get_tests_to_resume
+
+from xml.etree import ElementTree
+
+from .utils import NullFile
+
+_TESTS_SOURCE = """
+import os
+import slash
+
+def test_success():
+    slash.context.result.details.set('pid', str(os.getpid()))
+
+def test_failure():
+    assert 1 == 2
+
+def test_error():
+    1/0
+
+def test_skip():
+    slash.skip_test('skip reason')
+
+@slash.parametrize('param', range(6))
+def test_parametrized(param):
+    slash.context.result.facts.set('param', param)
+    slash.context.result.details.set('pid', str(os.getpid()))
+"""
+
+
+def test_parallel_run_merges_results(tests_dir):
+    session = _run(tests_dir, '-j', '2')
+    results = session.results
+    assert results.get_num_results() == 10
+    assert results.get_num_successful() == 7
+    assert results.get_num_failures() == 1
+    assert results.get_num_errors() == 1
+    assert results.get_num_skipped() == 1
+    assert not results.is_success(allow_skips=True)
+    assert session.is_complete()
+
+    test_ids = [result.test_metadata.id for result in results.iter_test_results()]
+    assert len(set(test_ids)) == len(test_ids)
+    assert sorted(result.test_metadata.test_index0 for result in results.iter_test_results()) == list(range(10))
+
+    by_name = dict((result.test_metadata.function_name, result) for result in results.iter_test_results())
+    assert by_name['test_failure'].get_failures()[0].is_failure()
+    assert 'ZeroDivisionError' in by_name['test_error'].get_errors()[0].message
+    assert by_name['test_skip'].get_skips() == ['skip reason']
+
+    pids = set(result.details.all()['pid'] for result in results.iter_test_results() if 'pid' in result.details)
+    assert str(os.getpid()) not in pids
+    assert len(pids) == 2
+    assert sorted(result.facts.all()['param'] for result in results.iter_test_results()
+                  if result.test_metadata.function_name == 'test_parametrized') == list(range(6))
+
+
+def test_parallel_run_stop_on_error(tests_dir):
+    session = _run(tests_dir, '-j', '2', '-x')
+    assert not session.is_complete()
+    assert session.results.get_num_not_run() > 0
+
+
+def test_parallel_run_xunit(tests_dir, xunit_filename):
+    _run(tests_dir, '-j', '2')
+    with open(xunit_filename) as f:
+        etree = ElementTree.parse(f)
+    testcases = etree.getroot().findall('testcase')
+    assert len(testcases) == 10
+    assert sum(len(testcase.findall('failure')) for testcase in testcases) == 1
+    assert sum(len(testcase.findall('error')) for testcase in testcases) == 1
+
+
+def test_parallel_run_plugin_hooks_fired_once(tests_dir, tmpdir):
+    events_filename = str(tmpdir.join('events'))
+
+    class CountingPlugin(slash.plugins.PluginInterface):
+
+        def get_name(self):
+            return 'counting'
+
+        def _record(self, event):
+            # workers are separate processes, so events are appended to a file
+            with open(events_filename, 'a') as f:
+                f.write('{0} {1}\n'.format(event, os.getpid()))
+
+        def test_start(self):
+            self._record('test_start')
+
+        def test_end(self):
+            self._record('test_end')
+
+    plugin = CountingPlugin()
+    slash.plugins.manager.install(plugin, activate=True)
+    try:
+        _run(tests_dir, '-j', '2')
+    finally:
+        slash.plugins.manager.uninstall(plugin)
+    with open(events_filename) as f:
+        events = [line.split() for line in f]
+    assert sorted(event for event, _ in events) == ['test_end'] * 10 + ['test_start'] * 10
+    assert set(pid for _, pid in events) == set([str(os.getpid())])
+
+
+def test_parallel_run_resume(tests_dir):
+    session = _run(tests_dir, '-j', '2')
+    to_resume = get_tests_to_resume(session.id)
+    assert sorted(resumed.function_name for resumed in to_resume) == ['test_error', 'test_failure', 'test_skip']
+
+
+def test_parallel_run_deferred_cleanup_error(tmpdir):
+    tmpdir.join('test_deferred.py').write(_DEFERRED_CLEANUP_SOURCE)
+    app = slash_run([str(tmpdir), '-j', '2'], report_stream=NullFile())
+    assert app.exit_code != 0
+    by_name = dict((result.test_metadata.function_name, result) for result in app.session.results.iter_test_results())
+    [error] = by_name['test_deferred_cleanup'].get_errors()
+    assert error.exception_type is ZeroDivisionError
+    assert by_name['test_other'].is_success()
+    assert app.session.results.global_result.is_success()
+
+
+def test_parallel_interactive_not_supported(tests_dir):
+    app = slash_run([tests_dir, '-j', '2', '-i'], report_stream=NullFile())
+    assert app.exit_code != 0
+
+
+def test_scheduler_keeps_module_fixture_values_together(tmpdir):
+    path = tmpdir.join('test_scheduling.py')
+    path.write(_SCHEDULING_SOURCE)
+    with slash.Session():
+        tests = slash.loader.Loader().get_runnables(str(path))
+        work_items = get_work_items(tests)
+
+    assert sorted(index for item in work_items for index in item) == list(range(len(tests)))
+    # 3 module fixture values, each with 2 test fixture values, and a module fixture-free test
+    assert sorted(len(item) for item in work_items) == [1, 2, 2, 2]
+    for item in work_items:
+        module_values = set(tests[index].get_variation().values.get('inner_fixture.module_fixture.value')
+                            for index in item)
+        assert len(module_values) == 1
+
+
+def test_scheduler_balances_by_expected_duration(tmpdir):
+    path = tmpdir.join('test_scheduling.py')
+    path.write(_SCHEDULING_SOURCE)
+    with slash.Session():
+        tests = slash.loader.Loader().get_runnables(str(path))
+        slow_test = [test for test in tests if test.__slash__.function_name == 'test_no_fixtures'][0]
+        durations = dict((test.__slash__.address, 1) for test in tests)
+        durations[slow_test.__slash__.address] = 100
+        work_items = get_work_items(tests, durations)
+
+    assert [tests[index] for index in work_items[0]] == [slow_test]
+
+
+_SCHEDULING_SOURCE = """
+import slash
+
+@slash.fixture(scope='module')
+@slash.parametrize('value', [1, 2, 3])
+def module_fixture(value):
+    return value
+
+@slash.fixture
+@slash.parametrize('value', ['a', 'b'])
+def inner_fixture(value, module_fixture):
+    return value
+
+def test_with_fixtures(inner_fixture):
+    pass
+
+def test_no_fixtures():
+    pass
+"""
+
+_DEFERRED_CLEANUP_SOURCE = """
+import time
+import slash
+
+def test_deferred_cleanup():
+    def cleanup():
+        # still running when the worker runs out of tests
+        time.sleep(0.5)
+        1/0
+    slash.add_cleanup(cleanup, deferred=True)
+
+def test_other():
+    pass
+"""
+
+
+def _run(tests_dir, *args):
+    app = slash_run([tests_dir] + list(args), report_stream=NullFile())
+    assert app.session is not None
+    return app.session
+
+
+@pytest.fixture
+def tests_dir(tmpdir):
+    tmpdir.join('test_parallel_file.py').write(_TESTS_SOURCE)
+    return str(tmpdir)
+
+
+@pytest.fixture
+def xunit_filename(tmpdir, request):
+    returned = str(tmpdir.join('xunit.xml'))
+    slash.plugins.manager.activate('xunit')
+    slash.config.root.plugin_config.xunit.filename = returned
+    request.addfinalizer(lambda: slash.plugins.manager.deactivate('xunit'))
+    return returned
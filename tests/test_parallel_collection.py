@@ -0,0 +1,96 @@
+# pylint: disable=redefined-outer-name
+import os
+
+import pytest
+import slash
+from slash._compat import StringIO
+from slash.core.collection_cache import CachedTest
+from slash.frontend.slash_list import slash_list
+from slash.frontend.slash_run import slash_run
+
+from .utils import NullFile
+
+
+def test_parallel_collection_preserves_order(tests_dir):
+    serial = _get_addresses(tests_dir)
+    assert _get_addresses(tests_dir, collection_workers=2) == serial
+
+
+def test_parallel_collection_imports_in_workers(tests_dir):
+    with slash.Session():
+        loader = slash.loader.Loader(prefer_cached=True, collection_workers=2)
+        tests = loader.get_runnables(tests_dir)
+    assert len(tests) == 5
+    assert all(isinstance(test, CachedTest) for test in tests)
+    files = loader.collection_stats.get_files()
+    assert sorted(os.path.basename(stats.file_path) for stats in files) == ['test_a.py', 'test_b.py']
+    assert all(stats.in_worker for stats in files)
+
+
+def test_parallel_collection_unused_for_runnable_tests(tests_dir):
+    with slash.Session():
+        loader = slash.loader.Loader(collection_workers=2)
+        tests = loader.get_runnables(tests_dir)
+    assert len(tests) == 5
+    assert not any(isinstance(test, CachedTest) for test in tests)
+    # every file has to be imported in order to run its tests, so the worker pool is not used
+    assert not any(stats.in_worker for stats in loader.collection_stats.get_files())
+
+
+def test_slash_list_parallel_collection(tests_dir):
+    serial, parallel = StringIO(), StringIO()
+    assert slash_list([tests_dir, '--only-tests'], report_stream=serial) == 0
+    assert slash_list([tests_dir, '--only-tests', '--parallel-collection', '2'], report_stream=parallel) == 0
+    assert parallel.getvalue() == serial.getvalue()
+    assert 'test_b_1' in parallel.getvalue()
+
+
+def test_slash_list_parallel_collection_requires_only_tests(tests_dir):
+    with pytest.raises(SystemExit):
+        slash_list([tests_dir, '--parallel-collection', '2'], error_stream=NullFile())
+
+
+def test_slash_list_parallel_collection_import_error(tests_dir):
+    with open(os.path.join(tests_dir, 'test_c.py'), 'w') as f:
+        f.write('1/0\n')
+    assert slash_list([tests_dir, '--only-tests', '--parallel-collection', '2'],
+                      report_stream=NullFile(), error_stream=NullFile()) != 0
+
+
+def test_dump_collection_stats(tests_dir):
+    report_stream = StringIO()
+    app = slash_run([tests_dir, '--dump-collection-stats'], report_stream=report_stream)
+    assert app.exit_code == 0
+    output = report_stream.getvalue()
+    assert 'Collection Statistics' in output
+    assert os.path.join(tests_dir, 'test_b.py') in output
+
+
+def _get_addresses(tests_dir, **kwargs):
+    with slash.Session():
+        loader = slash.loader.Loader(prefer_cached=True, **kwargs)
+        return [test.__slash__.address for test in loader.get_runnables(tests_dir)]
+
+
+@pytest.fixture
+def tests_dir(tmpdir):
+    returned = tmpdir.join('tests')
+    returned.join('test_a.py').write(_TEST_FILE_TEMPLATE.format(name='a'), ensure=True)
+    returned.join('test_b.py').write(_TEST_FILE_TEMPLATE.format(name='b') + """
+class SomeTest(slash.Test):
+    def test_method(self):
+        pass
+
+@slash.parametrize('param', [2, 1])
+def test_b_1(param):
+    pass
+""")
+    return str(returned)
+
+
+_TEST_FILE_TEMPLATE = """
+import slash
+
+def test_{name}():
+    pass
+"""
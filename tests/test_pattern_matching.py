@@ -67,6 +67,22 @@ def test_matches_values():
     assert not Matcher('tag:bla=bye').matches(FakeMetadata('something', {'bla': 'hello'}))
 
 
+def test_matches_tags():
+    tags = Tags({'bla': 2})
+    assert Matcher('tag:bla').matches_tags(tags) is True
+    assert Matcher('tag:bloop').matches_tags(tags) is False
+    assert Matcher('not tag:bla').matches_tags(tags) is False
+    assert Matcher('bla').matches_tags(tags) is True
+    assert Matcher('bloop').matches_tags(tags) is None
+    assert Matcher('not bloop').matches_tags(tags) is None
+    assert Matcher('tag:bloop and bla').matches_tags(tags) is False
+    assert Matcher('tag:bloop and xxx').matches_tags(tags) is False
+    assert Matcher('tag:bla and xxx').matches_tags(tags) is None
+    assert Matcher('tag:bloop or xxx').matches_tags(tags) is None
+    assert Matcher('tag:bloop or tag:bla').matches_tags(tags) is True
+    assert Matcher('tag:bloop').matches_tags(NO_TAGS) is False
+
+
 class FakeMetadata(object):
 
     def __init__(self, address, tags=NO_TAGS):
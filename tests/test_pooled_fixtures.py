@@ -0,0 +1,121 @@
+# pylint: disable=unused-argument, unused-variable
+import threading
+import time
+
+import pytest
+import slash
+from slash.core.fixtures.pool import FixturePool
+from slash.exceptions import FixtureException, InvalidFixtureScope
+
+from .utils import make_runnable_tests
+
+
+def test_instances_reused_between_tests():
+    events = []
+    values = []
+
+    def test_something(vm):
+        values.append(vm)
+
+    with slash.Session() as session:
+        @session.fixture_store.add_fixture
+        @slash.pooled_fixture(size=2)
+        def vm(this):
+            index = len(events)
+            events.append('create {0}'.format(index))
+            this.add_cleanup(lambda: events.append('destroy {0}'.format(index)))
+            return index
+
+        _run(session, *[test_something] * 3)
+
+    # a single instance is needed, and it is torn down when the session ends
+    assert events == ['create 0', 'destroy 0']
+    assert values == [0, 0, 0]
+    for result in session.results.iter_test_results():
+        assert result.is_success()
+        assert set(result.details.all()['fixture_lease_wait']) == set(['vm'])
+
+
+def test_prefill():
+    events = []
+
+    def test_something(vm):
+        pass
+
+    with slash.Session() as session:
+        @session.fixture_store.add_fixture
+        @slash.pooled_fixture(size=3, prefill=True)
+        def vm():
+            index = len([event for event in events if event.startswith('create')])
+            events.append('create {0}'.format(index))
+            yield index
+            events.append('destroy {0}'.format(index))
+
+        _run(session, test_something)
+
+    assert events == ['create 0', 'create 1', 'create 2', 'destroy 2', 'destroy 1', 'destroy 0']
+
+
+def test_pool_checkout_is_exclusive():
+    pool = FixturePool(1)
+    instance, wait_time = pool.check_out(lambda: _Instance('a'))
+    assert wait_time < 0.1
+    checked_out = []
+
+    def check_out():
+        checked_out.append(pool.check_out(lambda: _Instance('b')))
+
+    thread = threading.Thread(target=check_out)
+    thread.start()
+    time.sleep(0.2)
+    assert not checked_out
+    pool.check_in(instance)
+    thread.join()
+    [(second_instance, second_wait_time)] = checked_out
+    assert second_instance is instance
+    assert second_wait_time >= 0.2
+    assert len(pool) == 1
+
+    pool.close()
+    assert instance.cleaned_up
+
+
+def test_pooled_fixture_cannot_depend_on_test_fixtures():
+    with slash.Session() as session:
+        @session.fixture_store.add_fixture
+        @slash.fixture
+        def narrow_fixture():
+            pass
+
+        @session.fixture_store.add_fixture
+        @slash.pooled_fixture
+        def vm(narrow_fixture):
+            pass
+
+        with pytest.raises(InvalidFixtureScope):
+            session.fixture_store.resolve()
+
+
+def test_invalid_pool_size():
+    with pytest.raises(FixtureException):
+        @slash.pooled_fixture(size=0)
+        def vm():
+            pass
+
+
+class _Instance(object):
+
+    cleaned_up = False
+
+    def __init__(self, value):
+        super(_Instance, self).__init__()
+        self.value = value
+
+    def do_cleanups(self):
+        self.cleaned_up = True
+
+
+def _run(session, *test_funcs):
+    session.fixture_store.resolve()
+    with session.get_started_context():
+        slash.runner.run_tests([test for func in test_funcs for test in make_runnable_tests(func)])
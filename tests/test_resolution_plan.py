@@ -0,0 +1,85 @@
+# pylint: disable=unused-argument, unused-variable
+import pytest
+import slash
+from slash.core.fixtures.resolution_plan import compile_resolution_plan
+from slash.exceptions import UnknownFixtures
+
+from .utils import make_runnable_tests
+
+
+def test_plan_order():
+    with slash.Session() as s:
+        store = s.fixture_store
+
+        @store.add_fixture
+        @slash.fixture
+        def fixture1():
+            pass
+
+        @store.add_fixture
+        @slash.fixture
+        @slash.parametrize('param', [1, 2])
+        def fixture2(fixture1, param):
+            pass
+
+        @store.add_fixture
+        @slash.fixture
+        def fixture3(fixture2, fixture1):
+            pass
+
+        @store.add_fixture
+        @slash.fixture
+        def fixture4():
+            pass
+
+        store.resolve()
+        plan = compile_resolution_plan(store, ['fixture3', ('alias', 'fixture4'), 'fixture1'],
+                                       store.get_current_namespace())
+
+    assert [(name, fixture.info.name) for name, fixture in plan.arguments] == \
+        [('fixture3', 'fixture3'), ('alias', 'fixture4'), ('fixture1', 'fixture1')]
+    assert [(fixture.info.name, relative_name, [name for name, _ in bindings])
+            for fixture, relative_name, bindings in plan.steps] == [
+                ('fixture1', 'fixture3 -> fixture2 -> fixture1', []),
+                ('fixture2', 'fixture3 -> fixture2', ['fixture1']),
+                ('fixture3', 'fixture3', ['fixture2', 'fixture1']),
+                ('fixture4', 'alias', []),
+            ]
+
+
+def test_plan_compiled_once_per_function(monkeypatch):
+    calls = []
+    values = []
+    with slash.Session() as s:
+        store = s.fixture_store
+        orig_get_required_fixture_names = store.get_required_fixture_names
+
+        def get_required_fixture_names(test_func):
+            calls.append(test_func)
+            return orig_get_required_fixture_names(test_func)
+        monkeypatch.setattr(store, 'get_required_fixture_names', get_required_fixture_names)
+
+        @store.add_fixture
+        @slash.fixture
+        @slash.parametrize('param', [1, 2, 3])
+        def fixture(param):
+            return param * 10
+
+        def test_something(fixture):
+            values.append(fixture)
+
+        store.resolve()
+        tests = make_runnable_tests(test_something)
+        del calls[:]
+        with s.get_started_context():
+            slash.runner.run_tests(tests)
+
+    assert s.results.is_success(allow_skips=False)
+    assert sorted(values) == [10, 20, 30]
+    assert len(calls) == 1
+
+
+def test_plan_unknown_fixture():
+    with slash.Session() as s:
+        with pytest.raises(UnknownFixtures):
+            compile_resolution_plan(s.fixture_store, ['nonexistent'], s.fixture_store.get_current_namespace())
@@ -1,4 +1,5 @@
 import gc
+import os
 
 import pytest
 import slash
@@ -62,6 +63,108 @@ def test_result_summary(suite):
     assert results.get_num_not_run() == 0
 
 
+def test_result_counts_follow_state_changes():
+    # pylint: disable=protected-access
+    with slash.Session() as session:
+        results = session.results
+        results.global_result.mark_started()
+        result = Result()
+        results._register_result('test', result)
+        assert results.get_num_not_run() == 1
+        assert not results.is_success(allow_skips=True)
+
+        result.mark_started()
+        assert (results.get_num_not_run(), results.get_num_started()) == (0, 1)
+        assert not results.is_success()
+        result.mark_finished()
+        assert results.get_num_successful() == 1
+        assert results.is_success()
+
+        result.add_skip('reason')
+        assert results.get_num_skipped() == results.get_num_skipped(include_not_run=False) == 1
+        assert results.get_num_successful() == 0
+        assert results.is_success(allow_skips=True)
+        assert not results.is_success()
+
+        result.add_error('error')
+        assert results.get_num_errors() == 1
+        assert not results.is_success(allow_skips=True)
+
+        assert not results.is_interrupted()
+        result.mark_interrupted()
+        assert results.is_interrupted()
+
+        session.results.global_result.add_error('global error')
+        assert results.get_num_errors() == 2
+
+
+def test_results_query(tmpdir):
+    first_file = tmpdir.join('test_first.py')
+    first_file.write("""
+import slash
+
+@slash.tag('slow')
+def test_fail():
+    assert False
+
+def test_success():
+    pass
+
+@slash.tag('slow')
+def test_error():
+    1 / 0
+""")
+    second_file = tmpdir.join('test_second.py')
+    second_file.write("""
+import slash
+
+@slash.tag('slow')
+def test_success():
+    pass
+
+def test_skip():
+    slash.skip_test('reason')
+""")
+    with slash.Session() as session:
+        with session.get_started_context():
+            slash.runner.run_tests(slash.loader.Loader().get_runnables(str(tmpdir)))
+    results = session.results
+    all_results = list(results.iter_test_results())
+    assert [results[index] for index in range(len(results))] == all_results
+    assert results[-1] is all_results[-1]
+    assert [results.get_position(result) for result in all_results] == list(range(len(all_results)))
+
+    by_name = dict(((os.path.basename(result.test_metadata.file_path), result.test_metadata.factory_name), result)
+                   for result in all_results)
+
+    def _get(*names):
+        return sorted((by_name[name] for name in names), key=all_results.index)
+
+    assert results.query(status='failure') == _get(('test_first.py', 'test_fail'))
+    assert results.query(status=['failure', 'error']) == _get(('test_first.py', 'test_fail'),
+                                                              ('test_first.py', 'test_error'))
+    assert results.query(status='unsuccessful', file_path=str(second_file)) == _get(('test_second.py', 'test_skip'))
+    assert results.query(tag='slow') == _get(('test_first.py', 'test_fail'), ('test_first.py', 'test_error'),
+                                             ('test_second.py', 'test_success'))
+    assert results.query(tag='slow', status='success') == _get(('test_second.py', 'test_success'))
+    assert results.query(factory_name='test_success') == _get(('test_first.py', 'test_success'),
+                                                              ('test_second.py', 'test_success'))
+    assert results.query(factory_name='test_success', file_path=str(first_file)) == \
+        _get(('test_first.py', 'test_success'))
+    assert results.query(tag='nonexistent') == []
+    assert results.query() == all_results
+    assert results.query(status='started') == all_results
+    assert results.query(status=['success', 'skip'], file_path=str(second_file)) == \
+        _get(('test_second.py', 'test_success'), ('test_second.py', 'test_skip'))
+    for status in ('started', 'not_run', 'success', 'error', 'failure', 'skip', 'interrupted', 'unsuccessful'):
+        positions = results._get_positions_by_status(status)  # pylint: disable=protected-access
+        # positions of the common states are derived from the counts and rarer states, rather than built per query
+        assert not isinstance(positions, (set, list)) or status not in ('started', 'success')
+        assert len(positions) == len(set(positions)) == len(results.query(status=status))
+    with pytest.raises(ValueError):
+        results.query(status='nonexistent')
+
+
 def test_result_not_run(suite, suite_test, is_last_test):
     suite_test.when_run.fail()
 
@@ -208,7 +311,7 @@ class SessionResultTest(TestCase):
             result.mark_finished()
         self.result = SessionResults(Session())
         for index, r in enumerate(self.results):
-            self.result._results_dict[index] = r  # pylint: disable=protected-access
+            self.result._register_result(index, r)  # pylint: disable=protected-access
 
     def test_counts(self):
         self.assertEqual(self.result.get_num_results(), len(self.results))
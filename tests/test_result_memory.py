@@ -0,0 +1,47 @@
+# pylint: disable=protected-access
+import gc
+
+import pytest
+import slash
+from slash._compat import PY2
+from slash.core.result import Result, SessionResults
+
+_NUM_RESULTS = 10000
+
+
+@pytest.mark.skipif(PY2, reason='Requires tracemalloc')
+def test_passing_result_memory():
+    import tracemalloc
+
+    with slash.Session() as session:
+        results = SessionResults(session)
+        gc.collect()
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            for index in range(_NUM_RESULTS):
+                result = Result()
+                results._register_result(index, result)
+                result.mark_started()
+                result.mark_finished()
+            per_result = (tracemalloc.get_traced_memory()[0] - before) / float(_NUM_RESULTS)
+        finally:
+            tracemalloc.stop()
+
+    assert results.get_num_successful() == _NUM_RESULTS
+    # dict-backed results with eagerly allocated details and lists took well over 1KB each
+    assert per_result < 600
+
+
+def test_empty_containers_shared():
+    first, second = Result(), Result()
+    assert first._errors is second._errors is first._skips
+    assert first._details is None and first._data is None
+    assert not first.details.all()
+    # reading does not allocate containers either
+    assert first.get_errors() == first.get_failures() == first.get_skips() == []
+    assert first._errors is second._errors is first._skips
+    first.add_skip('reason')
+    assert first.get_skips() == ['reason']
+    assert second.get_skips() == []
+    assert not second.is_skip()
@@ -0,0 +1,146 @@
+# pylint: disable=redefined-outer-name
+import os
+import sys
+import time
+
+import pytest
+import slash
+from slash.utils.rewriting import get_rewritten_code_cache, import_file_rewriting_assertions
+
+
+def test_unchanged_file_is_cache_hit(cache, test_file):
+    _import(test_file)
+    assert (cache.hits, cache.misses) == (0, 1)
+    _import(test_file)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_changed_file_is_cache_miss(cache, test_file):
+    _import(test_file)
+    test_file.write(_SOURCE + '\n# changed\n')
+    _import(test_file)
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+@pytest.mark.parametrize('cached', [False, True])
+def test_assertions_are_rewritten(cache, test_file, cached):
+    if cached:
+        _import(test_file)
+    module = _import(test_file)
+    with pytest.raises(AssertionError) as caught:
+        module.test_something()
+    assert '1 == 2' in str(caught.value)
+
+
+def test_caching_disabled(config_override, test_file):
+    config_override('run.rewritten_code_cache_path', '')
+    assert get_rewritten_code_cache() is None
+    module = _import(test_file)
+    with pytest.raises(AssertionError) as caught:
+        module.test_something()
+    assert '1 == 2' in str(caught.value)
+
+
+def test_loader_uses_cache(cache, test_file):
+    with slash.Session():
+        slash.loader.Loader().get_runnables(str(test_file))
+    assert cache.misses == 1
+    _forget_module(test_file)
+    _import(test_file)
+    assert cache.hits == 1
+
+
+def test_imported_modules_not_cached(cache, tmpdir):
+    tmpdir.join('rewritten_helper.py').write(_HELPER_SOURCE)
+    test_file = tmpdir.join('test_importing.py')
+    test_file.write('from rewritten_helper import check\n')
+    sys.path.insert(0, str(tmpdir))
+    try:
+        module = _import(test_file)
+    finally:
+        sys.path.remove(str(tmpdir))
+        sys.modules.pop('rewritten_helper', None)
+    assert (cache.hits, cache.misses) == (0, 1)
+    assert len(cache) == 1
+    # assertions of imported modules are still rewritten
+    with pytest.raises(AssertionError) as caught:
+        module.check()
+    assert '1 == 2' in str(caught.value)
+
+
+def test_eviction_by_count(tmpdir, config_override):
+    config_override('run.rewritten_code_cache_path', str(tmpdir.join('rewritten')))
+    config_override('run.rewritten_code_cache_max_entries', 2)
+    cache = get_rewritten_code_cache()
+    paths = []
+    for index in range(3):
+        path = tmpdir.join('test_{0}.py'.format(index))
+        path.write(_SOURCE)
+        _import(path)
+        paths.append(path)
+    assert len(cache) == 3
+    cache.evict()
+    assert len(cache) == 2
+    _import(paths[0])
+    assert cache.misses == 4
+
+
+def test_eviction_by_age(tmpdir, test_file, config_override):
+    config_override('run.rewritten_code_cache_path', str(tmpdir.join('rewritten')))
+    config_override('run.rewritten_code_cache_max_age_days', 1)
+    cache = get_rewritten_code_cache()
+    _import(test_file)
+    [entry_path] = [path for _, path in cache._iter_entries()]  # pylint: disable=protected-access
+    two_days_ago = time.time() - 2 * 24 * 60 * 60
+    os.utime(entry_path, (two_days_ago, two_days_ago))
+    cache.evict()
+    assert len(cache) == 0
+
+
+def test_cache_evicted_after_collection(tmpdir, config_override):
+    config_override('run.rewritten_code_cache_path', str(tmpdir.join('rewritten')))
+    config_override('run.rewritten_code_cache_max_entries', 1)
+    for index in range(3):
+        tmpdir.join('tests', 'test_{0}.py'.format(index)).write(_SOURCE, ensure=True)
+    with slash.Session():
+        slash.loader.Loader().get_runnables(str(tmpdir.join('tests')))
+    assert len(get_rewritten_code_cache()) == 1
+
+
+_SOURCE = """
+def test_something():
+    x = 1
+    assert x == 2
+"""
+
+_HELPER_SOURCE = """
+def check():
+    x = 1
+    assert x == 2
+"""
+
+
+def _import(path):
+    module = import_file_rewriting_assertions(str(path))
+    _forget_module(path)
+    return module
+
+
+def _forget_module(path):
+    # emport reuses modules already imported from the same path
+    for name, module in list(sys.modules.items()):
+        if getattr(module, '__file__', None) == str(path):
+            sys.modules.pop(name)
+
+
+@pytest.fixture
+def test_file(tmpdir):
+    returned = tmpdir.join('test_rewritten.py')
+    returned.write(_SOURCE)
+    return returned
+
+
+@pytest.fixture
+def cache(tmpdir, config_override):
+    config_override('run.rewritten_code_cache_path', str(tmpdir.join('rewritten')))
+    return get_rewritten_code_cache()
@@ -38,18 +38,21 @@ def test_scope_manager(dummy_fixture_store, scope_manager, tests_by_module):
     for module_index, tests in enumerate(tests_by_module):
         for test_index, test in enumerate(tests):
             scope_manager.begin_test(test)
-            assert dummy_fixture_store._scopes == ['session', 'module', 'test']
+            assert dummy_fixture_store._scopes == ['session', 'directory', 'module', 'class', 'test']
             expected = _increment_scope(
                 last_scopes,
                 test=1,
-                module=1 if test_index == 0 else 0,
-                session=1 if test_index == 0 and module_index == 0 else 0)
+                # function tests have class scopes of their own
+                **{'class': 1,
+                   'module': 1 if test_index == 0 else 0,
+                   'directory': 1 if test_index == 0 and module_index == 0 else 0,
+                   'session': 1 if test_index == 0 and module_index == 0 else 0})
             assert dummy_fixture_store._scope_ids == expected
             # make sure the dict is copied
             assert expected is not dummy_fixture_store._scope_ids
             last_scopes = expected
             scope_manager.end_test(test)
-            assert dummy_fixture_store._scopes == ['session', 'module']
+            assert dummy_fixture_store._scopes == ['session', 'directory', 'module', 'class']
             assert dummy_fixture_store._scope_ids == last_scopes
 
     scope_manager.flush_remaining_scopes()
@@ -113,7 +116,7 @@ class DummyFixtureStore(object):
             functools.partial(itertools.count, 1))
         self._scope_ids = {}
 
-    def push_scope(self, scope):
+    def push_scope(self, scope, directory=None):  # pylint: disable=unused-argument
         self._scopes.append(scope)
         self._scope_ids[scope] = next(self._counters[scope])
 
@@ -1,7 +1,7 @@
 # pylint: disable=redefined-outer-name
 import pytest
 import slash.resuming
-from slash.resuming import (CannotResume, get_last_resumeable_session_id, get_tests_to_resume)
+from slash.resuming import (CannotResume, ResumedTestData, get_last_resumeable_session_id, get_tests_to_resume)
 
 
 def test_resume_no_session():
@@ -53,10 +53,43 @@ def test_different_folder_no_resume_session_id(suite, tmpdir):  # pylint: disabl
         with pytest.raises(CannotResume):
             sessoin_id = get_last_resumeable_session_id()
 
-def test_delete_old_sessions(suite):
+def test_delete_old_sessions(suite, monkeypatch):
     result = suite.run()
     assert result.session.id == get_last_resumeable_session_id()
-    slash.resuming._MAX_DAYS_SAVED_SESSIONS = 0 # pylint: disable=protected-access
+    monkeypatch.setattr(slash.resuming, '_MAX_DAYS_SAVED_SESSIONS', 0)
     result = suite.run()
     with pytest.raises(CannotResume):
         get_last_resumeable_session_id()
+
+
+def test_resume_loads_each_file_once(tmpdir, monkeypatch):
+    path = str(tmpdir.join('test_resumed.py'))
+    with open(path, 'w') as f:
+        f.write("""
+import slash
+
+@slash.parametrize('param', range(10))
+def test_1(param):
+    pass
+
+def test_2():
+    pass
+
+def test_3():
+    pass
+""")
+    to_resume = [ResumedTestData(path, 'test_1', {'param': index}) for index in (2, 5, 7)]
+    to_resume.extend([ResumedTestData(path, 'test_3'), ResumedTestData(path, 'test_1', {'param': 2})])
+
+    loaded_paths = []
+    orig_iter_path = slash.loader.Loader._iter_path  # pylint: disable=protected-access
+    def _iter_path(self, path):
+        loaded_paths.append(path)
+        return orig_iter_path(self, path)
+    monkeypatch.setattr(slash.loader.Loader, '_iter_path', _iter_path)
+
+    with slash.Session():
+        tests = slash.loader.Loader().get_runnables(to_resume)
+    assert loaded_paths == [path]
+    assert [(test.__slash__.function_name, test.get_variation().id.get('param')) for test in tests] == \
+        [('test_1', 2), ('test_1', 5), ('test_1', 7), ('test_3', None)]
@@ -5,10 +5,12 @@ import os
 import sys
 
 import pytest
+import slash
 from slash import config, site
 from slash._compat import StringIO
 from slash.frontend import slash_run
 from slash.frontend.main import main_entry_point
+from slash.reporting.null_reporter import NullReporter
 
 from .utils import no_op, NullFile, TestCase
 
@@ -182,3 +184,59 @@ def session_state_path(config_override, tmpdir):
     path = tmpdir.join('session_state_dir').join('session_data')
     config_override("run.session_state_path", str(path))
     return path
+
+
+def test_slash_run_stream_collection(suite):
+    suite.run(additional_args=['--stream'])
+
+
+def test_slash_run_stream_collection_runs_tests_before_collection_ends(tmpdir):
+    for file_index in range(3):
+        tmpdir.join('test_{0}.py'.format(file_index)).write(_STREAMED_TEST_FILE_TEMPLATE.format(file_index))
+    app = slash_run.slash_run([str(tmpdir), '--stream'], report_stream=NullFile())
+    assert app.exit_code == 0
+    results = list(app.session.results.iter_test_results())
+    num_collected = [result.details.all()['num_collected'] for result in results]
+    assert num_collected[0] == 2
+    assert num_collected == sorted(num_collected)
+    assert app.session.get_total_num_tests() == 6
+
+
+def test_slash_run_stream_collection_no_tests(tmpdir):
+    tmpdir.join('test_nothing.py').write('')
+    app = slash_run.slash_run([str(tmpdir), '--stream'], report_stream=NullFile())
+    assert app.exit_code != 0
+
+
+def test_slash_run_stream_collection_end_reported_before_last_tests(tmpdir):
+    events = []
+
+    class Reporter(NullReporter):
+
+        def report_collection_end(self, collected):
+            events.append(('collection_end', len(collected)))
+
+    for file_index in range(2):
+        tmpdir.join('test_{0}.py'.format(file_index)).write(_STREAMED_TEST_FILE_TEMPLATE.format(file_index))
+    with slash.Session(reporter=Reporter()):
+        for _ in slash.loader.Loader().iter_runnables([str(tmpdir)]):
+            events.append('test_start')
+    assert events == ['test_start', 'test_start', ('collection_end', 4), 'test_start', 'test_start']
+
+
+def test_slash_run_stream_collection_not_supported_in_parallel(tmpdir):
+    tmpdir.join('test_0.py').write(_STREAMED_TEST_FILE_TEMPLATE.format(0))
+    app = slash_run.slash_run([str(tmpdir), '--stream', '-j', '2'], report_stream=NullFile())
+    assert app.exit_code != 0
+    assert app.session.results.get_num_results() == 0
+
+
+_STREAMED_TEST_FILE_TEMPLATE = """
+import slash
+
+def test_first():
+    slash.context.result.details.set('num_collected', slash.context.session.get_total_num_tests())
+
+def test_second():
+    slash.context.result.details.set('num_collected', slash.context.session.get_total_num_tests())
+"""
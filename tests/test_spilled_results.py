@@ -0,0 +1,92 @@
+# pylint: disable=protected-access
+import pickle
+
+from slash.core.collection_cache import CachedMetadata
+from slash.core.result import Result, _SpilledResult
+from slash.core.result_store import ResultStore
+
+
+def test_spilled_results_read_transparently(suite):
+    suite[1].when_run.fail()
+    suite[2].when_run.raise_exception()
+    suite[3].when_run.skip()
+    summary = suite.run(additional_args=['--spill-results'])
+    results = summary.session.results
+
+    assert all(isinstance(entry, _SpilledResult) for entry in results._results_dict.values())
+    assert len(results._store) == len(suite)
+
+    assert results.get_num_failures() == 1
+    assert results.get_num_errors() == 1
+    assert results.get_num_skipped() == 1
+    [failed] = results.query(status='failure')
+    assert failed.is_failure() and failed.get_failures()
+    assert results.get_position(failed) == 1
+    assert results[2].get_errors()[0].traceback is not None
+    assert [result.test_metadata.address for result in results.iter_test_results()] == \
+        [entry.address for entry in results._results_dict.values()]
+    assert [entry.status for entry in results._results_dict.values()][:4] == ['success', 'failure', 'error', 'skip']
+    assert 'Session Summary' in summary.get_console_output()
+
+
+def test_errors_added_after_spilling(suite, suite_test):
+    suite_test.append_line('slash.add_cleanup(lambda: 1 / 0, deferred=True)')
+    suite_test.expect_error()
+    summary = suite.run(additional_args=['--spill-results'])
+    results = summary.session.results
+
+    assert all(isinstance(entry, _SpilledResult) for entry in results._results_dict.values())
+    assert not results.is_success()
+    assert results.get_num_errors() == 1
+    [errored] = results.query(status='error')
+    [error] = errored.get_errors()
+    assert error.exception_type is ZeroDivisionError
+
+
+def test_changes_after_spilling_stored_once(suite, suite_test):
+    for _ in range(3):
+        # the errors are only collected once the test's result is spilled
+        suite_test.append_line("slash.add_cleanup(lambda: [__import__('time').sleep(0.5), 1 / 0], deferred=True)")
+    suite_test.expect_error()
+    summary = suite.run(additional_args=['--spill-results'])
+    results = summary.session.results
+    [errored] = results.query(status='error')
+    assert len(errored.get_errors()) == 3
+    # the errors added after the result was spilled are stored together, in a single additional entry
+    assert len(results._store) == len(suite) + 1
+    assert results._results_dict[errored.test_id].status == 'error'
+
+
+def test_spilled_metadata_restored_from_store(suite):
+    results = suite.run(additional_args=['--spill-results']).session.results
+    entry = next(iter(results._results_dict.values()))
+    # the test metadata is only referenced weakly by the summary
+    entry._test_metadata_ref = lambda: None
+    metadata = results[0].test_metadata
+    assert isinstance(metadata, CachedMetadata)
+    assert metadata.address == entry.address
+
+
+def test_results_not_spilled_by_default(suite):
+    results = suite.run().session.results
+    assert results._store is None
+    assert not any(isinstance(entry, _SpilledResult) for entry in results._results_dict.values())
+
+
+def test_result_store(tmpdir):
+    store = ResultStore(str(tmpdir))
+    offsets = [store.append(pickle.dumps({'index': index, 'data': 'x' * index})) for index in range(10)]
+    assert len(store) == 10
+    assert [store.load(offset)['index'] for offset in reversed(offsets)] == list(reversed(range(10)))
+    store.close()
+
+
+def test_unpicklable_details_dumped_as_representations():
+    result = Result()
+    result.details.set('picklable', [1, 2])
+    result.details.set('unpicklable', lambda: None)
+    restored = Result()
+    restored.deserialize(pickle.loads(result.dumps()))
+    details = restored.details.all()
+    assert details['picklable'] == [1, 2]
+    assert details['unpicklable'].startswith('<function')